@@ -1,14 +1,20 @@
-import mss, numpy as np, time
+import sys, time
+from pathlib import Path
 from pynput import mouse
-from PIL import Image
 from pynput.keyboard import Controller, Key
+
+# Shared screen sampler from the core scripts
+sys.path.insert(0, str(Path(__file__).parent.parent / "««««« CORE »»»»»"))
+from frame_diff import MssFrameSource
+from screen_sampler import ScreenSampler
+
 controller = Controller()
 
+# All monitors, captured fresh for every click (TTL 0)
+sampler = ScreenSampler(MssFrameSource(0, logical=True), ttl=0)
+
 def get_pixel_rgb(x, y):
-    bbox = {"top": int(y), "left": int(x), "width": 1, "height": 1}
-    img = sct.grab(bbox)
-    pixel = np.array(img.pixel(0, 0))
-    return tuple(int(v) for v in pixel[:3])
+    return sampler.pixel(int(x), int(y))
 def on_click(x, y, button, pressed):
     if pressed:
         rgb = get_pixel_rgb(x, y)
@@ -19,12 +25,6 @@ def on_click(x, y, button, pressed):
         time.sleep(0.1)
         controller.tap(Key.enter)
 
-# Capture screen once using mss
-with mss.mss() as sct:
-    monitor = sct.monitors[1]  # Primary monitor
-    screenshot = sct.grab(monitor)
-    image = Image.frombytes("RGB", screenshot.size, screenshot.rgb)
-
 # Start mouse listener
 with mouse.Listener(on_click=on_click) as listener:
     print("Click anywhere on the screen to inspect pixel color (Press Ctrl+C to exit)...")
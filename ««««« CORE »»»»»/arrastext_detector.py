@@ -3,6 +3,11 @@
 This script continuously scans the screen for the text '!start' using OCR.
 When detected, it automatically types 'detected' in the active window.
 Press Esc to stop the script.
+
+Frames are compared tile by tile with the previous scan (frame_diff.py) and
+only changed regions are OCR'd, so an unchanged screen costs no OCR and a
+message is detected when it appears. Set CHAT_ROI to watch only the chat box,
+or USE_FRAME_DIFF = False to OCR every frame in full.
 """
 
 import time
@@ -21,9 +26,9 @@ except ImportError:
     sys.exit(1)
 
 try:
-    import mss
     import pytesseract
     from PIL import Image
+    from frame_diff import DirtyRegionTracker, MssFrameSource, crop
     HAS_OCR = True
 except ImportError:
     HAS_OCR = False
@@ -38,9 +43,66 @@ controller = KeyboardController()
 # Global flag for clean exit
 running = True
 
+# Only OCR the parts of the screen that changed since the last scan (see frame_diff.py)
+USE_FRAME_DIFF = True
+
+# Part of the monitor to watch, e.g. the chat box: (left, top, width, height), None = whole monitor
+CHAT_ROI = None
+
+
+def find_text(ocr_data: dict, search_text: str) -> tuple[int, int, int, int] | None:
+    """Find text in pytesseract image_to_data output (exact word first, then partial).
+    
+    Args:
+        ocr_data: pytesseract.image_to_data result (Output.DICT)
+        search_text: The text to search for (case-insensitive)
+    
+    Returns:
+        (left, top, width, height) of the matching word, or None if not found
+    """
+    search_lower = search_text.lower().strip()
+    
+    # Try to find the text in the OCR results
+    for i, text in enumerate(ocr_data['text']):
+        if text.lower().strip() == search_lower:
+            return (ocr_data['left'][i], ocr_data['top'][i], ocr_data['width'][i], ocr_data['height'][i])
+    
+    # Also try partial matching (in case search_text is part of a larger word)
+    for i, text in enumerate(ocr_data['text']):
+        if search_lower in text.lower():
+            return (ocr_data['left'][i], ocr_data['top'][i], ocr_data['width'][i], ocr_data['height'][i])
+    
+    return None
+
+
+def scan_regions_for_text(frame, regions, search_text: str,
+                          origin: tuple[int, int] = (0, 0)) -> tuple[bool, tuple[int, int] | None]:
+    """Run OCR on the given regions of a frame only.
+    
+    Args:
+        frame: RGB frame (NumPy array) of the monitor
+        regions: (left, top, width, height) regions of the frame to OCR
+        search_text: The text to search for on screen (case-insensitive)
+        origin: Screen position of the frame's top-left corner (monitor offset)
+    
+    Returns:
+        A tuple of (found: bool, center: tuple[int, int] | None) in absolute screen coordinates
+    """
+    for region in regions:
+        img = Image.fromarray(crop(frame, region))
+        ocr_data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
+        box = find_text(ocr_data, search_text)
+        if box is not None:
+            x, y, w, h = box
+            # Add region and monitor offsets to get absolute screen coordinates
+            center_x = origin[0] + region[0] + x + w // 2
+            center_y = origin[1] + region[1] + y + h // 2
+            return (True, (center_x, center_y))
+    return (False, None)
+
 
 def scan_screen_for_text(search_text: str, monitor_index: int = 1) -> tuple[bool, tuple[int, int] | None]:
-    """Scan the screen for the given text using OCR.
+    """Scan the whole screen once for the given text using OCR.
     
     Args:
         search_text: The text to search for on screen (case-insensitive)
@@ -55,57 +117,13 @@ def scan_screen_for_text(search_text: str, monitor_index: int = 1) -> tuple[bool
         return (False, None)
     
     try:
-        with mss.mss() as sct:
-            # Get the monitor (1-indexed for user, 0-indexed for mss)
-            if monitor_index < 1 or monitor_index > len(sct.monitors) - 1:
-                print(f"Error: Monitor index {monitor_index} out of range (1 to {len(sct.monitors) - 1})")
-                return (False, None)
-            
-            monitor = sct.monitors[monitor_index]
-            
-            # Capture the screen
-            screenshot = sct.grab(monitor)
-            
-            # Convert to PIL Image
-            img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
-            
-            # Perform OCR to get bounding boxes and text
-            ocr_data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
-            
-            # Search for the text (case-insensitive)
-            search_lower = search_text.lower().strip()
-            
-            # Try to find the text in the OCR results
-            for i, text in enumerate(ocr_data['text']):
-                if text.lower().strip() == search_lower:
-                    # Found exact match
-                    x = ocr_data['left'][i]
-                    y = ocr_data['top'][i]
-                    w = ocr_data['width'][i]
-                    h = ocr_data['height'][i]
-                    
-                    # Calculate center point
-                    # Add monitor offset to get absolute screen coordinates
-                    center_x = monitor['left'] + x + w // 2
-                    center_y = monitor['top'] + y + h // 2
-                    
-                    return (True, (center_x, center_y))
-            
-            # Also try partial matching (in case search_text is part of a larger word)
-            for i, text in enumerate(ocr_data['text']):
-                if search_lower in text.lower():
-                    x = ocr_data['left'][i]
-                    y = ocr_data['top'][i]
-                    w = ocr_data['width'][i]
-                    h = ocr_data['height'][i]
-                    
-                    center_x = monitor['left'] + x + w // 2
-                    center_y = monitor['top'] + y + h // 2
-                    
-                    return (True, (center_x, center_y))
-            
-            # Text not found
-            return (False, None)
+        source = MssFrameSource(monitor_index)
+        try:
+            frame = source.grab()
+            height, width = frame.shape[:2]
+            return scan_regions_for_text(frame, [(0, 0, width, height)], search_text, source.origin)
+        finally:
+            source.close()
             
     except Exception as e:
         print(f"Error during screen scan: {type(e).__name__}: {e}")
@@ -146,17 +164,39 @@ def main():
     last_detected_time = 0
     cooldown_period = 5.0  # Avoid spamming "detected" - wait 5 seconds between detections
     
+    source = None  # Opened in the loop, so a missing display or bad monitor is retried like a failed grab
+    tracker = DirtyRegionTracker(roi=CHAT_ROI)
+    ocr_calls = 0
+    pending_position = None  # Detection seen during the cooldown; the tracker won't report it again
+    
     try:
         while running:
-            # Scan screen for the text
-            found, position = scan_screen_for_text(search_text, monitor_index)
+            # Capture, then OCR only the regions that changed (nothing if the frame is unchanged);
+            # a failed capture or OCR is retried on the next scan
+            regions = []
+            try:
+                if source is None:
+                    source = MssFrameSource(monitor_index)
+                frame = source.grab()
+                if USE_FRAME_DIFF:
+                    regions = tracker.update(frame)
+                else:
+                    regions = [CHAT_ROI or (0, 0, frame.shape[1], frame.shape[0])]
+                ocr_calls += len(regions)
+                found, position = scan_regions_for_text(frame, regions, search_text, source.origin)
+            except Exception as e:
+                print(f"Error during screen scan: {type(e).__name__}: {e}")
+                found, position = False, None
             
             if found:
+                pending_position = position
+            
+            if pending_position is not None:
                 current_time = time.time()
                 
                 # Check if enough time has passed since last detection (cooldown)
                 if current_time - last_detected_time >= cooldown_period:
-                    print(f"\n✓ Detected '{search_text}' at position {position}")
+                    print(f"\n✓ Detected '{search_text}' at position {pending_position}")
                     print("  Typing: detected")
                     
                     # Type the response
@@ -166,12 +206,13 @@ def main():
                     
                     # Update last detected time
                     last_detected_time = current_time
-                else:
-                    # Found but still in cooldown
+                    pending_position = None
+                elif found:
+                    # Found but still in cooldown - answered once the cooldown ends
                     remaining = cooldown_period - (current_time - last_detected_time)
                     print(f"  Found '{search_text}' but in cooldown ({remaining:.1f}s remaining)")
-            else:
-                # Not found - print status
+            elif regions:
+                # Scanned, not found - print status
                 print(".", end="", flush=True)
             
             # Wait before next scan
@@ -184,7 +225,9 @@ def main():
     finally:
         running = False
         listener.stop()
-        print("\nText detector stopped.")
+        if source is not None:
+            source.close()
+        print(f"\nText detector stopped. {tracker.frames} frames, {tracker.skipped} unchanged, {ocr_calls} OCR calls.")
 
 
 if __name__ == "__main__":
@@ -73,9 +73,9 @@ if PLATFORM == 'darwin':
 
 try:
     import mss
-    import pytesseract
-    from PIL import Image
-    HAS_OCR = True
+    from PIL import Image, ImageEnhance, ImageFilter
+    from ocr_pool import HAS_TESSERACT, get_pool as get_ocr_pool
+    HAS_OCR = HAS_TESSERACT
 except ImportError:
     HAS_OCR = False
     print("Warning: OCR dependencies (mss, pytesseract, Pillow) not available.")
@@ -913,6 +913,7 @@ mcrash_shift_bind = False
 # CIRCLE FINDER MODE STATE
 # ═══════════════════════════════════════════════════════════════════════════
 circle_finder_active = False
+CIRCLE_FINDER_COLOR = None  # RGB fill/border colour to track, None = anything unlike the background
 circle_finder_event = multiprocessing.Event()
 circle_finder_process = None
 
@@ -1767,6 +1768,44 @@ def get_char(key: Key | KeyCode | None) -> str | None:
 # OCR AND TEXT SCANNING FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════
 
+def preprocess_for_ocr(img: "Image.Image") -> "Image.Image":
+    """Prepare a screen capture for OCR: upscale, grayscale, contrast and sharpen.
+    
+    Upscales so both dimensions are at least 1024x768 (LANCZOS), converts to
+    grayscale, doubles the contrast and sharpens. Deterministic, so the OCR
+    pool can cache results by the original capture.
+    
+    Args:
+        img: RGB capture
+    
+    Returns:
+        Preprocessed grayscale image
+    """
+    # Upscale image so both dimensions are at least 1024x768
+    target_width, target_height = 1024, 768
+    current_width, current_height = img.size
+    
+    # Calculate scale factors needed for each dimension
+    scale_x = target_width / current_width if current_width < target_width else 1
+    scale_y = target_height / current_height if current_height < target_height else 1
+    
+    # Use the larger scale factor to ensure both dimensions meet the minimum
+    scale_factor = max(scale_x, scale_y)
+    
+    if scale_factor > 1:
+        new_size = (int(current_width * scale_factor), int(current_height * scale_factor))
+        img = img.resize(new_size, Image.Resampling.LANCZOS)
+    
+    # Convert to grayscale for better OCR
+    img = img.convert('L')
+    
+    # Enhance contrast
+    img = ImageEnhance.Contrast(img).enhance(2.0)
+    
+    # Sharpen
+    return img.filter(ImageFilter.SHARPEN)
+
+
 def ocr_text_capture() -> None:
     """Capture text from a screen region defined by two mouse clicks.
     
@@ -1843,62 +1882,19 @@ def ocr_text_capture() -> None:
             # Convert to PIL Image
             img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
             
-            # Image preprocessing for better OCR
-            original_size = img.size
-            
-            # Upscale image so both dimensions are at least 1024x768
-            target_width, target_height = 1024, 768
-            current_width, current_height = img.size
-            
-            # Calculate scale factors needed for each dimension
-            scale_x = target_width / current_width if current_width < target_width else 1
-            scale_y = target_height / current_height if current_height < target_height else 1
-            
-            # Use the larger scale factor to ensure both dimensions meet the minimum
-            scale_factor = max(scale_x, scale_y)
-            
-            if scale_factor > 1:
-                new_size = (int(current_width * scale_factor), int(current_height * scale_factor))
-                img = img.resize(new_size, Image.Resampling.LANCZOS)
-                print(f"Upscaled image from {original_size} to {img.size} ({scale_factor:.2f}x)")
-            
-            # Convert to grayscale for better OCR
-            img = img.convert('L')
-            
-            # Enhance contrast
-            from PIL import ImageEnhance
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(2.0)
-            
-            # Optional: Apply sharpening
-            from PIL import ImageFilter
-            img = img.filter(ImageFilter.SHARPEN)
-            
             print("Reading text from captured region...")
             
-            # Perform OCR with optimized configuration
+            # OCR runs on the shared worker pool; psm 6 (uniform block of text) and psm 11
+            # (sparse text) run in parallel and psm 6 wins when both find text.
+            # Identical regions are answered from the pool's cache.
             # --oem 1: Use LSTM neural net mode (best for modern text)
-            # --psm 6: Assume uniform block of text
-            # Other useful PSM modes:
-            #   3: Fully automatic page segmentation (default)
-            #   6: Assume a single uniform block of text
-            #   11: Sparse text. Find as much text as possible in no particular order
-            custom_config = r'--oem 1 --psm 6'
-            text = pytesseract.image_to_string(img, config=custom_config)
-            
-            # Clean up the text (strip whitespace, remove empty lines)
-            text = text.strip()
-            
-            if not text:
-                print("No text detected in the selected region")
-                print("Trying with different PSM mode (sparse text)...")
-                # Try again with sparse text mode
-                custom_config = r'--oem 1 --psm 11'
-                text = pytesseract.image_to_string(img, config=custom_config)
-                text = text.strip()
+            ocr_pool = get_ocr_pool()
+            text = ocr_pool.first_text(img, [r'--oem 1 --psm 6', r'--oem 1 --psm 11'],
+                                       preprocess=preprocess_for_ocr)
+            print(f"OCR: {ocr_pool.format_stats()}")
             
             if not text:
-                print("Still no text detected - typing 'No text'")
+                print("No text detected - typing 'No text'")
                 type_with_enter("No text")
                 return
             
@@ -1959,8 +1955,8 @@ def scan_screen_for_text(search_text: str, monitor_index: int = 1) -> tuple[bool
             # Convert to PIL Image
             img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
             
-            # Perform OCR to get bounding boxes and text
-            ocr_data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
+            # Perform OCR to get bounding boxes and text (cached for an unchanged screen)
+            ocr_data = get_ocr_pool().image_to_data(img)
             
             # Search for the text (case-insensitive)
             search_lower = search_text.lower().strip()
@@ -2052,11 +2048,18 @@ def circle_finder_mode(run_event: MpEvent) -> None:
     3. Move mouse to center of found circle
     4. Continue tracking/centering until Left Shift is released
     
-    Uses basic image processing with mss and PIL to detect circles.
+    Circles are found with circle_detect.find_circles (NumPy colour mask,
+    connected components and a circle fit on a 2x downsampled capture).
     """
     if not HAS_OCR:
         print("Circle finder requires mss and PIL - install with: pip install mss pillow")
         return
+    try:
+        import numpy as np
+        from circle_detect import find_circles
+    except ImportError:
+        print("Circle finder requires numpy - install with: pip install numpy")
+        return
     
     print("Circle finder: Click two corners to define search rectangle")
     points: list[tuple[int, int]] = []
@@ -2097,43 +2100,15 @@ def circle_finder_mode(run_event: MpEvent) -> None:
             try:
                 # Capture search region
                 screenshot = sct.grab(search_rect)
-                img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
                 
-                # Convert to grayscale for edge detection (basic approach)
-                gray = img.convert('L')
-                width, height = gray.size
-                
-                # Simple circle detection: find regions with high edge density
-                # This is a basic implementation - for production, use cv2.HoughCircles
-                center_x = width // 2
-                center_y = height // 2
-                
-                # Scan for brightest/darkest contrasts indicating circle edges
-                max_contrast = 0
-                best_x, best_y = center_x, center_y
-                
-                # Sample in a grid pattern
-                step = 20
-                for y in range(step, height - step, step):
-                    for x in range(step, width - step, step):
-                        # Calculate local contrast (simple gradient)
-                        neighbors = []
-                        for dy in [-step, 0, step]:
-                            for dx in [-step, 0, step]:
-                                ny, nx = y + dy, x + dx
-                                if 0 <= ny < height and 0 <= nx < width:
-                                    neighbors.append(gray.getpixel((nx, ny)))
-                        
-                        if len(neighbors) > 0:
-                            contrast = max(neighbors) - min(neighbors)
-                            if contrast > max_contrast:
-                                max_contrast = contrast
-                                best_x, best_y = x, y
+                # BGRA capture -> RGB view, then vectorized mask + component + circle fit
+                frame = np.asarray(screenshot)[:, :, 2::-1]
+                circles = find_circles(frame, color=CIRCLE_FINDER_COLOR)
                 
-                # Move mouse to detected position (absolute screen coordinates)
-                abs_x = search_rect['left'] + best_x
-                abs_y = search_rect['top'] + best_y
-                mouse.position = (abs_x, abs_y)
+                if circles:
+                    # Move mouse to the largest circle's centre (absolute screen coordinates)
+                    best = circles[0]
+                    mouse.position = (search_rect['left'] + round(best.x), search_rect['top'] + round(best.y))
                 
                 time.sleep(0.1)  # Update rate
                 
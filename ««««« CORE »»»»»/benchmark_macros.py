@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Offline benchmark for macro playback (no real mouse or keyboard output).
+
+Plays synthetic macros through MacroRecorder.playback (mouse offset, loop /
+idle-trim / resample pipeline, scheduler and execute_action) into the output
+backends in macro_backend.py, with macros saved to a temporary directory:
+
+- pipeline: checks the mouse offset, looping, idle trimming and mouse
+  resampling on a small macro,
+- throughput: 10k-1M actions with every deadline already due (speed 0), through
+  the null and recording backends, in actions/s and CPU seconds,
+- accuracy: a real-time macro at 1kHz through the recording backend, reporting
+  lateness percentiles, end-of-run drift and CPU use.
+
+Exits with status 1 if a threshold is missed, so it can run in CI.
+
+Usage:
+    python benchmark_macros.py
+    python benchmark_macros.py --sizes 10000,100000 --accuracy-seconds 1 --max-p99-ms 2 --min-rate 50000
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from macro_backend import NullBackend, OutputBackend, RecordingBackend
+from macro_format import ActionType, RecordedAction
+from macro_playback import LatenessStats
+from macrorecorder import MacroRecorder, MacroRecording
+
+HOTKEY = "b"
+
+
+def synthetic_macro(count: int, rate: float = 60.0, seed: int = 0) -> List[RecordedAction]:
+    """Mouse moves with occasional key taps and clicks, one action every 1/rate seconds."""
+    rng = random.Random(seed)
+    actions = []
+    x, y = 500, 500
+    key = {"type": "keycode", "char": "a", "vk": None}
+    for i in range(count):
+        t = i / rate
+        roll = rng.random()
+        if roll < 0.05:
+            kind = ActionType.KEY_PRESS if i % 2 else ActionType.KEY_RELEASE
+            actions.append(RecordedAction(kind, t, {"key": key}))
+        elif roll < 0.08:
+            kind = ActionType.MOUSE_CLICK if i % 2 else ActionType.MOUSE_RELEASE
+            actions.append(RecordedAction(kind, t, {"x": x, "y": y, "button": "left"}))
+        else:
+            x += rng.randint(-4, 4)
+            y += rng.randint(-4, 4)
+            actions.append(RecordedAction(ActionType.MOUSE_MOVE, t, {"x": x, "y": y}))
+    return actions
+
+
+def play(actions: List[RecordedAction], backend: OutputBackend, macros_dir: Path,
+         **options) -> Optional[LatenessStats]:
+    """
+    Play a macro through a fresh MacroRecorder, silencing its console output.
+
+    Args:
+        actions: Macro to play
+        backend: Output backend
+        macros_dir: Macros directory for the recorder (its index is written there)
+        **options: Recorder attributes to set first (playback_speed, playback_loops, ...)
+
+    Returns:
+        The recorder's timing statistics, or None if playback failed
+    """
+    recorder = MacroRecorder(backend=backend, macros_dir=macros_dir)
+    for name, value in options.items():
+        setattr(recorder, name, value)
+    recorder.recordings[HOTKEY] = MacroRecording(name="benchmark", hotkey=HOTKEY, actions=actions)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return recorder.playback(HOTKEY)
+
+
+def check_pipeline(macros_dir: Path) -> List[str]:
+    """Check the mouse offset and the loop / trim / resample stages of a playback; returns failures."""
+    failures = []
+    actions = synthetic_macro(120)
+    # A 5 second pause halfway through, for the idle trimming
+    actions = actions[:60] + [RecordedAction(a.action_type, a.timestamp + 5.0, a.data) for a in actions[60:]]
+    first = actions[0].data
+    loops, max_idle = 3, 0.5
+
+    seen: List[float] = []
+
+    def capture(stream):
+        for action in stream:
+            seen.append(action.timestamp)
+            yield action
+
+    backend = RecordingBackend(start_position=(first["x"] + 10, first["y"] - 10))
+    recorder_options = dict(playback_speed=0.0, playback_loops=loops, playback_max_idle=max_idle,
+                            playback_mouse_rate=240.0, playback_transforms=[capture])
+    if play(actions, backend, macros_dir, **recorder_options) is None:
+        return ["pipeline playback failed"]
+
+    moves = [args for _, name, args in backend.events if name == "move"]
+    if moves[0] != (first["x"] + 10, first["y"] - 10):
+        failures.append(f"mouse offset not applied: first move {moves[0]}")
+    presses = sum(1 for _, name, _ in backend.events if name == "key_press")
+    expected = loops * sum(1 for a in actions if a.action_type == ActionType.KEY_PRESS)
+    if presses != expected:
+        failures.append(f"looping emitted {presses} key presses, expected {expected}")
+    if len(seen) != loops * len(actions) or max(b - a for a, b in zip(seen, seen[1:])) > max_idle + 1e-9:
+        failures.append("idle trimming left a pause longer than max_idle")
+    original_moves = sum(1 for a in actions if a.action_type == ActionType.MOUSE_MOVE)
+    if len(moves) <= loops * original_moves:
+        failures.append("mouse resampling added no moves")
+    return failures
+
+
+def bench_throughput(actions: List[RecordedAction], backend, macros_dir: Path) -> dict:
+    """Play with every deadline already due: measures recorder + scheduler + backend overhead."""
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    stats = play(actions, backend, macros_dir, playback_speed=0.0)
+    wall = time.perf_counter() - wall_start
+    return {
+        'actions': stats.summary()['actions'] if stats else 0,
+        'rate': len(actions) / wall if wall > 0 else float('inf'),
+        'wall': wall,
+        'cpu': time.process_time() - cpu_start,
+    }
+
+
+def bench_accuracy(seconds: float, macros_dir: Path, rate: float = 1000.0) -> Optional[dict]:
+    """Play a real-time macro and compare emitted event times with their deadlines."""
+    actions = synthetic_macro(int(seconds * rate), rate)
+    backend = RecordingBackend(start_position=(actions[0].data["x"], actions[0].data["y"]))
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    stats = play(actions, backend, macros_dir, playback_speed=1.0)
+    if stats is None:
+        return None
+    summary = stats.summary()
+    # How far the last emitted event is from the macro's intended end
+    summary['drift'] = backend.events[-1][0] - (start + actions[-1].timestamp) if backend.events else 0.0
+    summary['cpu_fraction'] = (time.process_time() - cpu_start) / stats.elapsed if stats.elapsed else 0.0
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline macro playback benchmark")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated macro sizes for throughput")
+    parser.add_argument("--accuracy-seconds", type=float, default=2.0, help="Length of the real-time accuracy run")
+    parser.add_argument("--max-p99-ms", type=float, default=2.0, help="Fail if p99 lateness exceeds this")
+    parser.add_argument("--min-rate", type=float, default=50000, help="Fail if null-backend throughput is below this (actions/s)")
+    args = parser.parse_args()
+
+    failures = []
+    print("=" * 60)
+    print("Macro playback benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        macros_dir = Path(tmp)
+
+        pipeline_failures = check_pipeline(macros_dir)
+        print(f"Pipeline (offset, loop, idle trim, resample): {'FAILED' if pipeline_failures else 'ok'}")
+        failures.extend(pipeline_failures)
+        print()
+
+        for size in (int(s) for s in args.sizes.split(",")):
+            actions = synthetic_macro(size)
+            for name, backend in (("null", NullBackend()), ("recording", RecordingBackend())):
+                result = bench_throughput(actions, backend, macros_dir)
+                print(f"{size:>9} actions | {name:<9} | {result['rate']:>12,.0f} actions/s | "
+                      f"wall {result['wall']:.3f}s | cpu {result['cpu']:.3f}s")
+                if result['actions'] != size:
+                    failures.append(f"{name} backend played {result['actions']} of {size} actions")
+                if name == "null" and result['rate'] < args.min_rate:
+                    failures.append(f"throughput {result['rate']:,.0f} actions/s < {args.min_rate:,.0f} ({size} actions)")
+
+        print()
+        accuracy = bench_accuracy(args.accuracy_seconds, macros_dir)
+    if accuracy is None:
+        failures.append("accuracy playback failed")
+    else:
+        print(f"Accuracy ({args.accuracy_seconds}s at 1kHz, recording backend):")
+        print(f"  lateness mean {accuracy['mean'] * 1000:.3f}ms | p50 {accuracy['p50'] * 1000:.3f}ms | "
+              f"p95 {accuracy['p95'] * 1000:.3f}ms | p99 {accuracy['p99'] * 1000:.3f}ms | max {accuracy['max'] * 1000:.3f}ms")
+        print(f"  {accuracy['late_1ms']} actions over 1ms late | drift at end {accuracy['drift'] * 1000:+.3f}ms | "
+              f"cpu {accuracy['cpu_fraction'] * 100:.0f}% of one core")
+        if accuracy['p99'] * 1000 > args.max_p99_ms:
+            failures.append(f"p99 lateness {accuracy['p99'] * 1000:.3f}ms > {args.max_p99_ms}ms")
+
+    print()
+    print("=" * 60)
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        print("=" * 60)
+        return 1
+    print("✅ All benchmarks within thresholds")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
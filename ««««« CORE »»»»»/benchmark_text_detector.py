@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Replay benchmark for the dirty-region OCR front end of arrastext_detector.py.
+
+Replays a PNG frame sequence (fixtures/text_detector by default) through
+DirtyRegionTracker and reports, at the detector's scan interval:
+
+- OCR calls per minute and OCR'd pixels per frame: every frame in full
+  (before), changed regions of the whole frame, and changed regions of the
+  chat box ROI,
+- the cost of the diff itself per frame (fixture size and 1920x1080),
+- with --ocr, real pytesseract time per call and whether each expected
+  message is found.
+
+It also checks that every frame where a message appears yields a region
+covering it; the script exits with status 1 if one is missed.
+
+The fixture is synthetic (grid background, a player that moves at times, a
+chat box that gains a line now and then) and is described by manifest.json
+(frame interval, chat ROI, expected messages with their boxes).
+
+Usage:
+    python benchmark_text_detector.py
+    python benchmark_text_detector.py --ocr                  # Also run pytesseract on the regions
+    python benchmark_text_detector.py --make-fixture         # Regenerate the fixture (needs Pillow)
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from frame_diff import DirtyRegionTracker, PngSequenceSource, crop, write_png_sequence
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "text_detector"
+
+# Synthetic fixture layout
+FIXTURE_SIZE = (480, 270)
+FIXTURE_FRAMES = 100
+FIXTURE_INTERVAL = 0.1
+CHAT_ROI = (8, 170, 240, 92)
+CHAT_MESSAGES = {20: "hello there", 45: "gg", 70: "!start", 85: "nice one"}
+MOVING_FRAMES = set(range(10, 30)) | set(range(60, 68))
+
+
+def make_fixture(directory: Path):
+    """Render the synthetic frame sequence and its manifest."""
+    from PIL import Image, ImageDraw
+
+    width, height = FIXTURE_SIZE
+    background = Image.new('RGB', FIXTURE_SIZE, (205, 205, 205))
+    draw = ImageDraw.Draw(background)
+    for x in range(0, width, 24):
+        draw.line([(x, 0), (x, height)], fill=(195, 195, 195))
+    for y in range(0, height, 24):
+        draw.line([(0, y), (width, y)], fill=(195, 195, 195))
+    draw.rectangle([width - 70, 8, width - 8, 70], fill=(180, 180, 180), outline=(90, 90, 90))
+
+    left, top, roi_width, roi_height = CHAT_ROI
+    line_height = 14
+    lines = []
+    player = [240, 135]
+    expected = []
+    frames = []
+    for index in range(FIXTURE_FRAMES):
+        if index in MOVING_FRAMES:
+            player[0] += 3
+            player[1] += 1 if index % 2 else -1
+        if index in CHAT_MESSAGES:
+            lines = (lines + [CHAT_MESSAGES[index]])[-(roi_height // line_height):]
+        img = background.copy()
+        draw = ImageDraw.Draw(img)
+        x, y = player
+        draw.ellipse([x - 14, y - 14, x + 14, y + 14], fill=(0, 178, 225), outline=(0, 133, 168), width=3)
+        draw.rectangle([left, top, left + roi_width - 1, top + roi_height - 1], fill=(60, 60, 60))
+        for row, text in enumerate(lines):
+            position = (left + 6, top + roi_height - (len(lines) - row) * line_height - 2)
+            draw.text(position, text, fill=(255, 255, 255))
+            if index in CHAT_MESSAGES and row == len(lines) - 1:
+                x0, y0, x1, y1 = draw.textbbox(position, text)
+                expected.append({"frame": index, "text": text, "box": [x0, y0, x1 - x0, y1 - y0]})
+        frames.append(np.asarray(img))
+
+    count = write_png_sequence(frames, directory)
+    with open(Path(directory) / "manifest.json", "w") as f:
+        json.dump({"size": list(FIXTURE_SIZE), "frame_interval": FIXTURE_INTERVAL,
+                   "chat_roi": list(CHAT_ROI), "messages": expected}, f, indent=2)
+    print(f"Wrote {count} frames to {directory}")
+
+
+def contains(region, box) -> bool:
+    left, top, width, height = region
+    x, y, w, h = box
+    return left <= x and top <= y and x + w <= left + width and y + h <= top + height
+
+
+def replay(frames, tracker, manifest, ocr=None) -> dict:
+    """Run the tracker over all frames; returns OCR call/pixel counts and missed messages."""
+    messages = {m["frame"]: m for m in manifest["messages"]}
+    calls = pixels = 0
+    diff_time = 0.0
+    ocr_time = 0.0
+    missed, found = [], []
+    for index, frame in enumerate(frames):
+        start = time.perf_counter()
+        regions = tracker.update(frame) if tracker else [(0, 0, frame.shape[1], frame.shape[0])]
+        diff_time += time.perf_counter() - start
+        calls += len(regions)
+        pixels += sum(w * h for _, _, w, h in regions)
+        message = messages.get(index)
+        if message and not any(contains(region, message["box"]) for region in regions):
+            missed.append(message["text"])
+        if ocr:
+            start = time.perf_counter()
+            texts = " ".join(ocr(crop(frame, region)) for region in regions)
+            ocr_time += time.perf_counter() - start
+            if message and message["text"] in texts:
+                found.append(message["text"])
+    minutes = len(frames) * manifest["frame_interval"] / 60
+    return {
+        'calls_per_minute': calls / minutes,
+        'calls': calls,
+        'pixels_per_frame': pixels / len(frames),
+        'diff_ms': diff_time / len(frames) * 1000,
+        'ocr_ms': ocr_time / calls * 1000 if ocr and calls else 0.0,
+        'missed': missed,
+        'found': found,
+    }
+
+
+def bench_diff_cost(width: int = 1920, height: int = 1080, repeats: int = 20) -> float:
+    """Average tracker.update time (ms) on full-HD frames with a small change each time."""
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    tracker = DirtyRegionTracker()
+    tracker.update(frame)
+    start = time.perf_counter()
+    for i in range(repeats):
+        frame[500:520, 100 + i * 8:140 + i * 8] ^= 0xFF
+        tracker.update(frame)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dirty-region OCR replay benchmark")
+    parser.add_argument("--fixture", type=Path, default=FIXTURE_DIR, help="PNG sequence directory with manifest.json")
+    parser.add_argument("--make-fixture", action="store_true", help="Regenerate the synthetic fixture and exit")
+    parser.add_argument("--ocr", action="store_true", help="Also run pytesseract on every OCR region")
+    args = parser.parse_args()
+
+    if args.make_fixture:
+        make_fixture(args.fixture)
+        return 0
+
+    with open(args.fixture / "manifest.json", "r") as f:
+        manifest = json.load(f)
+    source = PngSequenceSource(args.fixture)
+    frames = []
+    while (frame := source.grab()) is not None:
+        frames.append(frame)
+
+    ocr = None
+    if args.ocr:
+        import pytesseract
+        from PIL import Image
+        ocr = lambda array: pytesseract.image_to_string(Image.fromarray(array))
+
+    print("=" * 60)
+    print(f"Text detector replay: {len(frames)} frames every {manifest['frame_interval']}s ({args.fixture.name})")
+    print("=" * 60)
+    failures = []
+    modes = (
+        ("full frame (before)", None),
+        ("dirty tiles", DirtyRegionTracker()),
+        ("dirty tiles in chat ROI", DirtyRegionTracker(roi=tuple(manifest["chat_roi"]))),
+    )
+    for name, tracker in modes:
+        result = replay(frames, tracker, manifest, ocr)
+        line = (f"{name:<24} | {result['calls_per_minute']:>6.0f} OCR calls/min | "
+                f"{result['pixels_per_frame']:>8,.0f} px/frame | diff {result['diff_ms']:.2f}ms/frame")
+        if ocr:
+            line += f" | ocr {result['ocr_ms']:.1f}ms/call | found {result['found']}"
+        print(line)
+        if result['missed']:
+            failures.append(f"{name}: no region covered {result['missed']}")
+
+    print(f"\nDiff cost at 1920x1080: {bench_diff_cost():.2f}ms/frame")
+    print("=" * 60)
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        print("=" * 60)
+        return 1
+    print("✅ Every message frame produced a region covering the message")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
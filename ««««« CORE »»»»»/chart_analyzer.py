@@ -0,0 +1,324 @@
+"""Chart difficulty and density analyzer for the rhythm game (rg.py).
+
+Compiles charts parsed by chart_parser (the same parser rg.py plays from)
+into NumPy note arrays and computes density metrics:
+notes/sec peaks over sliding windows, chord frequency, jacks per lane,
+slide coverage, BPM range and estimated duration.
+
+Results are cached by chart content hash in chart_metrics_cache.json so the
+chart menu can show and sort by them without re-analyzing unchanged charts.
+
+Usage:
+    python chart_analyzer.py [chart_directory]   # Analyze a whole library
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from typing import Optional, Dict, List, Any, Tuple
+
+import numpy as np
+
+from chart_parser import LANE_COUNT, LEAD_IN_SECONDS, parse_chart
+
+# Bump when metric definitions change so stale cache entries are recomputed
+ANALYZER_VERSION = 2
+
+NPS_WINDOWS = (1.0, 4.0)  # Sliding window lengths (seconds) for peak notes/sec
+CHORD_TOLERANCE = 0.01  # Notes within 10ms are simultaneous (same as rg.py note connectors)
+JACK_MAX_GAP = 0.25  # Consecutive same-lane notes closer than this count as a jack
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chart_metrics_cache.json")
+
+
+def beats_to_seconds_array(beats: np.ndarray, bpm_changes: List[Tuple[float, float]],
+                           initial_bpm: float) -> np.ndarray:
+    """Vectorized equivalent of rg.beats_to_seconds for an array of beats."""
+    beats = np.asarray(beats, dtype=np.float64)
+    if not bpm_changes:
+        return beats / initial_bpm * 60.0
+
+    changes = sorted(bpm_changes)
+    change_beats = np.array([0.0] + [b for b, _ in changes])
+    segment_bpms = np.array([initial_bpm] + [bpm for _, bpm in changes])
+    # Seconds elapsed at each change point
+    segment_seconds = np.diff(change_beats) / segment_bpms[:-1] * 60.0
+    change_seconds = np.concatenate(([0.0], np.cumsum(segment_seconds)))
+
+    # A beat exactly on a change still uses the previous BPM (matches rg.py's <=)
+    segment = np.searchsorted(change_beats, beats, side='left') - 1
+    segment = np.clip(segment, 0, len(change_beats) - 1)
+    return change_seconds[segment] + (beats - change_beats[segment]) / segment_bpms[segment] * 60.0
+
+
+def compile_chart(lines: List[str], chart_id: str) -> Dict[str, Any]:
+    """
+    Compile chart text into note arrays sorted by time.
+
+    Args:
+        lines: Chart file lines
+        chart_id: Chart id (file name without _difficulty), used for the BPM fallback
+
+    Returns:
+        Dict with 'time', 'end_time', 'lane', 'multiplier', 'is_slide' arrays,
+        plus 'initial_bpm' and 'bpm_changes'
+    """
+    parsed = parse_chart(lines, chart_id, LANE_COUNT, warn=False)
+    notes = parsed['notes']
+    bpm_changes = parsed['bpm_changes']
+    initial_bpm = parsed['initial_bpm']
+
+    beats = np.array([note['beat'] for note in notes], dtype=np.float64)
+    end_beats = np.array([note.get('end_beat', note['beat']) for note in notes], dtype=np.float64)
+    bpm_index = np.array([note['bpm_index'] for note in notes], dtype=np.int64)
+
+    # Like rg.load_chart, each note is timed with the BPM changes read before it
+    times = np.empty_like(beats)
+    end_times = np.empty_like(end_beats)
+    for count in np.unique(bpm_index):
+        selected = bpm_index == count
+        times[selected] = beats_to_seconds_array(beats[selected], bpm_changes[:count], initial_bpm)
+        end_times[selected] = beats_to_seconds_array(end_beats[selected], bpm_changes[:count], initial_bpm)
+    order = np.argsort(times, kind='stable')
+
+    return {
+        'time': times[order],
+        'end_time': end_times[order],
+        'lane': np.array([note['lane'] for note in notes], dtype=np.int64)[order],
+        'multiplier': np.array([note['multiplier'] for note in notes], dtype=np.int64)[order],
+        'is_slide': np.array([note['type'] == 'slide' for note in notes], dtype=bool)[order],
+        'initial_bpm': initial_bpm,
+        'bpm_changes': sorted(bpm_changes),
+    }
+
+
+def _peak_nps(times: np.ndarray, window: float) -> float:
+    """Peak notes/sec over any window of the given length (windows start on a note)."""
+    if len(times) == 0:
+        return 0.0
+    window_ends = np.searchsorted(times, times + window, side='left')
+    counts = window_ends - np.arange(len(times))
+    return float(counts.max()) / window
+
+
+def _union_length(starts: np.ndarray, ends: np.ndarray) -> float:
+    """Total length covered by a set of intervals (overlaps counted once)."""
+    if len(starts) == 0:
+        return 0.0
+    order = np.argsort(starts)
+    starts = starts[order]
+    ends = np.maximum.accumulate(ends[order])
+    # An interval starts a new merged block when it begins after everything before it ended
+    prev_end = np.concatenate(([-np.inf], ends[:-1]))
+    clipped_starts = np.maximum(starts, prev_end)
+    return float(np.clip(ends - clipped_starts, 0.0, None).sum())
+
+
+def analyze_compiled(compiled: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute density metrics for a compiled chart.
+
+    Args:
+        compiled: Output of compile_chart
+
+    Returns:
+        JSON-serializable metrics dict
+    """
+    times = compiled['time']
+    end_times = compiled['end_time']
+    lanes = compiled['lane']
+    is_slide = compiled['is_slide']
+    bpms = [compiled['initial_bpm']] + [bpm for _, bpm in compiled['bpm_changes']]
+
+    metrics = {
+        'version': ANALYZER_VERSION,
+        'notes': int(len(times)),
+        'taps': int((~is_slide).sum()),
+        'slides': int(is_slide.sum()),
+        'bpm_min': float(min(bpms)),
+        'bpm_max': float(max(bpms)),
+        'duration': 0.0,
+        'avg_nps': 0.0,
+        'peak_nps': {str(w): 0.0 for w in NPS_WINDOWS},
+        'chord_ratio': 0.0,
+        'max_chord': 0,
+        'jacks_per_lane': [0] * LANE_COUNT,
+        'slide_coverage': 0.0,
+    }
+    if len(times) == 0:
+        return metrics
+
+    first = float(times[0])
+    duration = max(float(end_times.max()) - LEAD_IN_SECONDS, 0.0)
+    active_span = max(float(end_times.max()) - first, 1e-9)
+    metrics['duration'] = duration
+    metrics['avg_nps'] = len(times) / active_span
+    metrics['peak_nps'] = {str(w): _peak_nps(times, w) for w in NPS_WINDOWS}
+
+    # Chords: group onsets closer than CHORD_TOLERANCE to the previous onset
+    new_group = np.concatenate(([True], np.diff(times) > CHORD_TOLERANCE))
+    group_starts = np.flatnonzero(new_group)
+    group_sizes = np.diff(np.concatenate((group_starts, [len(times)])))
+    metrics['chord_ratio'] = float((group_sizes >= 2).mean())
+    metrics['max_chord'] = int(group_sizes.max())
+
+    # Jacks: consecutive notes in the same lane with a short gap
+    lane_order = np.lexsort((times, lanes))
+    sorted_lanes = lanes[lane_order]
+    sorted_times = times[lane_order]
+    same_lane = sorted_lanes[1:] == sorted_lanes[:-1]
+    short_gap = np.diff(sorted_times) <= JACK_MAX_GAP
+    jack_lanes = sorted_lanes[1:][same_lane & short_gap]
+    valid = (jack_lanes >= 0) & (jack_lanes < LANE_COUNT)
+    metrics['jacks_per_lane'] = np.bincount(jack_lanes[valid], minlength=LANE_COUNT)[:LANE_COUNT].tolist()
+
+    # Slide coverage: fraction of playable time with at least one slide held
+    coverage = _union_length(times[is_slide], end_times[is_slide])
+    metrics['slide_coverage'] = min(1.0, coverage / active_span)
+    return metrics
+
+
+def analyze_chart_file(file_path: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Hash and analyze one chart file.
+
+    Returns:
+        (content hash, metrics)
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    chart_hash = hashlib.sha1(data).hexdigest()
+    chart_id = os.path.basename(file_path)[:-len('.txt')].rsplit('_', 1)[0]
+    lines = data.decode('utf-8', errors='replace').splitlines(keepends=True)
+    return chart_hash, analyze_compiled(compile_chart(lines, chart_id))
+
+
+def _hash_file(file_path: str) -> str:
+    with open(file_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class ChartMetricsCache:
+    """Chart metrics keyed by content hash, filled in by a background scan."""
+
+    def __init__(self, cache_file: str = CACHE_FILE):
+        self.cache_file = cache_file
+        self.lock = threading.Lock()
+        self.by_hash: Dict[str, Dict[str, Any]] = {}
+        self.by_chart: Dict[Tuple[str, str], Dict[str, Any]] = {}  # (chart_id, difficulty) -> metrics
+        self.generation = 0  # Incremented whenever new results land, so UIs know to redraw
+        self.scanning = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            self.by_hash = {h: m for h, m in data.items() if m.get('version') == ANALYZER_VERSION}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading chart metrics cache: {e}")
+
+    def save(self):
+        """Write the cache to disk (atomic replace)."""
+        with self.lock:
+            data = dict(self.by_hash)
+        tmp_file = self.cache_file + ".tmp"
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            print(f"Error saving chart metrics cache: {e}")
+
+    def get(self, chart_id: str, difficulty: str) -> Optional[Dict[str, Any]]:
+        """Get metrics for a chart, or None if it hasn't been analyzed yet."""
+        return self.by_chart.get((chart_id, difficulty))
+
+    def _store(self, chart_id: str, difficulty: str, chart_hash: str, metrics: Dict[str, Any]):
+        with self.lock:
+            self.by_hash[chart_hash] = metrics
+            self.by_chart[(chart_id, difficulty)] = metrics
+            self.generation += 1
+
+    def scan(self, chart_directory: str, max_workers: Optional[int] = None, use_processes: bool = False):
+        """
+        Analyze every chart in a directory, reusing cached results for unchanged files.
+
+        Args:
+            chart_directory: Directory containing {chart_id}_{difficulty}.txt files
+            max_workers: Pool size (default: executor default)
+            use_processes: Use a process pool; only safe when the caller's __main__ has no
+                import-time side effects (rg.py creates its Tk window at import)
+        """
+        self.scanning = True
+        try:
+            pending = []
+            for file_path in sorted(glob.glob(os.path.join(chart_directory, "*.txt"))):
+                name = os.path.basename(file_path)[:-len('.txt')]
+                if '_' not in name:
+                    continue
+                chart_id, difficulty = name.rsplit('_', 1)
+                try:
+                    chart_hash = _hash_file(file_path)
+                except OSError:
+                    continue
+                cached = self.by_hash.get(chart_hash)
+                if cached is not None:
+                    self._store(chart_id, difficulty, chart_hash, cached)
+                else:
+                    pending.append((chart_id, difficulty, file_path))
+
+            if not pending:
+                return
+
+            executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            with executor_cls(max_workers=max_workers) as pool:
+                futures = {pool.submit(analyze_chart_file, path): (chart_id, difficulty)
+                           for chart_id, difficulty, path in pending}
+                for future in as_completed(futures):
+                    chart_id, difficulty = futures[future]
+                    try:
+                        chart_hash, metrics = future.result()
+                    except Exception as e:
+                        print(f"Error analyzing chart {chart_id}_{difficulty}: {e}")
+                        continue
+                    self._store(chart_id, difficulty, chart_hash, metrics)
+            self.save()
+        finally:
+            with self.lock:
+                self.scanning = False
+                self.generation += 1
+
+    def start_background_scan(self, chart_directory: str):
+        """Run scan() in a daemon thread (no-op if one is already running)."""
+        if self.scanning:
+            return
+        self.scanning = True
+        threading.Thread(target=self.scan, args=(chart_directory,), daemon=True).start()
+
+
+def format_metrics_summary(metrics: Optional[Dict[str, Any]]) -> str:
+    """Short one-line summary for menus."""
+    if metrics is None:
+        return "analyzing..."
+    minutes, seconds = divmod(int(metrics['duration']), 60)
+    bpm = (f"{metrics['bpm_min']:.0f}" if metrics['bpm_min'] == metrics['bpm_max']
+           else f"{metrics['bpm_min']:.0f}-{metrics['bpm_max']:.0f}")
+    return (f"{metrics['peak_nps'][str(NPS_WINDOWS[0])]:.1f} nps peak | {metrics['notes']} notes | "
+            f"{bpm} BPM | {minutes}:{seconds:02d}")
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "charts")
+    cache = ChartMetricsCache()
+    cache.scan(directory, use_processes=True)
+    for (chart_id, difficulty), metrics in sorted(cache.by_chart.items()):
+        print(f"{chart_id}_{difficulty}: {format_metrics_summary(metrics)}")
+        print(f"    chords {metrics['chord_ratio'] * 100:.0f}% (max {metrics['max_chord']}), "
+              f"jacks {metrics['jacks_per_lane']}, slide coverage {metrics['slide_coverage'] * 100:.0f}%")
@@ -0,0 +1,192 @@
+"""Chart file parser shared by the rhythm game (rg.py) and chart_analyzer.py.
+
+Two chart formats are supported:
+
+- percent format: '{beat}%{lanes}' lines, one character per lane
+  (X/x tap, s/S slide start, e slide end), plus 'bpm%{bpm}', 'spd%{percent}',
+  '{beat}%bpm{bpm}' and '{beat}%spd{percent}' changes; the initial BPM comes
+  from the chart id ('{name}_{bpm}'),
+- line format: 'bpm=', 'tap,lane,beat[,xN]', 'slide,lane,start,end[,xN]',
+  'bpm_change,beat,bpm' and 'spd,beat,mult' lines.
+
+Beats are shifted by LEAD_IN_SECONDS worth of beats at the initial BPM. Notes
+are returned in beats; each note also records how many BPM changes had been
+read before it ('bpm_index'), because the game converts a note to seconds
+using only those changes (rg.beats_to_seconds(beat, bpm_changes[:bpm_index], ...)).
+"""
+
+from typing import Any, Dict, List
+
+LANE_COUNT = 8  # Must match rg.py
+LEAD_IN_SECONDS = 2.0  # Every chart starts after 2 seconds of beats
+
+
+def _parse_percent_format(lines: List[str], beat_offset: float, lane_count: int, warn: bool):
+    notes = []
+    bpm_changes = []
+    speed_changes = []
+    slide_starts = {}  # Track slide start positions by lane: {lane: (beat, multiplier)}
+    last_beat = 0  # Track last beat for BPM changes
+
+    for line in lines:
+        if '%' not in line:
+            continue
+
+        parts = line.split("%")
+
+        # BPM change at the last processed beat (format: bpm%{new_bpm})
+        if parts[0].strip() == "bpm":
+            try:
+                bpm_changes.append((last_beat + beat_offset, float(parts[1].strip())))
+                continue
+            except (ValueError, IndexError):
+                pass
+
+        # Speed change at the last processed beat (format: spd%{percentage})
+        if parts[0].strip() == "spd":
+            try:
+                speed_changes.append((last_beat + beat_offset, float(parts[1].strip()) / 100.0))
+                continue
+            except (ValueError, IndexError):
+                pass
+
+        beat = float(parts[0]) + beat_offset  # Raises on malformed lines, like the game always has
+        last_beat = beat
+        note_data = parts[1] if len(parts) > 1 else ""
+
+        # BPM change at a specific beat (format: {beat}%bpm{new_bpm})
+        if note_data.strip().startswith("bpm"):
+            try:
+                bpm_changes.append((beat, float(note_data.strip().replace("bpm", "").strip())))
+                continue
+            except ValueError:
+                pass
+
+        # Speed change at a specific beat (format: {beat}%spd{percentage})
+        if note_data.strip().startswith("spd"):
+            try:
+                speed_changes.append((beat, float(note_data.strip().replace("spd", "").strip()) / 100.0))
+                continue
+            except ValueError:
+                pass
+
+        for char_index, char in enumerate(note_data):
+            lane = char_index % lane_count
+            if char in "Xx":
+                notes.append({'type': 'tap', 'beat': beat, 'lane': lane,
+                              'multiplier': 1 if char == "X" else 2, 'bpm_index': len(bpm_changes)})
+            elif char in "sS":
+                if lane in slide_starts and warn:
+                    print(f"Warning: Overlapping slide starts in lane {lane} at beat {beat}")
+                slide_starts[lane] = (beat, 1 if char == "s" else 2)
+            elif char == "e":
+                if lane in slide_starts:
+                    start_beat, multiplier = slide_starts.pop(lane)
+                    notes.append({'type': 'slide', 'beat': start_beat, 'end_beat': beat, 'lane': lane,
+                                  'multiplier': multiplier, 'bpm_index': len(bpm_changes)})
+                elif warn:
+                    print(f"Warning: Slide end without start in lane {lane} at beat {beat}")
+
+    if warn:
+        for lane, (start_beat, _) in slide_starts.items():
+            print(f"Warning: Slide start without end in lane {lane} at beat {start_beat}")
+
+    return notes, bpm_changes, speed_changes
+
+
+def _parse_multiplier(part: str) -> int:
+    if part.lower().startswith("x"):
+        try:
+            return int(part[1:])
+        except ValueError:
+            pass
+    return 1
+
+
+def _parse_line_format(lines: List[str], beat_offset: float):
+    notes = []
+    bpm_changes = []
+    speed_changes = []
+
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or line.startswith("---"):
+            continue
+        lower = line.lower()
+        if lower.startswith("bpm="):
+            continue
+
+        parts = [p.strip() for p in line.split(",")]
+        try:
+            if lower.startswith("bpm_change"):
+                if len(parts) >= 3:
+                    bpm_changes.append((float(parts[1]) + beat_offset, float(parts[2])))
+            elif lower.startswith("spd"):
+                if len(parts) >= 3:
+                    speed_changes.append((float(parts[1]) + beat_offset, float(parts[2])))
+            elif lower.startswith("tap"):
+                if len(parts) >= 3:
+                    notes.append({'type': 'tap', 'beat': float(parts[2]) + beat_offset, 'lane': int(parts[1]),
+                                  'multiplier': _parse_multiplier(parts[3]) if len(parts) >= 4 else 1,
+                                  'bpm_index': len(bpm_changes)})
+            elif lower.startswith("slide"):
+                if len(parts) >= 4:
+                    notes.append({'type': 'slide', 'beat': float(parts[2]) + beat_offset,
+                                  'end_beat': float(parts[3]) + beat_offset, 'lane': int(parts[1]),
+                                  'multiplier': _parse_multiplier(parts[4]) if len(parts) >= 5 else 1,
+                                  'bpm_index': len(bpm_changes)})
+        except ValueError:
+            pass  # Malformed lines are skipped in this format
+
+    return notes, bpm_changes, speed_changes
+
+
+def _line_format_initial_bpm(lines: List[str], chart_id: str) -> float:
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or line.startswith("---"):
+            continue
+        if line.lower().startswith("bpm="):
+            try:
+                return float(line.split("=", 1)[1].strip())
+            except ValueError:
+                pass
+    try:
+        return float(chart_id.split("_")[1])
+    except (IndexError, ValueError):
+        return 60
+
+
+def parse_chart(lines: List[str], chart_id: str, lane_count: int = LANE_COUNT, warn: bool = True) -> Dict[str, Any]:
+    """
+    Parse chart text.
+
+    Args:
+        lines: Chart file lines
+        chart_id: Chart id (file name without _difficulty), used for the initial BPM
+        lane_count: Lanes per row in the percent format
+        warn: Print warnings about unmatched slide starts/ends
+
+    Returns:
+        Dict with 'initial_bpm', 'notes' (dicts with type, beat, [end_beat], lane,
+        multiplier, bpm_index; in file order), 'bpm_changes' and 'speed_changes'
+        ((beat, value) in file order)
+
+    Raises:
+        ValueError: On a malformed beat in a percent-format chart
+    """
+    if any('%' in line for line in lines):
+        initial_bpm = float(chart_id.split("_")[1])
+        beat_offset = LEAD_IN_SECONDS * initial_bpm / 60.0
+        notes, bpm_changes, speed_changes = _parse_percent_format(lines, beat_offset, lane_count, warn)
+    else:
+        initial_bpm = _line_format_initial_bpm(lines, chart_id)
+        beat_offset = LEAD_IN_SECONDS * initial_bpm / 60.0
+        notes, bpm_changes, speed_changes = _parse_line_format(lines, beat_offset)
+
+    return {
+        'initial_bpm': initial_bpm,
+        'notes': notes,
+        'bpm_changes': bpm_changes,
+        'speed_changes': speed_changes,
+    }
@@ -0,0 +1,306 @@
+"""Vectorized NumPy circle detection for screen captures.
+
+Generalizes the white-centre mask of random/drawacircle.py into a detector
+used by arrastools' circle_finder_mode:
+
+1. downsample the RGB capture by striding (factor 2 by default),
+2. threshold it into a mask: a target colour (color_mask), a brightness
+   threshold (brightness_mask) or everything that differs from the median
+   background colour (foreground_mask),
+3. label connected components on horizontal runs of the mask (the runs are
+   joined with vectorized union-find, so there is no per-pixel Python loop),
+4. fit a circle to each component's boundary pixels (algebraic least squares,
+   solved for all components at once) and keep components whose RMS boundary
+   distance from the fitted circle is at most max_error * radius plus a
+   quarter pixel (pixel quantization of small circles).
+
+Filled discs and ring borders both work: a ring's inner and outer outlines
+fit one circle between them. Results are in full-resolution pixels of the
+input array.
+
+Usage:
+    python circle_detect.py [width] [height]   # Benchmark against the old getpixel grid scan
+"""
+
+import sys
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_FACTOR = 2
+DEFAULT_TOLERANCE = 40
+DEFAULT_MIN_RADIUS = 6
+DEFAULT_MAX_ERROR = 0.06  # RMS boundary distance from the fitted circle, relative to the radius
+QUANTIZATION = 0.25  # Extra RMS boundary distance allowed for pixel steps (mask pixels)
+
+
+@dataclass
+class Circle:
+    """A detected circle in input-image pixels."""
+    x: float
+    y: float
+    radius: float
+    area: int  # Component pixels (input pixels; estimated from the downsampled mask)
+    error: float  # RMS boundary distance from the circle / radius
+
+
+def downsample(rgb: np.ndarray, factor: int) -> np.ndarray:
+    """Keep every factor-th pixel in both directions (a view, no copy)."""
+    return rgb[::factor, ::factor] if factor > 1 else rgb
+
+
+def color_mask(rgb: np.ndarray, color: Tuple[int, int, int], tolerance: int = DEFAULT_TOLERANCE) -> np.ndarray:
+    """Pixels whose every channel is within tolerance of color."""
+    mask = np.ones(rgb.shape[:2], dtype=bool)
+    for channel, value in enumerate(color):
+        plane = rgb[:, :, channel]
+        mask &= (plane >= max(value - tolerance, 0)) & (plane <= min(value + tolerance, 255))
+    return mask
+
+
+def brightness_mask(rgb: np.ndarray, threshold: int = 200) -> np.ndarray:
+    """Pixels with every channel >= threshold (white-ish, as in drawacircle.py)."""
+    return (rgb[:, :, 0] >= threshold) & (rgb[:, :, 1] >= threshold) & (rgb[:, :, 2] >= threshold)
+
+
+def foreground_mask(rgb: np.ndarray, tolerance: int = DEFAULT_TOLERANCE) -> np.ndarray:
+    """Pixels differing from the median (background) colour by more than tolerance in some channel."""
+    sample = rgb[::4, ::4].reshape(-1, rgb.shape[2])
+    background = np.median(sample, axis=0).astype(np.int16)
+    return ~color_mask(rgb, tuple(int(v) for v in background[:3]), tolerance)
+
+
+def label_runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    8-connected component labels of a mask's horizontal runs.
+
+    Returns:
+        (rows, starts, ends, labels): one entry per run (ends exclusive), labels 0..n-1
+    """
+    height, width = mask.shape
+    edges = np.diff(mask.view(np.int8), axis=1, prepend=0, append=0)
+    run_rows, run_starts = np.nonzero(edges == 1)
+    run_ends = np.nonzero(edges == -1)[1]
+    count = len(run_rows)
+    if count == 0:
+        return run_rows, run_starts, run_ends, run_rows
+
+    # Runs in row r touch runs in row r-1 whose [start - 1, end + 1) overlaps them; because runs
+    # are sorted row-major, those form one index range found by binary search
+    stride = width + 2
+    start_keys = run_rows * stride + run_starts
+    end_keys = run_rows * stride + run_ends
+    lo = np.searchsorted(end_keys, (run_rows - 1) * stride + run_starts, side='left')
+    hi = np.searchsorted(start_keys, (run_rows - 1) * stride + run_ends + 1, side='left')
+    # A run's range may not reach into its own row: clip at the first run of row r
+    row_first = np.searchsorted(start_keys, run_rows * stride, side='left')
+    hi = np.minimum(hi, row_first)
+    lo = np.maximum(lo, np.searchsorted(start_keys, (run_rows - 1) * stride, side='left'))
+    spans = np.maximum(hi - lo, 0)
+    a = np.repeat(np.arange(count), spans)
+    b = np.repeat(lo, spans) + (np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans))
+
+    # Union-find by repeated min-label propagation along edges plus pointer jumping
+    labels = np.arange(count)
+    while len(a):
+        previous = labels.copy()
+        low = np.minimum(labels[a], labels[b])
+        np.minimum.at(labels, a, low)
+        np.minimum.at(labels, b, low)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            break
+    _, labels = np.unique(labels, return_inverse=True)
+    return run_rows, run_starts, run_ends, labels
+
+
+def fit_circles(mask: np.ndarray, min_radius: float = 2, max_radius: Optional[float] = None,
+                max_error: float = DEFAULT_MAX_ERROR) -> List[Circle]:
+    """
+    Fit a circle to every connected component of a mask.
+
+    Args:
+        mask: Boolean mask
+        min_radius: Smallest radius kept (mask pixels)
+        max_radius: Largest radius kept (mask pixels, None = no limit)
+        max_error: Largest RMS boundary distance from the fitted circle, relative to its radius
+                   (plus QUANTIZATION pixels)
+
+    Returns:
+        Circles in mask pixels, largest first
+    """
+    height, width = mask.shape
+    rows, starts, ends, labels = label_runs(mask)
+    if len(rows) == 0:
+        return []
+    count = labels.max() + 1
+    lengths = ends - starts
+    areas = np.bincount(labels, weights=lengths, minlength=count)
+
+    # Label image (0 = background) painted from the runs
+    label_image = np.zeros(height * width, dtype=np.int32)
+    offsets = np.cumsum(lengths) - lengths
+    positions = np.arange(lengths.sum()) - np.repeat(offsets, lengths) + np.repeat(rows * width + starts, lengths)
+    label_image[positions] = np.repeat(labels + 1, lengths)
+    label_image = label_image.reshape(height, width)
+
+    # Boundary: mask pixels with a 4-neighbour outside the mask (or on the image edge)
+    interior = np.zeros_like(mask)
+    interior[1:-1, 1:-1] = (mask[1:-1, 1:-1] & mask[:-2, 1:-1] & mask[2:, 1:-1]
+                            & mask[1:-1, :-2] & mask[1:-1, 2:])
+    ys, xs = np.nonzero(mask & ~interior)
+    owner = label_image[ys, xs] - 1
+    n = np.bincount(owner, minlength=count).astype(float)
+
+    # Kasa fit x² + y² = a·x + b·y + c per component, in coordinates centred on the boundary mean
+    def sums(values):
+        return np.bincount(owner, weights=values, minlength=count)
+
+    safe_n = np.maximum(n, 1)
+    mean_x, mean_y = sums(xs) / safe_n, sums(ys) / safe_n
+    dx, dy = xs - mean_x[owner], ys - mean_y[owner]
+    dz = dx * dx + dy * dy
+    sxx, sxy, syy, sx, sy = sums(dx * dx), sums(dx * dy), sums(dy * dy), sums(dx), sums(dy)
+    matrix = np.stack([np.stack([sxx, sxy, sx], -1), np.stack([sxy, syy, sy], -1), np.stack([sx, sy, n], -1)], -2)
+    matrix += np.eye(3) * 1e-9
+    rhs = np.stack([sums(dx * dz), sums(dy * dz), sums(dz)], -1)
+    a, b, c = np.linalg.solve(matrix, rhs[..., None])[..., 0].T
+    cx, cy = a / 2, b / 2
+    radius = np.sqrt(np.maximum(c + cx * cx + cy * cy, 0))
+    residual = np.hypot(dx - cx[owner], dy - cy[owner]) - radius[owner]
+    rms = np.sqrt(sums(residual * residual) / safe_n)
+    error = rms / np.maximum(radius, 1e-9)
+
+    keep = (n >= 8) & (radius >= min_radius) & (rms <= max_error * radius + QUANTIZATION)
+    if max_radius is not None:
+        keep &= radius <= max_radius
+    circles = [Circle(float(mean_x[i] + cx[i]), float(mean_y[i] + cy[i]), float(radius[i]),
+                      int(areas[i]), float(error[i])) for i in np.nonzero(keep)[0]]
+    circles.sort(key=lambda circle: -circle.area)
+    return circles
+
+
+def find_circles(rgb: np.ndarray, color: Optional[Tuple[int, int, int]] = None,
+                 tolerance: int = DEFAULT_TOLERANCE, threshold: Optional[int] = None,
+                 factor: int = DEFAULT_FACTOR, min_radius: float = DEFAULT_MIN_RADIUS,
+                 max_radius: Optional[float] = None, max_error: float = DEFAULT_MAX_ERROR) -> List[Circle]:
+    """
+    Detect circles in an RGB image.
+
+    Args:
+        rgb: Image array (height, width, 3+), e.g. an mss capture converted to RGB
+        color: Match this colour (within tolerance); if None, use threshold or the foreground mask
+        tolerance: Per-channel colour tolerance
+        threshold: Brightness threshold (all channels >=) used when color is None
+        factor: Downsampling factor (1 = full resolution)
+        min_radius: Smallest radius kept (input pixels)
+        max_radius: Largest radius kept (input pixels, None = no limit)
+        max_error: Largest RMS boundary error relative to the radius
+
+    Returns:
+        Circles in input pixels, largest first
+    """
+    small = downsample(rgb, factor)
+    if color is not None:
+        mask = color_mask(small, color, tolerance)
+    elif threshold is not None:
+        mask = brightness_mask(small, threshold)
+    else:
+        mask = foreground_mask(small, tolerance)
+    circles = fit_circles(mask, min_radius / factor, None if max_radius is None else max_radius / factor, max_error)
+    for circle in circles:
+        circle.x *= factor
+        circle.y *= factor
+        circle.radius *= factor
+        circle.area *= factor * factor
+    return circles
+
+
+def draw_circles(size: Tuple[int, int], circles: List[Tuple[float, float, float, Tuple[int, int, int]]],
+                 background: Tuple[int, int, int] = (205, 205, 205), border: int = 0,
+                 noise: int = 0, seed: int = 0) -> np.ndarray:
+    """
+    Synthetic RGB test image.
+
+    Args:
+        size: (width, height)
+        circles: (x, y, radius, colour) to draw filled (or as rings if border > 0)
+        background: Background colour
+        border: Ring width in pixels (0 = filled discs)
+        noise: Uniform per-channel noise amplitude
+        seed: Noise seed
+
+    Returns:
+        uint8 array (height, width, 3)
+    """
+    width, height = size
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:] = background
+    yy, xx = np.mgrid[0:height, 0:width]
+    for x, y, radius, colour in circles:
+        distance = np.hypot(xx - x, yy - y)
+        inside = distance <= radius
+        if border:
+            inside &= distance > radius - border
+        image[inside] = colour
+    if noise:
+        rng = np.random.default_rng(seed)
+        jitter = rng.integers(-noise, noise + 1, image.shape)
+        image = np.clip(image.astype(np.int16) + jitter, 0, 255).astype(np.uint8)
+    return image
+
+
+def grid_contrast_scan(gray, step: int = 20) -> Tuple[int, int]:
+    """The previous circle_finder_mode scanner (PIL getpixel grid of local contrast), for benchmarking."""
+    width, height = gray.size
+    max_contrast = 0
+    best_x, best_y = width // 2, height // 2
+    for y in range(step, height - step, step):
+        for x in range(step, width - step, step):
+            neighbors = []
+            for dy in [-step, 0, step]:
+                for dx in [-step, 0, step]:
+                    ny, nx = y + dy, x + dx
+                    if 0 <= ny < height and 0 <= nx < width:
+                        neighbors.append(gray.getpixel((nx, ny)))
+            contrast = max(neighbors) - min(neighbors)
+            if contrast > max_contrast:
+                max_contrast = contrast
+                best_x, best_y = x, y
+    return best_x, best_y
+
+
+if __name__ == "__main__":
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 1920
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else 1080
+    truth = (width * 0.37, height * 0.58, 41.0)
+    image = draw_circles((width, height), [(*truth, (0, 178, 225)),
+                                           (width * 0.8, height * 0.2, 25.0, (241, 78, 84))], noise=6)
+
+    repeats = 20
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        circles = find_circles(image, color=(0, 178, 225))
+    vectorized = (time.perf_counter() - t0) / repeats
+    best = circles[0] if circles else None
+    print(f"Vectorized: {vectorized * 1000:.1f}ms per {width}x{height} scan", end="")
+    if best:
+        print(f" | centre error {np.hypot(best.x - truth[0], best.y - truth[1]):.2f}px, "
+              f"radius {best.radius:.1f} (true {truth[2]:.0f})")
+    else:
+        print(" | no circle found")
+
+    try:
+        from PIL import Image
+    except ImportError:
+        print("Pillow not installed: skipping the getpixel grid scan comparison")
+        sys.exit(0 if best else 1)
+    gray = Image.fromarray(image).convert('L')
+    t0 = time.perf_counter()
+    x, y = grid_contrast_scan(gray)
+    grid = time.perf_counter() - t0
+    print(f"Grid scan:  {grid * 1000:.1f}ms per scan | centre error {np.hypot(x - truth[0], y - truth[1]):.2f}px")
+    print(f"Speedup: {grid / vectorized:.0f}x")
+    sys.exit(0 if best else 1)
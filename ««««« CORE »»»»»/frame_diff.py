@@ -0,0 +1,240 @@
+"""Dirty-region frame differencing for OCR loops.
+
+OCR on a full monitor frame costs far more than comparing two frames, and in
+a polling loop most frames are unchanged. DirtyRegionTracker keeps the last
+processed frame as a NumPy array, compares each new frame with it tile by
+tile and returns only the regions worth sending to OCR:
+
+- a pixel counts as changed when any channel differs by more than
+  pixel_threshold (ignores compression/blending noise),
+- a tile is dirty when at least min_tile_pixels of its pixels changed,
+- a frame with fewer than min_changed_pixels changed pixels is skipped,
+- dirty tiles are grouped into connected regions (padded so glyphs on a tile
+  edge are not cut); too many regions collapse into their bounding box.
+
+Only dirty regions are copied into the reference, so slow changes in clean
+tiles accumulate until they cross the thresholds instead of being lost.
+
+Frames come from a frame source: MssFrameSource (a monitor, through
+persistent mss instances) or PngSequenceSource (a recorded/synthetic PNG
+sequence, for replayable tests and benchmarks). Frames are RGB uint8 arrays
+of shape (height, width, 3).
+"""
+
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+Region = Tuple[int, int, int, int]  # left, top, width, height
+
+TILE_SIZE = 32
+PIXEL_THRESHOLD = 24
+MIN_TILE_PIXELS = 4
+MIN_CHANGED_PIXELS = 16
+PADDING = 8
+MAX_REGIONS = 4
+
+
+class DirtyRegionTracker:
+    """Per-tile change detection against the last processed frame."""
+
+    def __init__(self, tile_size: int = TILE_SIZE, pixel_threshold: int = PIXEL_THRESHOLD,
+                 min_tile_pixels: int = MIN_TILE_PIXELS, min_changed_pixels: int = MIN_CHANGED_PIXELS,
+                 roi: Optional[Region] = None, padding: int = PADDING, max_regions: int = MAX_REGIONS):
+        """
+        Initialize tracker.
+
+        Args:
+            tile_size: Tile edge length in pixels
+            pixel_threshold: Per-channel difference above which a pixel counts as changed
+            min_tile_pixels: Changed pixels needed to mark a tile dirty
+            min_changed_pixels: Frames with fewer changed pixels (in total) are skipped
+            roi: Only watch this (left, top, width, height) part of the frame (e.g. the chat box)
+            padding: Pixels added around each dirty region
+            max_regions: More regions than this are merged into their bounding box (one OCR call)
+        """
+        self.tile_size = tile_size
+        self.pixel_threshold = pixel_threshold
+        self.min_tile_pixels = min_tile_pixels
+        self.min_changed_pixels = min_changed_pixels
+        self.roi = roi
+        self.padding = padding
+        self.max_regions = max_regions
+        self.reference: Optional[np.ndarray] = None
+        self.frames = 0
+        self.skipped = 0
+
+    def reset(self):
+        """Forget the reference frame; the next frame is returned whole."""
+        self.reference = None
+
+    def update(self, frame: np.ndarray) -> List[Region]:
+        """
+        Compare a frame with the reference.
+
+        Args:
+            frame: RGB frame, shape (height, width, 3)
+
+        Returns:
+            Dirty regions in frame coordinates (the whole ROI for the first frame), [] if the frame is skipped
+        """
+        self.frames += 1
+        left, top = (self.roi[0], self.roi[1]) if self.roi else (0, 0)
+        view = frame[top:top + self.roi[3], left:left + self.roi[2]] if self.roi else frame
+        height, width = view.shape[:2]
+        if self.reference is None or self.reference.shape != view.shape:
+            self.reference = view.copy()
+            return [(left, top, width, height)]
+
+        # |a - b| without widening: max - min stays in uint8
+        diff = np.maximum(view, self.reference)
+        diff -= np.minimum(view, self.reference)
+        # Per-channel maximum; diff.max(axis=2) reduces over a length-3 axis and is ~25x slower
+        changed = np.maximum(np.maximum(diff[:, :, 0], diff[:, :, 1]), diff[:, :, 2]) > self.pixel_threshold
+        if np.count_nonzero(changed) < self.min_changed_pixels:
+            self.skipped += 1
+            return []
+
+        size = self.tile_size
+        counts = np.add.reduceat(changed, np.arange(0, height, size), axis=0, dtype=np.int32)
+        counts = np.add.reduceat(counts, np.arange(0, width, size), axis=1)
+        dirty = counts >= self.min_tile_pixels
+        if not dirty.any():
+            self.skipped += 1
+            return []
+
+        boxes = _tile_components(dirty)
+        if len(boxes) > self.max_regions:
+            boxes = [(min(b[0] for b in boxes), min(b[1] for b in boxes),
+                      max(b[2] for b in boxes), max(b[3] for b in boxes))]
+        regions = []
+        for row0, col0, row1, col1 in boxes:
+            y0, x0 = row0 * size, col0 * size
+            y1, x1 = min((row1 + 1) * size, height), min((col1 + 1) * size, width)
+            self.reference[y0:y1, x0:x1] = view[y0:y1, x0:x1]
+            y0, x0 = max(y0 - self.padding, 0), max(x0 - self.padding, 0)
+            y1, x1 = min(y1 + self.padding, height), min(x1 + self.padding, width)
+            regions.append((left + x0, top + y0, x1 - x0, y1 - y0))
+        return regions
+
+
+def _tile_components(dirty: np.ndarray) -> List[Tuple[int, int, int, int]]:
+    """Bounding boxes (row0, col0, row1, col1, inclusive) of 8-connected groups of dirty tiles."""
+    remaining = {(int(r), int(c)) for r, c in zip(*np.nonzero(dirty))}
+    boxes = []
+    while remaining:
+        stack = [remaining.pop()]
+        row0, col0 = row1, col1 = stack[0]
+        while stack:
+            r, c = stack.pop()
+            row0, row1, col0, col1 = min(row0, r), max(row1, r), min(col0, c), max(col1, c)
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    neighbour = (r + dr, c + dc)
+                    if neighbour in remaining:
+                        remaining.remove(neighbour)
+                        stack.append(neighbour)
+        boxes.append((row0, col0, row1, col1))
+    return boxes
+
+
+def crop(frame: np.ndarray, region: Region) -> np.ndarray:
+    """Contiguous copy of a region (ready for PIL's Image.fromarray)."""
+    left, top, width, height = region
+    return np.ascontiguousarray(frame[top:top + height, left:left + width])
+
+
+class MssFrameSource:
+    """Frames of one monitor, captured through persistent mss instances (one per calling thread)."""
+
+    def __init__(self, monitor_index: int = 1, logical: bool = False):
+        """
+        Open the capture.
+
+        Args:
+            monitor_index: Monitor index (0 = all monitors, 1 = primary, 2 = secondary, etc.)
+            logical: Return HiDPI (e.g. Retina) captures at logical resolution, so array
+                     indexes match mouse/screen coordinates (pixel probes); OCR wants False
+        """
+        import mss
+        self._mss = mss.mss
+        self.logical = logical
+        self._local = threading.local()
+        self._handles = []
+        sct = self.sct
+        if monitor_index < 0 or monitor_index > len(sct.monitors) - 1:
+            self.close()
+            raise ValueError(f"Monitor index {monitor_index} out of range (0 to {len(sct.monitors) - 1})")
+        self.monitor = sct.monitors[monitor_index]
+        self.origin = (self.monitor['left'], self.monitor['top'])
+
+    @property
+    def sct(self):
+        """This thread's mss instance (mss handles must not be shared between threads)."""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = self._local.sct = self._mss()
+            self._handles.append(sct)
+        return sct
+
+    def grab(self, region: Optional[Region] = None) -> np.ndarray:
+        """
+        Capture the monitor, or a (left, top, width, height) region of it, as an RGB array.
+
+        The result is a view into the BGRA capture.
+        """
+        if region is None:
+            bbox = self.monitor
+        else:
+            bbox = {'left': self.origin[0] + region[0], 'top': self.origin[1] + region[1],
+                    'width': region[2], 'height': region[3]}
+        shot = self.sct.grab(bbox)
+        frame = np.asarray(shot)[:, :, 2::-1]
+        scale = shot.width // bbox['width']
+        if self.logical and scale > 1:
+            frame = frame[::scale, ::scale]
+        return frame
+
+    def close(self):
+        for sct in self._handles:
+            sct.close()
+        self._handles.clear()
+        self._local = threading.local()
+
+
+class PngSequenceSource:
+    """Replays a directory of PNG frames (sorted by filename) as if they were captures."""
+
+    def __init__(self, directory: Path, origin: Tuple[int, int] = (0, 0)):
+        self.paths = sorted(Path(directory).glob("*.png"))
+        self.origin = origin
+        self.position = 0
+
+    def __len__(self):
+        return len(self.paths)
+
+    def grab(self) -> Optional[np.ndarray]:
+        """Next frame, or None when the sequence is exhausted."""
+        from PIL import Image
+        if self.position >= len(self.paths):
+            return None
+        with Image.open(self.paths[self.position]) as img:
+            frame = np.asarray(img.convert('RGB'))
+        self.position += 1
+        return frame
+
+    def close(self):
+        pass
+
+
+def write_png_sequence(frames: Iterable[np.ndarray], directory: Path, prefix: str = "frame_") -> int:
+    """Write RGB frames as {prefix}0000.png, {prefix}0001.png, ...; returns the frame count."""
+    from PIL import Image
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    count = 0
+    for count, frame in enumerate(frames, 1):
+        Image.fromarray(frame).save(directory / f"{prefix}{count - 1:04d}.png", optimize=True)
+    return count
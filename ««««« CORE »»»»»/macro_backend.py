@@ -0,0 +1,196 @@
+"""Output backends for macro playback.
+
+MacroRecorder sends every played action through an OutputBackend instead of
+calling the pynput controllers directly, so playback can run without moving
+the real mouse and keyboard:
+
+- PynputBackend: the real controllers (default in macrorecorder.py),
+- RecordingBackend: captures every emitted event with its perf_counter time,
+- NullBackend: discards everything (measures the player's own overhead).
+
+Keys and buttons reach a backend in their serialized form (the dicts and
+names stored in RecordedAction.data); only PynputBackend turns them into
+pynput objects, so this module imports pynput lazily.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Tuple
+
+from macro_format import ActionType, RecordedAction
+
+
+class OutputBackend(ABC):
+    """Interface for playback output; execute() maps actions onto the primitive methods."""
+
+    @abstractmethod
+    def position(self) -> Tuple[float, float]:
+        """Current mouse position."""
+
+    @abstractmethod
+    def key_press(self, key: Dict[str, Any]):
+        """Press a serialized key."""
+
+    @abstractmethod
+    def key_release(self, key: Dict[str, Any]):
+        """Release a serialized key."""
+
+    @abstractmethod
+    def move(self, x: float, y: float):
+        """Move the mouse to an absolute position."""
+
+    @abstractmethod
+    def button_press(self, button: str):
+        """Press a mouse button by name ('left', 'right', ...)."""
+
+    @abstractmethod
+    def button_release(self, button: str):
+        """Release a mouse button by name."""
+
+    @abstractmethod
+    def scroll(self, dx: int, dy: int):
+        """Scroll by (dx, dy) steps."""
+
+    def execute(self, action: RecordedAction, offset_x: float = 0, offset_y: float = 0):
+        """
+        Emit one recorded action.
+
+        Args:
+            action: The action to execute
+            offset_x: X offset to apply to mouse positions
+            offset_y: Y offset to apply to mouse positions
+        """
+        action_type = action.action_type
+        data = action.data
+        if action_type == ActionType.KEY_PRESS:
+            self.key_press(data["key"])
+        elif action_type == ActionType.KEY_RELEASE:
+            self.key_release(data["key"])
+        else:
+            self.move(data["x"] + offset_x, data["y"] + offset_y)
+            if action_type == ActionType.MOUSE_CLICK:
+                self.button_press(data["button"])
+            elif action_type == ActionType.MOUSE_RELEASE:
+                self.button_release(data["button"])
+            elif action_type == ActionType.MOUSE_SCROLL:
+                self.scroll(data["dx"], data["dy"])
+
+
+class PynputBackend(OutputBackend):
+    """Real keyboard and mouse output through pynput controllers (created on first use)."""
+
+    def __init__(self, keyboard_controller=None, mouse_controller=None):
+        """
+        Initialize backend.
+
+        Args:
+            keyboard_controller: pynput keyboard Controller (created on first use if None)
+            mouse_controller: pynput mouse Controller (created on first use if None)
+        """
+        self._keyboard = keyboard_controller
+        self._mouse = mouse_controller
+        self._keys: Dict[Tuple, Any] = {}  # Serialized key -> pynput key (converted once per macro key)
+
+    @property
+    def keyboard(self):
+        if self._keyboard is None:
+            from pynput.keyboard import Controller as KeyboardController
+            self._keyboard = KeyboardController()
+        return self._keyboard
+
+    @property
+    def mouse(self):
+        if self._mouse is None:
+            from pynput.mouse import Controller as MouseController
+            self._mouse = MouseController()
+        return self._mouse
+
+    def to_key(self, data: Dict[str, Any]):
+        """Convert a serialized key dict to a pynput key."""
+        cache_key = (data["type"], data.get("char"), data.get("vk"), data.get("name"))
+        key = self._keys.get(cache_key)
+        if key is None:
+            from pynput.keyboard import Key, KeyCode
+            if data["type"] == "keycode":
+                key = KeyCode.from_char(data["char"]) if data["char"] else KeyCode.from_vk(data["vk"])
+            else:
+                key = getattr(Key, data["name"])
+            self._keys[cache_key] = key
+        return key
+
+    def position(self):
+        return self.mouse.position
+
+    def key_press(self, key):
+        self.keyboard.press(self.to_key(key))
+
+    def key_release(self, key):
+        self.keyboard.release(self.to_key(key))
+
+    def move(self, x, y):
+        self.mouse.position = (x, y)
+
+    def button_press(self, button):
+        from pynput.mouse import Button
+        self.mouse.press(getattr(Button, button))
+
+    def button_release(self, button):
+        from pynput.mouse import Button
+        self.mouse.release(getattr(Button, button))
+
+    def scroll(self, dx, dy):
+        self.mouse.scroll(dx, dy)
+
+
+class NullBackend(OutputBackend):
+    """Discards all output."""
+
+    def position(self):
+        return (0, 0)
+
+    def key_press(self, key):
+        pass
+
+    key_release = key_press
+
+    def move(self, x, y):
+        pass
+
+    def button_press(self, button):
+        pass
+
+    button_release = button_press
+
+    def scroll(self, dx, dy):
+        pass
+
+
+class RecordingBackend(OutputBackend):
+    """Captures emitted events as (perf_counter time, event name, args) without touching real input."""
+
+    def __init__(self, start_position: Tuple[float, float] = (0, 0), clock=time.perf_counter):
+        self.events: List[Tuple[float, str, Tuple]] = []
+        self._position = start_position
+        self.clock = clock
+
+    def position(self):
+        return self._position
+
+    def key_press(self, key):
+        self.events.append((self.clock(), "key_press", (key,)))
+
+    def key_release(self, key):
+        self.events.append((self.clock(), "key_release", (key,)))
+
+    def move(self, x, y):
+        self._position = (x, y)
+        self.events.append((self.clock(), "move", (x, y)))
+
+    def button_press(self, button):
+        self.events.append((self.clock(), "button_press", (button,)))
+
+    def button_release(self, button):
+        self.events.append((self.clock(), "button_release", (button,)))
+
+    def scroll(self, dx, dy):
+        self.events.append((self.clock(), "scroll", (dx, dy)))
@@ -0,0 +1,363 @@
+"""Compact binary macro files for macrorecorder.py.
+
+JSON recordings store a dict per action, so 60Hz mouse-move recordings get
+large and slow to parse. The binary format (.amac) stores the same actions in
+a few bytes each:
+
+- timestamps as varint deltas in microseconds,
+- one action-type byte,
+- mouse coordinates as zigzag varint deltas from the previous mouse action,
+- keys and button names as indexes into tables stored once in the header.
+
+The header also records the action count and duration, so a recording can be
+listed without decoding its actions; they are decoded (from an mmap) on first
+use. Actions are exchanged as the dicts produced by RecordedAction.to_dict,
+which keeps this module independent of pynput and makes JSON import/export
+trivial.
+
+Coordinates are stored as whole pixels. This module also defines the action
+model (ActionType, RecordedAction) shared by the recorder, the player and the
+output backends (macro_backend.py).
+
+File layout (varints are unsigned LEB128; "z" marks zigzag-encoded signed values):
+    header:  b"AMAC", version u8, name, hotkey, created_at (varint length + UTF-8),
+             action count, duration (us), key table, button table
+    key:     kind u8 (0 = keycode, 1 = special), then
+             keycode: flags u8 (1 = char, 2 = vk), [char], [z vk]; special: name
+    action:  type u8, z timestamp delta (us), then by type
+             key press/release: key index | mouse move: z dx, z dy
+             click/release: z dx, z dy, button index | scroll: z dx, z dy, z scroll dx, z scroll dy
+
+Usage:
+    python macro_format.py export macro.amac macro.json   # Binary -> JSON
+    python macro_format.py import macro.json macro.amac   # JSON -> binary
+"""
+
+import json
+import mmap
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+MAGIC = b"AMAC"
+VERSION = 1
+SUFFIX = ".amac"
+
+# Action type byte -> ActionType value (order is part of the format)
+ACTION_TYPES = ("key_press", "key_release", "mouse_move", "mouse_click", "mouse_release", "mouse_scroll")
+ACTION_CODES = {name: code for code, name in enumerate(ACTION_TYPES)}
+KEY_PRESS, KEY_RELEASE, MOUSE_MOVE, MOUSE_CLICK, MOUSE_RELEASE, MOUSE_SCROLL = range(len(ACTION_TYPES))
+
+
+class ActionType(Enum):
+    """Types of recordable actions."""
+    KEY_PRESS = "key_press"
+    KEY_RELEASE = "key_release"
+    MOUSE_MOVE = "mouse_move"
+    MOUSE_CLICK = "mouse_click"
+    MOUSE_RELEASE = "mouse_release"
+    MOUSE_SCROLL = "mouse_scroll"
+
+
+@dataclass
+class RecordedAction:
+    """A single recorded action with timestamp."""
+    action_type: ActionType
+    timestamp: float  # Time since recording started (seconds)
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "action_type": self.action_type.value,
+            "timestamp": self.timestamp,
+            "data": self.data
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "RecordedAction":
+        """Create from dictionary."""
+        return cls(
+            action_type=ActionType(d["action_type"]),
+            timestamp=d["timestamp"],
+            data=d["data"]
+        )
+
+
+def _write_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _write_string(out: bytearray, text: str):
+    data = text.encode("utf-8")
+    _write_varint(out, len(data))
+    out += data
+
+
+class _Reader:
+    """Sequential varint reader over bytes, a memoryview or an mmap."""
+
+    def __init__(self, buffer, pos: int = 0):
+        self.buffer = buffer
+        self.pos = pos
+
+    def byte(self) -> int:
+        value = self.buffer[self.pos]
+        self.pos += 1
+        return value
+
+    def varint(self) -> int:
+        buffer, pos = self.buffer, self.pos
+        value = buffer[pos]
+        pos += 1
+        if value < 0x80:
+            self.pos = pos
+            return value
+        value &= 0x7F
+        shift = 7
+        while True:
+            b = buffer[pos]
+            pos += 1
+            value |= (b & 0x7F) << shift
+            if b < 0x80:
+                self.pos = pos
+                return value
+            shift += 7
+
+    def zigzag(self) -> int:
+        value = self.varint()
+        return (value >> 1) ^ -(value & 1)
+
+    def string(self) -> str:
+        length = self.varint()
+        data = bytes(self.buffer[self.pos:self.pos + length])
+        self.pos += length
+        return data.decode("utf-8")
+
+
+def _key_id(key: Dict[str, Any]) -> Tuple:
+    if key["type"] == "keycode":
+        return ("keycode", key.get("char"), key.get("vk"))
+    return ("special", key["name"])
+
+
+def encode_recording(recording: Dict[str, Any]) -> bytes:
+    """
+    Encode a recording dict (MacroRecording.to_dict format).
+
+    Args:
+        recording: Dict with name, hotkey, created_at and actions (RecordedAction.to_dict dicts)
+
+    Returns:
+        The .amac file contents
+    """
+    actions = recording["actions"]
+    keys: Dict[Tuple, int] = {}
+    key_table: List[Dict[str, Any]] = []
+    buttons: Dict[str, int] = {}
+    body = bytearray()
+    last_us = 0
+    last_x = last_y = 0
+
+    for action in actions:
+        code = ACTION_CODES[action["action_type"]]
+        data = action["data"]
+        body.append(code)
+        timestamp_us = round(action["timestamp"] * 1_000_000)
+        _write_varint(body, _zigzag(timestamp_us - last_us))
+        last_us = timestamp_us
+        if code in (KEY_PRESS, KEY_RELEASE):
+            key_id = _key_id(data["key"])
+            if key_id not in keys:
+                keys[key_id] = len(key_table)
+                key_table.append(data["key"])
+            _write_varint(body, keys[key_id])
+            continue
+        x, y = round(data["x"]), round(data["y"])
+        _write_varint(body, _zigzag(x - last_x))
+        _write_varint(body, _zigzag(y - last_y))
+        last_x, last_y = x, y
+        if code in (MOUSE_CLICK, MOUSE_RELEASE):
+            button = buttons.setdefault(data["button"], len(buttons))
+            _write_varint(body, button)
+        elif code == MOUSE_SCROLL:
+            _write_varint(body, _zigzag(round(data["dx"])))
+            _write_varint(body, _zigzag(round(data["dy"])))
+
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    _write_string(out, recording["name"])
+    _write_string(out, recording["hotkey"])
+    _write_string(out, recording.get("created_at", ""))
+    _write_varint(out, len(actions))
+    _write_varint(out, max(last_us, 0))
+    _write_varint(out, len(key_table))
+    for key in key_table:
+        if key["type"] == "keycode":
+            out.append(0)
+            char, vk = key.get("char"), key.get("vk")
+            out.append((1 if char is not None else 0) | (2 if vk is not None else 0))
+            if char is not None:
+                _write_string(out, char)
+            if vk is not None:
+                _write_varint(out, _zigzag(vk))
+        else:
+            out.append(1)
+            _write_string(out, key["name"])
+    _write_varint(out, len(buttons))
+    for name in buttons:  # Dicts keep insertion order, which is the index order
+        _write_string(out, name)
+    return bytes(out + body)
+
+
+def _read_header(reader: _Reader) -> Dict[str, Any]:
+    if bytes(reader.buffer[:4]) != MAGIC:
+        raise ValueError("not a binary macro file")
+    reader.pos = 4
+    version = reader.byte()
+    if version != VERSION:
+        raise ValueError(f"unsupported macro format version {version}")
+    header = {
+        "name": reader.string(),
+        "hotkey": reader.string(),
+        "created_at": reader.string(),
+        "action_count": reader.varint(),
+        "duration": reader.varint() / 1_000_000,
+    }
+    keys = []
+    for _ in range(reader.varint()):
+        if reader.byte() == 0:
+            flags = reader.byte()
+            char = reader.string() if flags & 1 else None
+            vk = reader.zigzag() if flags & 2 else None
+            keys.append({"type": "keycode", "char": char, "vk": vk})
+        else:
+            keys.append({"type": "special", "name": reader.string()})
+    header["keys"] = keys
+    header["buttons"] = [reader.string() for _ in range(reader.varint())]
+    header["body_offset"] = reader.pos
+    return header
+
+
+def _decode_actions(reader: _Reader, header: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    keys, buttons = header["keys"], header["buttons"]
+    timestamp_us = 0
+    x = y = 0
+    for _ in range(header["action_count"]):
+        code = reader.byte()
+        timestamp_us += reader.zigzag()
+        if code == KEY_PRESS or code == KEY_RELEASE:
+            data = {"key": dict(keys[reader.varint()])}
+        else:
+            x += reader.zigzag()
+            y += reader.zigzag()
+            data = {"x": x, "y": y}
+            if code == MOUSE_CLICK or code == MOUSE_RELEASE:
+                data["button"] = buttons[reader.varint()]
+            elif code == MOUSE_SCROLL:
+                data["dx"] = reader.zigzag()
+                data["dy"] = reader.zigzag()
+        yield {"action_type": ACTION_TYPES[code], "timestamp": timestamp_us / 1_000_000, "data": data}
+
+
+def read_header(path: Path) -> Dict[str, Any]:
+    """Read only the header (name, hotkey, created_at, action_count, duration, tables)."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _read_header(_Reader(mm))
+
+
+def iter_actions(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream a file's actions (as RecordedAction.to_dict dicts) from an mmap (JSON files are parsed whole)."""
+    if Path(path).suffix == ".json":
+        with open(path, "r") as f:
+            yield from json.load(f)["actions"]
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        reader = _Reader(mm)
+        header = _read_header(reader)
+        yield from _decode_actions(reader, header)
+
+
+def decode_recording(data: bytes) -> Dict[str, Any]:
+    """Decode .amac contents into a MacroRecording.to_dict-style dict."""
+    reader = _Reader(memoryview(data))
+    header = _read_header(reader)
+    return {
+        "name": header["name"],
+        "hotkey": header["hotkey"],
+        "created_at": header["created_at"],
+        "actions": list(_decode_actions(reader, header)),
+    }
+
+
+class LazyActions(Sequence):
+    """Action list of a macro file, decoded on first access.
+
+    len() and duration come from the header (or a macro_index entry); indexing
+    or iterating decodes every action once (through make_action) and caches
+    the result.
+    """
+
+    def __init__(self, path: Path, header: Dict[str, Any],
+                 make_action: Callable[[Dict[str, Any]], Any] = lambda d: d):
+        self.path = path
+        self.action_count = header["action_count"]
+        self.duration = header["duration"]
+        self.make_action = make_action
+        self._actions = None
+
+    def materialize(self) -> List[Any]:
+        if self._actions is None:
+            self._actions = [self.make_action(d) for d in iter_actions(self.path)]
+        return self._actions
+
+    @property
+    def loaded(self) -> bool:
+        return self._actions is not None
+
+    def __len__(self):
+        return self.action_count
+
+    def __getitem__(self, index):
+        return self.materialize()[index]
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+
+def export_json(binary_path: Path, json_path: Path):
+    """Convert a binary macro file to the JSON format."""
+    with open(binary_path, "rb") as f:
+        recording = decode_recording(f.read())
+    with open(json_path, "w") as f:
+        json.dump(recording, f, indent=2)
+
+
+def import_json(json_path: Path, binary_path: Path):
+    """Convert a JSON macro file to the binary format."""
+    with open(json_path, "r") as f:
+        recording = json.load(f)
+    with open(binary_path, "wb") as f:
+        f.write(encode_recording(recording))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in ("export", "import"):
+        print(__doc__)
+        sys.exit(1)
+    source, target = Path(sys.argv[2]), Path(sys.argv[3])
+    if sys.argv[1] == "export":
+        export_json(source, target)
+    else:
+        import_json(source, target)
+    print(f"Converted {source} -> {target} ({source.stat().st_size} -> {target.stat().st_size} bytes)")
@@ -0,0 +1,170 @@
+"""Persistent index of saved macros for macrorecorder.py.
+
+Instead of globbing and sorting macros/macro_{hotkey}_*.json on every hotkey
+press and parsing every file at startup, the recorder keeps macros/index.json:
+
+    {"version": 1, "files": {filename: metadata}, "hotkeys": {hotkey: filename}}
+
+where metadata is name, hotkey, created_at, action_count, duration, size,
+mtime and a SHA-1 checksum. Resolving a hotkey is a dict lookup plus one
+stat() to check the file is unchanged; actions are only parsed at playback.
+
+The index is validated by mtime: a looked-up file whose mtime or size changed
+is re-described, and at startup the directory listing is compared with the
+indexed filenames; if files were copied in or deleted behind the recorder's
+back, it is rescanned, reusing the metadata of every file whose mtime and
+size still match (or whose checksum matches, for files that were only
+touched).
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import macro_format
+
+INDEX_NAME = "index.json"
+VERSION = 1
+SUFFIXES = (macro_format.SUFFIX, ".json")
+
+
+def file_checksum(path: Path) -> str:
+    """SHA-1 of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def describe_macro(path: Path) -> Dict[str, Any]:
+    """Read a macro file's metadata (binary files: header only)."""
+    if path.suffix == macro_format.SUFFIX:
+        header = macro_format.read_header(path)
+        return {key: header[key] for key in ("name", "hotkey", "created_at", "action_count", "duration")}
+    with open(path, "r") as f:
+        data = json.load(f)
+    actions = data["actions"]
+    return {
+        "name": data["name"],
+        "hotkey": data["hotkey"],
+        "created_at": data.get("created_at", ""),
+        "action_count": len(actions),
+        "duration": actions[-1]["timestamp"] if actions else 0,
+    }
+
+
+def _recency(filename: str):
+    """Sort key: filename timestamp order, binary first on a tie (matches MacroRecorder.find_macro_file)."""
+    path = Path(filename)
+    return (path.stem, path.suffix == macro_format.SUFFIX)
+
+
+class MacroIndex:
+    """hotkey -> latest macro file, with metadata, persisted next to the macros."""
+
+    def __init__(self, directory: Path):
+        """
+        Load the index, rescanning the directory if it changed since the index was written.
+
+        Args:
+            directory: Macros directory (holds macro_*.amac / macro_*.json and the index file)
+        """
+        self.directory = Path(directory)
+        self.path = self.directory / INDEX_NAME
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.hotkeys: Dict[str, str] = {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == VERSION:
+                self.files = data["files"]
+                self.hotkeys = data["hotkeys"]
+        except (OSError, ValueError, KeyError):
+            pass
+        self.validate()
+
+    def validate(self):
+        """Rescan if macro files were added or removed since the index was written (names only, no parsing)."""
+        names = {path.name for suffix in SUFFIXES for path in self.directory.glob(f"macro_*{suffix}")}
+        if names != set(self.files) or not self.path.exists():
+            self.rescan()
+
+    def rescan(self):
+        """Rebuild from the directory, reusing metadata of unchanged files."""
+        files = {}
+        for suffix in SUFFIXES:
+            for path in self.directory.glob(f"macro_*{suffix}"):
+                entry = self._entry_for(path, self.files.get(path.name))
+                if entry is not None:
+                    files[path.name] = entry
+        self.files = files
+        self.hotkeys = {}
+        for filename in sorted(files, key=_recency):
+            self.hotkeys[files[filename]["hotkey"]] = filename
+        self.save()
+
+    def _entry_for(self, path: Path, cached: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        try:
+            stat = path.stat()
+            if cached and cached["mtime"] == stat.st_mtime and cached["size"] == stat.st_size:
+                return cached
+            checksum = file_checksum(path)
+            if cached and cached["checksum"] == checksum:
+                metadata = {k: v for k, v in cached.items() if k not in ("mtime", "size")}
+            else:
+                metadata = describe_macro(path)
+        except Exception as e:
+            print(f"Failed to index {path.name}: {e}")
+            return None
+        metadata.update(mtime=stat.st_mtime, size=stat.st_size, checksum=checksum)
+        return metadata
+
+    def add(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Index a newly saved macro file; it becomes its hotkey's latest if it sorts last."""
+        path = Path(path)
+        entry = self._entry_for(path, None)
+        if entry is None:
+            return None
+        self.files[path.name] = entry
+        current = self.hotkeys.get(entry["hotkey"])
+        if current is None or current not in self.files or _recency(path.name) >= _recency(current):
+            self.hotkeys[entry["hotkey"]] = path.name
+        self.save()
+        return entry
+
+    def lookup(self, hotkey: str) -> Optional[Dict[str, Any]]:
+        """
+        Latest macro for a hotkey.
+
+        Returns:
+            Metadata dict with an added "path", or None if the hotkey has no macro
+        """
+        filename = self.hotkeys.get(hotkey)
+        if filename is None:
+            return None
+        path = self.directory / filename
+        entry = self.files[filename]
+        try:
+            stat = path.stat()
+        except OSError:
+            # Deleted since it was indexed: rebuild and retry once
+            self.rescan()
+            return self.lookup(hotkey) if hotkey in self.hotkeys else None
+        if stat.st_mtime != entry["mtime"] or stat.st_size != entry["size"]:
+            entry = self._entry_for(path, entry)
+            if entry is None:
+                return None
+            self.files[filename] = entry
+            self.save()
+        return dict(entry, path=path)
+
+    def save(self):
+        """Write the index atomically."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": VERSION, "files": self.files, "hotkeys": self.hotkeys}, f)
+        os.replace(tmp_path, self.path)
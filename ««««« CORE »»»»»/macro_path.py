@@ -0,0 +1,107 @@
+"""Mouse path simplification and resampling for macrorecorder.py.
+
+Mouse moves are recorded every 16ms whether or not the cursor is moving, so
+a straight drag stores hundreds of points that playback sends one by one.
+simplify_path keeps only the samples needed to reproduce the path within a
+pixel tolerance, using Ramer-Douglas-Peucker with the synchronized Euclidean
+distance: a dropped sample must lie within tolerance of where the cursor is
+*at that sample's timestamp* when interpolating the kept samples, so both the
+route and its timing are preserved (stationary stretches collapse to their
+first and last samples).
+
+resample_path does the reverse at playback time: it fills the gaps between
+kept samples with linearly interpolated points at a target rate.
+"""
+
+from typing import Iterator, Tuple
+
+import numpy as np
+
+DEFAULT_TOLERANCE = 2.0  # Pixels
+
+
+def stationary_mask(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Keep mask dropping samples inside a stationary run (the first and last of each run are kept)."""
+    n = len(x)
+    keep = np.ones(n, dtype=bool)
+    if n > 2:
+        same_prev = (x[1:-1] == x[:-2]) & (y[1:-1] == y[:-2])
+        same_next = (x[1:-1] == x[2:]) & (y[1:-1] == y[2:])
+        keep[1:-1] = ~(same_prev & same_next)
+    return keep
+
+
+def simplify_path(t: np.ndarray, x: np.ndarray, y: np.ndarray,
+                  tolerance: float = DEFAULT_TOLERANCE) -> np.ndarray:
+    """
+    Indices of the samples to keep (always including the first and last).
+
+    Args:
+        t: Sample timestamps (non-decreasing)
+        x: X coordinates
+        y: Y coordinates
+        tolerance: Maximum synchronized distance (pixels) of a dropped sample
+
+    Returns:
+        Sorted array of kept indices
+    """
+    t, x, y = (np.asarray(a, dtype=np.float64) for a in (t, x, y))
+    n = len(t)
+    if n <= 2:
+        return np.arange(n)
+    candidates = np.flatnonzero(stationary_mask(x, y))
+    t, x, y = t[candidates], x[candidates], y[candidates]
+
+    keep = np.zeros(len(t), dtype=bool)
+    keep[0] = keep[-1] = True
+    tolerance_sq = tolerance * tolerance
+    stack = [(0, len(t) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        inner = slice(first + 1, last)
+        span = t[last] - t[first]
+        # Position on the segment at each inner sample's timestamp
+        frac = (t[inner] - t[first]) / span if span > 0 else np.full(last - first - 1, 0.5)
+        dx = x[inner] - (x[first] + frac * (x[last] - x[first]))
+        dy = y[inner] - (y[first] + frac * (y[last] - y[first]))
+        errors = dx * dx + dy * dy
+        worst = int(np.argmax(errors))
+        if errors[worst] > tolerance_sq:
+            split = first + 1 + worst
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return candidates[keep]
+
+
+def max_path_error(t: np.ndarray, x: np.ndarray, y: np.ndarray, kept: np.ndarray) -> float:
+    """Largest synchronized distance between the original samples and the kept path (pixels)."""
+    t = np.asarray(t, dtype=np.float64)
+    px = np.interp(t, t[kept], np.asarray(x, dtype=np.float64)[kept])
+    py = np.interp(t, t[kept], np.asarray(y, dtype=np.float64)[kept])
+    return float(np.max(np.hypot(px - x, py - y))) if len(t) else 0.0
+
+
+def resample_path(t0: float, p0: Tuple[float, float], t1: float, p1: Tuple[float, float],
+                  rate: float) -> Iterator[Tuple[float, int, int]]:
+    """
+    Interpolated samples strictly between two kept samples.
+
+    Args:
+        t0, p0: Start timestamp and (x, y)
+        t1, p1: End timestamp and (x, y)
+        rate: Samples per second
+
+    Yields:
+        (timestamp, x, y) with whole-pixel coordinates, skipping repeats of the previous point
+    """
+    steps = int((t1 - t0) * rate)
+    last = (round(p0[0]), round(p0[1]))
+    for i in range(1, steps):
+        frac = i / steps
+        point = (round(p0[0] + frac * (p1[0] - p0[0])), round(p0[1] + frac * (p1[1] - p0[1])))
+        if point != last and point != (round(p1[0]), round(p1[1])):
+            yield t0 + frac * (t1 - t0), point[0], point[1]
+            last = point
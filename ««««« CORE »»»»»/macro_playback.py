@@ -0,0 +1,145 @@
+"""Deadline-based playback scheduling for macrorecorder.py.
+
+Each action is played at t0 + timestamp * speed on the perf_counter clock
+instead of sleeping for the gap since the previous action, so execution time
+and sleep overshoot never accumulate: a late action only makes that action
+late, and the next one is still aimed at its own deadline.
+
+Waiting is hybrid: the bulk of a gap is spent in Event.wait (which returns as
+soon as playback is cancelled), and the last SPIN_THRESHOLD seconds are spun
+on perf_counter for sub-millisecond accuracy.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Optional
+
+SPIN_THRESHOLD = 0.002  # Seconds before a deadline to stop sleeping and spin
+LATENESS_WINDOW = 10000  # Most recent lateness samples kept for percentiles
+
+
+class LatenessStats:
+    """Per-action lateness (actual start - deadline) of one playback run.
+
+    Count, mean, max and the number of late actions cover the whole run;
+    percentiles use the last LATENESS_WINDOW actions, so memory stays constant
+    however long a looped playback runs.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.late_1ms = 0
+        self.recent: deque = deque(maxlen=LATENESS_WINDOW)
+        self.cancelled = False
+        self.elapsed = 0.0
+
+    def add(self, lateness: float):
+        if self.count == 0 or lateness > self.max:
+            self.max = lateness
+        self.count += 1
+        self.total += lateness
+        if lateness >= 0.001:
+            self.late_1ms += 1
+        self.recent.append(lateness)
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, mean, percentiles (of recent actions) and max of lateness in seconds."""
+        if not self.count:
+            return {'actions': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0,
+                    'late_1ms': 0, 'elapsed': self.elapsed, 'cancelled': self.cancelled}
+        values = sorted(self.recent)
+        n = len(values)
+
+        def percentile(p):
+            return values[min(n - 1, int(p * n))]
+
+        return {
+            'actions': self.count,
+            'mean': self.total / self.count,
+            'p50': percentile(0.5),
+            'p95': percentile(0.95),
+            'p99': percentile(0.99),
+            'max': self.max,
+            'late_1ms': self.late_1ms,
+            'elapsed': self.elapsed,
+            'cancelled': self.cancelled,
+        }
+
+    def format(self) -> str:
+        """One-line report, e.g. for printing after playback."""
+        s = self.summary()
+        return (f"{s['actions']} actions in {s['elapsed']:.2f}s | lateness mean {s['mean'] * 1000:.3f}ms, "
+                f"p50 {s['p50'] * 1000:.3f}ms, p99 {s['p99'] * 1000:.3f}ms, max {s['max'] * 1000:.3f}ms "
+                f"| {s['late_1ms']} over 1ms")
+
+
+class PlaybackScheduler:
+    """Plays timestamped actions at absolute deadlines."""
+
+    def __init__(self, speed: float = 1.0, spin_threshold: float = SPIN_THRESHOLD,
+                 clock: Callable[[], float] = time.perf_counter):
+        """
+        Initialize scheduler.
+
+        Args:
+            speed: Timestamp multiplier (1.0 = original speed, 0.5 = 2x faster, 2.0 = 2x slower)
+            spin_threshold: Seconds before each deadline spent spinning instead of sleeping
+            clock: Monotonic clock in seconds
+        """
+        self.speed = speed
+        self.spin_threshold = spin_threshold
+        self.clock = clock
+
+    def wait_until(self, deadline: float, cancel: threading.Event) -> bool:
+        """
+        Block until the clock reaches deadline.
+
+        Returns:
+            True when the deadline was reached, False if cancel was set first
+        """
+        clock = self.clock
+        while True:
+            remaining = deadline - clock()
+            if remaining <= 0:
+                return not cancel.is_set()
+            if cancel.is_set():
+                return False
+            if remaining > self.spin_threshold:
+                # Event.wait wakes immediately on cancel; stop early and spin the rest
+                cancel.wait(remaining - self.spin_threshold)
+            else:
+                while clock() < deadline:
+                    pass
+                return not cancel.is_set()
+
+    def run(self, actions: Iterable[Any], execute: Callable[[Any], None],
+            cancel: Optional[threading.Event] = None, timestamp: Callable[[Any], float] = None) -> LatenessStats:
+        """
+        Play actions in order, each at start + timestamp * speed.
+
+        Args:
+            actions: Actions with a .timestamp in seconds (or use the timestamp argument)
+            execute: Called with each action at its deadline
+            cancel: Event that stops playback as soon as it is set
+            timestamp: Function returning an action's timestamp (default: action.timestamp)
+
+        Returns:
+            LatenessStats for the run
+        """
+        cancel = cancel or threading.Event()
+        stats = LatenessStats()
+        clock = self.clock
+        start = clock()
+        for action in actions:
+            ts = timestamp(action) if timestamp else action.timestamp
+            deadline = start + ts * self.speed
+            if not self.wait_until(deadline, cancel):
+                stats.cancelled = True
+                break
+            stats.add(clock() - deadline)
+            execute(action)
+        stats.elapsed = clock() - start
+        return stats
@@ -0,0 +1,155 @@
+"""Lazy transformation pipeline for recorded macros.
+
+Every stage is a generator over RecordedActions, so stages compose without
+materializing anything: a macro looped 1000 times and trimmed is still played
+one action at a time from the original list. Stages never modify their
+input; changed actions are new RecordedAction objects (unchanged data dicts
+are shared).
+
+    actions = pipeline(recording.actions,
+                       lambda a: trim_idle(a, 0.5),
+                       lambda a: speed_ramp(a, 1.0, 3.0, 60.0),
+                       lambda a: translate(a, 100, 0))
+    for action in loop(recording.actions, 10): ...
+
+Sources that are read more than once (loop) must be re-iterable: a list, a
+LazyActions, or a MacroRecording's actions.
+"""
+
+import heapq
+import math
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence
+
+from macro_format import ActionType, RecordedAction
+
+Actions = Iterable[RecordedAction]
+MOUSE_TYPES = (ActionType.MOUSE_MOVE, ActionType.MOUSE_CLICK, ActionType.MOUSE_RELEASE, ActionType.MOUSE_SCROLL)
+KEY_TYPES = (ActionType.KEY_PRESS, ActionType.KEY_RELEASE)
+
+
+def pipeline(actions: Actions, *stages: Callable[[Actions], Actions]) -> Iterator[RecordedAction]:
+    """Apply stages left to right (each takes and returns an iterable of actions)."""
+    for stage in stages:
+        actions = stage(actions)
+    return iter(actions)
+
+
+def warp_time(actions: Actions, warp: Callable[[float], float]) -> Iterator[RecordedAction]:
+    """Replace each timestamp t with warp(t) (warp must be non-decreasing)."""
+    for action in actions:
+        yield RecordedAction(action.action_type, warp(action.timestamp), action.data)
+
+
+def time_scale(actions: Actions, factor: float) -> Iterator[RecordedAction]:
+    """Multiply timestamps by factor (0.5 = twice as fast)."""
+    return warp_time(actions, lambda t: t * factor)
+
+
+def speed_ramp(actions: Actions, start_speed: float, end_speed: float, duration: float) -> Iterator[RecordedAction]:
+    """
+    Play at a speed changing linearly from start_speed to end_speed over `duration` recorded seconds.
+
+    Speeds are rates (2.0 = twice as fast); after the ramp the speed stays at end_speed.
+    The new time of a recorded instant t is the integral of 1 / speed(u) du from 0 to t.
+    """
+    slope = (end_speed - start_speed) / duration if duration > 0 else 0.0
+    if slope == 0:
+        ramp_end = duration / start_speed
+    else:
+        ramp_end = math.log(end_speed / start_speed) / slope
+
+    def warp(t):
+        if t >= duration:
+            return ramp_end + (t - duration) / end_speed
+        if slope == 0:
+            return t / start_speed
+        return math.log((start_speed + slope * t) / start_speed) / slope
+
+    return warp_time(actions, warp)
+
+
+def trim_idle(actions: Actions, max_gap: float) -> Iterator[RecordedAction]:
+    """Shorten every gap between consecutive actions to at most max_gap seconds."""
+    shift = 0.0
+    previous: Optional[float] = None
+    for action in actions:
+        if previous is not None and action.timestamp - previous > max_gap:
+            shift += action.timestamp - previous - max_gap
+        previous = action.timestamp
+        yield RecordedAction(action.action_type, action.timestamp - shift, action.data)
+
+
+def offset_time(actions: Actions, offset: float) -> Iterator[RecordedAction]:
+    """Add offset seconds to every timestamp."""
+    return warp_time(actions, lambda t: t + offset)
+
+
+def concat(*sources: Actions, gap: float = 0.0) -> Iterator[RecordedAction]:
+    """Play sources one after another, each starting `gap` seconds after the previous one's last action."""
+    offset = 0.0
+    for source in sources:
+        end = None
+        for action in source:
+            end = action.timestamp
+            yield RecordedAction(action.action_type, action.timestamp + offset, action.data)
+        if end is not None:
+            offset += end + gap
+
+
+def loop(source: Sequence[RecordedAction], times: int, gap: float = 0.0) -> Iterator[RecordedAction]:
+    """Repeat a re-iterable source `times` times (0 or less = forever)."""
+    count = 0
+    offset = 0.0
+    while times <= 0 or count < times:
+        end = None
+        for action in source:
+            end = action.timestamp
+            yield RecordedAction(action.action_type, action.timestamp + offset, action.data)
+        if end is None:
+            return
+        offset += end + gap
+        count += 1
+
+
+def interleave(*sources: Actions) -> Iterator[RecordedAction]:
+    """Merge sources by timestamp (each must already be in time order)."""
+    return heapq.merge(*sources, key=lambda action: action.timestamp)
+
+
+def remap_keys(actions: Actions, mapping: Dict[str, Dict[str, Any]]) -> Iterator[RecordedAction]:
+    """
+    Replace keys in key press/release actions.
+
+    Args:
+        actions: Input actions
+        mapping: Key string (a character, "vk_<code>" or a special key name as in
+                 MacroRecorder.get_key_string) -> serialized key dict to play instead
+    """
+    for action in actions:
+        if action.action_type in KEY_TYPES:
+            key = action.data["key"]
+            if key["type"] == "keycode":
+                name = key["char"].lower() if key.get("char") else f"vk_{key.get('vk')}"
+            else:
+                name = key["name"]
+            if name in mapping:
+                action = RecordedAction(action.action_type, action.timestamp, dict(action.data, key=mapping[name]))
+        yield action
+
+
+def transform_coords(actions: Actions, dx: float = 0, dy: float = 0, scale_x: float = 1.0,
+                     scale_y: float = 1.0, origin: tuple = (0, 0)) -> Iterator[RecordedAction]:
+    """Scale mouse positions about origin, then translate by (dx, dy); results are whole pixels."""
+    ox, oy = origin
+    for action in actions:
+        if action.action_type in MOUSE_TYPES:
+            data = dict(action.data,
+                        x=round(ox + (action.data["x"] - ox) * scale_x + dx),
+                        y=round(oy + (action.data["y"] - oy) * scale_y + dy))
+            action = RecordedAction(action.action_type, action.timestamp, data)
+        yield action
+
+
+def translate(actions: Actions, dx: float, dy: float) -> Iterator[RecordedAction]:
+    """Move every mouse position by (dx, dy)."""
+    return transform_coords(actions, dx=dx, dy=dy)
@@ -8,41 +8,47 @@ Usage:
     - Double-press the hotkey (within 2s) to PLAYBACK the recording
     - Press Esc to exit the script
 
-Recordings are stored in memory and can be saved/loaded from files.
+Recordings are stored in memory and saved to macros/ in the compact binary
+format (macro_format.py); JSON macro files are still loaded.
 """
 
+from __future__ import annotations
+
 import platform
 import sys
 import time
 import threading
 import json
+import heapq
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, List, Any, Tuple, Union
-from dataclasses import dataclass, field, asdict
-from enum import Enum
+from dataclasses import dataclass, field
 
 # Platform detection
 PLATFORM = platform.system().lower()
 print(f"Running on platform: {PLATFORM}")
 
 try:
-    from pynput.keyboard import Controller as KeyboardController, Key, KeyCode, Listener as KeyboardListener
-    from pynput.mouse import Controller as MouseController, Button, Listener as MouseListener
+    from pynput.keyboard import Key, KeyCode, Listener as KeyboardListener
+    from pynput.mouse import Button, Listener as MouseListener
+    HAS_PYNPUT = True
 except ImportError:
-    print("Missing dependency: pynput is required to run this script.")
-    print("Install with: python3 -m pip install pynput")
-    sys.exit(1)
+    HAS_PYNPUT = False  # Playback through a non-pynput backend still works (see benchmark_macros.py)
+
+from macro_playback import LatenessStats, PlaybackScheduler
+import macro_format
+from macro_format import ActionType, RecordedAction
+import macro_path
+import macro_transform
+from macro_index import MacroIndex
+from macro_backend import OutputBackend, PynputBackend
+import numpy as np
 
 # Resolve paths relative to this script
 SCRIPT_DIR = Path(__file__).resolve().parent
 REPO_ROOT = SCRIPT_DIR.parent
 MACROS_DIR = REPO_ROOT / "macros"
-MACROS_DIR.mkdir(parents=True, exist_ok=True)
-
-# Controllers
-keyboard_controller = KeyboardController()
-mouse_controller = MouseController()
 
 # Double-press detection threshold (seconds)
 DOUBLE_PRESS_THRESHOLD = 2
@@ -50,40 +56,17 @@ DOUBLE_PRESS_THRESHOLD = 2
 # Playback speed multiplier (1.0 = original speed, 0.5 = 2x faster, 2.0 = 2x slower)
 PLAYBACK_SPEED = 0.1
 
+# Recorded mouse paths are simplified to within this many pixels when recording stops (None = keep every sample)
+MOUSE_PATH_TOLERANCE = macro_path.DEFAULT_TOLERANCE
 
-class ActionType(Enum):
-    """Types of recordable actions."""
-    KEY_PRESS = "key_press"
-    KEY_RELEASE = "key_release"
-    MOUSE_MOVE = "mouse_move"
-    MOUSE_CLICK = "mouse_click"
-    MOUSE_RELEASE = "mouse_release"
-    MOUSE_SCROLL = "mouse_scroll"
+# Re-interpolate simplified mouse paths at this rate during playback (Hz, None = play kept samples only)
+PLAYBACK_MOUSE_RATE = None
 
+# Play each macro this many times back to back (0 = until Esc)
+PLAYBACK_LOOPS = 1
 
-@dataclass
-class RecordedAction:
-    """A single recorded action with timestamp."""
-    action_type: ActionType
-    timestamp: float  # Time since recording started (seconds)
-    data: Dict[str, Any] = field(default_factory=dict)
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return {
-            "action_type": self.action_type.value,
-            "timestamp": self.timestamp,
-            "data": self.data
-        }
-    
-    @classmethod
-    def from_dict(cls, d: Dict[str, Any]) -> "RecordedAction":
-        """Create from dictionary."""
-        return cls(
-            action_type=ActionType(d["action_type"]),
-            timestamp=d["timestamp"],
-            data=d["data"]
-        )
+# Shorten pauses longer than this during playback (seconds, None = keep recorded pauses)
+PLAYBACK_MAX_IDLE = None
 
 
 @dataclass
@@ -91,9 +74,16 @@ class MacroRecording:
     """A complete macro recording."""
     name: str
     hotkey: str  # The key used to trigger this macro (e.g., "q", "1")
-    actions: List[RecordedAction] = field(default_factory=list)
+    actions: List[RecordedAction] = field(default_factory=list)  # LazyActions when loaded from a binary file
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     
+    @property
+    def duration(self) -> float:
+        """Timestamp of the last action (read from the header for unloaded binary files)."""
+        if isinstance(self.actions, macro_format.LazyActions):
+            return self.actions.duration
+        return self.actions[-1].timestamp if self.actions else 0
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         return {
@@ -113,37 +103,156 @@ class MacroRecording:
             created_at=d.get("created_at", datetime.now().isoformat())
         )
     
-    def save(self, filepath: Optional[Path] = None) -> Path:
-        """Save recording to a JSON file."""
+    def save(self, filepath: Optional[Path] = None, directory: Optional[Path] = None) -> Path:
+        """Save recording to a binary macro file (or JSON if filepath ends in .json).
+        
+        Args:
+            filepath: Destination (default: a timestamped file in directory)
+            directory: Directory for the default file name (default: MACROS_DIR)
+        """
         if filepath is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filepath = MACROS_DIR / f"macro_{self.hotkey}_{timestamp}.json"
+            filepath = Path(directory or MACROS_DIR) / f"macro_{self.hotkey}_{timestamp}{macro_format.SUFFIX}"
         
-        with open(filepath, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        if Path(filepath).suffix == ".json":
+            with open(filepath, "w") as f:
+                json.dump(self.to_dict(), f, indent=2)
+        else:
+            with open(filepath, "wb") as f:
+                f.write(macro_format.encode_recording(self.to_dict()))
         
         print(f"Macro saved to: {filepath}")
         return filepath
     
     @classmethod
     def load(cls, filepath: Path) -> "MacroRecording":
-        """Load recording from a JSON file."""
+        """Load recording from a binary (actions decoded on first use) or JSON file."""
+        if Path(filepath).suffix == macro_format.SUFFIX:
+            return cls.from_index_entry(dict(macro_format.read_header(filepath), path=filepath))
         with open(filepath, "r") as f:
             data = json.load(f)
         return cls.from_dict(data)
+    
+    @classmethod
+    def from_index_entry(cls, entry: Dict[str, Any]) -> "MacroRecording":
+        """Create a recording whose actions are parsed from entry["path"] on first use."""
+        return cls(
+            name=entry["name"],
+            hotkey=entry["hotkey"],
+            actions=macro_format.LazyActions(entry["path"], entry, RecordedAction.from_dict),
+            created_at=entry["created_at"] or datetime.now().isoformat()
+        )
+
+
+class EventBuffer:
+    """Preallocated append-only buffer of raw event tuples for one listener thread.
+    
+    Each listener (keyboard, mouse) owns one buffer, so appends have a single
+    producer and need no lock: the slot is written before the count is
+    published, and readers only look at slots below the count.
+    """
+    
+    def __init__(self, capacity: int = 4096):
+        self._slots: List[Any] = [None] * capacity
+        self._count = 0
+    
+    def append(self, event: Tuple):
+        i = self._count
+        if i == len(self._slots):
+            self._slots.extend([None] * i)  # Double the capacity
+        self._slots[i] = event
+        self._count = i + 1
+    
+    def __len__(self):
+        return self._count
+    
+    def snapshot(self) -> List[Tuple]:
+        """Events appended so far."""
+        return self._slots[:self._count]
+    
+    def clear(self):
+        self._slots[:self._count] = [None] * self._count
+        self._count = 0
+
+
+def optimize_mouse_paths(actions: List[RecordedAction], tolerance: float) -> List[RecordedAction]:
+    """Simplify each run of consecutive mouse moves (see macro_path.simplify_path).
+    
+    Args:
+        actions: Recorded actions in order
+        tolerance: Maximum position error in pixels at any original sample's timestamp
+    
+    Returns:
+        New action list; non-move actions and the ends of every move run are kept
+    """
+    optimized: List[RecordedAction] = []
+    run: List[RecordedAction] = []
+    
+    def flush_run():
+        if len(run) > 2:
+            t = np.array([a.timestamp for a in run])
+            x = np.array([a.data["x"] for a in run], dtype=np.float64)
+            y = np.array([a.data["y"] for a in run], dtype=np.float64)
+            optimized.extend(run[i] for i in macro_path.simplify_path(t, x, y, tolerance))
+        else:
+            optimized.extend(run)
+        run.clear()
+    
+    for action in actions:
+        if action.action_type == ActionType.MOUSE_MOVE:
+            run.append(action)
+        else:
+            flush_run()
+            optimized.append(action)
+    flush_run()
+    return optimized
+
+
+def resample_mouse_moves(actions, rate: float):
+    """Yield actions with interpolated mouse moves at `rate` Hz between consecutive moves."""
+    previous = None
+    for action in actions:
+        if action.action_type == ActionType.MOUSE_MOVE:
+            if previous is not None:
+                for timestamp, x, y in macro_path.resample_path(
+                        previous.timestamp, (previous.data["x"], previous.data["y"]),
+                        action.timestamp, (action.data["x"], action.data["y"]), rate):
+                    yield RecordedAction(ActionType.MOUSE_MOVE, timestamp, {"x": x, "y": y})
+            previous = action
+        else:
+            previous = None
+        yield action
 
 
 class MacroRecorder:
     """Main macro recorder class that handles recording and playback."""
     
-    def __init__(self):
+    def __init__(self, backend: Optional[OutputBackend] = None, macros_dir: Optional[Path] = None):
+        """Create the recorder.
+        
+        Args:
+            backend: Playback output (default: the real pynput controllers)
+            macros_dir: Where macros are saved and indexed (default: MACROS_DIR)
+        """
+        self.backend = backend or PynputBackend()
+        self.macros_dir = Path(macros_dir or MACROS_DIR)
+        self.macros_dir.mkdir(parents=True, exist_ok=True)
         self.recordings: Dict[str, MacroRecording] = {}  # hotkey -> recording
         self.current_recording: Optional[MacroRecording] = None
-        self.recording_start_time: float = 0
+        self.recording_start_time: float = 0  # perf_counter() at recording start
+        # Raw events from the listener threads (materialized into RecordedActions when recording stops)
+        self.keyboard_events = EventBuffer()
+        self.mouse_events = EventBuffer()
         self.is_recording = False
         self.is_playing = False
         self.record_mouse_movement = True  # Toggle for mouse movement recording
         self.mouse_sample_rate = 0.016  # ~60fps for mouse movement sampling
+        
+        # Playback options (defaults from the module settings above)
+        self.playback_speed = PLAYBACK_SPEED
+        self.playback_mouse_rate = PLAYBACK_MOUSE_RATE
+        self.playback_loops = PLAYBACK_LOOPS
+        self.playback_max_idle = PLAYBACK_MAX_IDLE
         self.last_mouse_sample_time = 0
         
         # Hotkey state tracking
@@ -152,10 +261,16 @@ class MacroRecorder:
         
         # Thread safety
         self.lock = threading.Lock()
+        self.playback_cancel = threading.Event()  # Set to stop playback immediately
+        # Extra macro_transform stages applied to every playback (each maps an action iterable to a new one)
+        self.playback_transforms: List[Any] = []
         
         # Running state
         self.running = True
         
+        # Saved macros by hotkey (persistent, see macro_index.py)
+        self.index = MacroIndex(self.macros_dir)
+        
         # Listeners (will be set up later)
         self.keyboard_listener: Optional[KeyboardListener] = None
         self.mouse_listener: Optional[MouseListener] = None
@@ -177,16 +292,6 @@ class MacroRecorder:
         else:
             return {"type": "special", "name": key.name}
     
-    def serializable_to_key(self, data: Dict[str, Any]) -> Union[Key, KeyCode]:
-        """Convert a serializable dictionary back to a key."""
-        if data["type"] == "keycode":
-            if data["char"]:
-                return KeyCode.from_char(data["char"])
-            else:
-                return KeyCode.from_vk(data["vk"])
-        else:
-            return getattr(Key, data["name"])
-    
     def is_ctrl_key(self, key: Union[Key, KeyCode]) -> bool:
         """Check if the key is a Ctrl modifier."""
         if isinstance(key, Key):
@@ -215,6 +320,7 @@ class MacroRecorder:
             if self.is_playing:
                 print("   Stopping active playback...")
                 self.is_playing = False
+            self.playback_cancel.set()
             # Stop the recorder
             self.running = False
             print("   Macro recorder terminated.")
@@ -238,13 +344,7 @@ class MacroRecorder:
         if self.is_recording and self.current_recording:
             # Don't record modifier keys by themselves
             if not self.is_modifier_key(key):
-                with self.lock:
-                    action = RecordedAction(
-                        action_type=ActionType.KEY_PRESS,
-                        timestamp=time.time() - self.recording_start_time,
-                        data={"key": self.key_to_serializable(key)}
-                    )
-                    self.current_recording.actions.append(action)
+                self.keyboard_events.append((ActionType.KEY_PRESS, time.perf_counter(), key))
         
         return None
     
@@ -261,13 +361,7 @@ class MacroRecorder:
         # Record the key release if recording
         if self.is_recording and self.current_recording:
             if not self.is_modifier_key(key):
-                with self.lock:
-                    action = RecordedAction(
-                        action_type=ActionType.KEY_RELEASE,
-                        timestamp=time.time() - self.recording_start_time,
-                        data={"key": self.key_to_serializable(key)}
-                    )
-                    self.current_recording.actions.append(action)
+                self.keyboard_events.append((ActionType.KEY_RELEASE, time.perf_counter(), key))
         
         return None
     
@@ -277,45 +371,27 @@ class MacroRecorder:
             return
         
         # Rate limit mouse movement recording
-        current_time = time.time()
+        current_time = time.perf_counter()
         if current_time - self.last_mouse_sample_time < self.mouse_sample_rate:
             return
         self.last_mouse_sample_time = current_time
         
-        if self.current_recording:
-            with self.lock:
-                action = RecordedAction(
-                    action_type=ActionType.MOUSE_MOVE,
-                    timestamp=time.time() - self.recording_start_time,
-                    data={"x": x, "y": y}
-                )
-                self.current_recording.actions.append(action)
+        self.mouse_events.append((ActionType.MOUSE_MOVE, current_time, x, y))
     
     def on_mouse_click(self, x: int, y: int, button: Button, pressed: bool):
         """Handle mouse click events."""
         if not self.is_recording or not self.current_recording:
             return
         
-        with self.lock:
-            action = RecordedAction(
-                action_type=ActionType.MOUSE_CLICK if pressed else ActionType.MOUSE_RELEASE,
-                timestamp=time.time() - self.recording_start_time,
-                data={"x": x, "y": y, "button": button.name}
-            )
-            self.current_recording.actions.append(action)
+        self.mouse_events.append((ActionType.MOUSE_CLICK if pressed else ActionType.MOUSE_RELEASE,
+                                  time.perf_counter(), x, y, button))
     
     def on_mouse_scroll(self, x: int, y: int, dx: int, dy: int):
         """Handle mouse scroll events."""
         if not self.is_recording or not self.current_recording:
             return
         
-        with self.lock:
-            action = RecordedAction(
-                action_type=ActionType.MOUSE_SCROLL,
-                timestamp=time.time() - self.recording_start_time,
-                data={"x": x, "y": y, "dx": dx, "dy": dy}
-            )
-            self.current_recording.actions.append(action)
+        self.mouse_events.append((ActionType.MOUSE_SCROLL, time.perf_counter(), x, y, dx, dy))
     
     def handle_hotkey(self, hotkey: str):
         """Handle a Ctrl+key hotkey press."""
@@ -355,12 +431,14 @@ class MacroRecorder:
     def start_recording(self, hotkey: str):
         """Start recording a new macro."""
         with self.lock:
-            self.is_recording = True
-            self.recording_start_time = time.time()
+            self.keyboard_events.clear()
+            self.mouse_events.clear()
+            self.recording_start_time = time.perf_counter()
             self.current_recording = MacroRecording(
                 name=f"Macro_{hotkey}",
                 hotkey=hotkey
             )
+            self.is_recording = True
         
         print(f"\n🔴 Recording started for Ctrl+{hotkey.upper()}")
         print("   Press Ctrl+{} again to stop recording".format(hotkey.upper()))
@@ -368,46 +446,74 @@ class MacroRecorder:
     def stop_recording(self):
         """Stop the current recording."""
         with self.lock:
+            self.is_recording = False  # Listeners stop appending events
             if self.current_recording:
                 hotkey = self.current_recording.hotkey
-                action_count = len(self.current_recording.actions)
+                self.current_recording.actions = self.materialize_events()
+                # Drop redundant mouse samples (path and timing stay within MOUSE_PATH_TOLERANCE)
+                raw_count = len(self.current_recording.actions)
+                if MOUSE_PATH_TOLERANCE is not None:
+                    self.current_recording.actions = optimize_mouse_paths(
+                        self.current_recording.actions, MOUSE_PATH_TOLERANCE)
                 
-                # Calculate duration
-                if self.current_recording.actions:
-                    duration = self.current_recording.actions[-1].timestamp
-                else:
-                    duration = 0
+                action_count = len(self.current_recording.actions)
+                duration = self.current_recording.duration
                 
                 # Store the recording
                 self.recordings[hotkey] = self.current_recording
                 
                 print(f"\n⏹️  Recording stopped for Ctrl+{hotkey.upper()}")
                 print(f"   Recorded {action_count} actions over {duration:.2f}s")
+                if action_count != raw_count:
+                    print(f"   Mouse paths simplified from {raw_count} actions (±{MOUSE_PATH_TOLERANCE}px)")
                 print(f"   Double-press Ctrl+{hotkey.upper()} to playback")
                 
                 # Auto-save the recording
-                self.current_recording.save()
+                self.index.add(self.current_recording.save(directory=self.macros_dir))
                 
                 self.current_recording = None
-            
-            self.is_recording = False
     
-    def playback(self, hotkey: str):
-        """Play back a recorded macro."""
+    def materialize_events(self) -> List[RecordedAction]:
+        """Turn the buffered raw listener events into RecordedActions, merged in time order."""
+        start = self.recording_start_time
+        actions = []
+        events = heapq.merge(self.keyboard_events.snapshot(), self.mouse_events.snapshot(),
+                             key=lambda event: event[1])
+        for action_type, timestamp, *args in events:
+            if action_type in (ActionType.KEY_PRESS, ActionType.KEY_RELEASE):
+                data = {"key": self.key_to_serializable(args[0])}
+            elif action_type == ActionType.MOUSE_MOVE:
+                data = {"x": args[0], "y": args[1]}
+            elif action_type == ActionType.MOUSE_SCROLL:
+                data = {"x": args[0], "y": args[1], "dx": args[2], "dy": args[3]}
+            else:
+                data = {"x": args[0], "y": args[1], "button": args[2].name}
+            actions.append(RecordedAction(action_type=action_type, timestamp=timestamp - start, data=data))
+        self.keyboard_events.clear()
+        self.mouse_events.clear()
+        return actions
+    
+    def playback(self, hotkey: str) -> Optional[LatenessStats]:
+        """Play back a recorded macro.
+        
+        Returns:
+            Timing statistics of the run, or None if nothing was played
+        """
         recording = self.recordings.get(hotkey)
         if not recording or not recording.actions:
             print(f"No recording found for Ctrl+{hotkey.upper()}")
-            return
+            return None
         
         if self.is_playing:
             print("Already playing a macro!")
-            return
+            return None
         
         self.is_playing = True
+        self.playback_cancel.clear()
         
         # Calculate mouse offset from the first mouse action to current position
         offset_x, offset_y = 0, 0
-        current_pos = mouse_controller.position
+        current_pos = self.backend.position()
         
         # Find the first mouse action to determine the original starting position
         for action in recording.actions:
@@ -424,46 +530,38 @@ class MacroRecorder:
             print(f"   Mouse offset: ({int(offset_x):+d}, {int(offset_y):+d})")
         
         try:
-            last_timestamp = 0
+            # Each action runs at its own deadline (start + timestamp * speed), so delays don't drift;
+            # Esc sets playback_cancel, which wakes the scheduler immediately
+            scheduler = PlaybackScheduler(speed=self.playback_speed)
+            # All stages are generators, so looped macros are never expanded in memory
+            actions = recording.actions
+            if self.playback_loops != 1:
+                actions = macro_transform.loop(actions, self.playback_loops)
+            if self.playback_max_idle is not None:
+                actions = macro_transform.trim_idle(actions, self.playback_max_idle)
+            actions = macro_transform.pipeline(actions, *self.playback_transforms)
+            if self.playback_mouse_rate:
+                actions = resample_mouse_moves(actions, self.playback_mouse_rate)
+            stats = scheduler.run(actions,
+                                  lambda action: self.execute_action(action, offset_x, offset_y),
+                                  self.playback_cancel)
             
-            for action in recording.actions:
-                # Check if we should stop (Esc was pressed)
-                if not self.running:
-                    print("\n⛔ Playback interrupted by Esc")
-                    break
-                
-                # Wait for the appropriate time
-                delay = (action.timestamp - last_timestamp) * PLAYBACK_SPEED
-                if delay > 0:
-                    # Split sleep into smaller chunks to respond faster to Esc
-                    sleep_chunk = 0.05  # 50ms chunks
-                    remaining = delay
-                    while remaining > 0 and self.running:
-                        chunk = min(sleep_chunk, remaining)
-                        time.sleep(chunk)
-                        remaining -= chunk
-                    
-                    # If Esc was pressed during sleep, stop immediately
-                    if not self.running:
-                        print("\n⛔ Playback interrupted by Esc")
-                        break
-                
-                last_timestamp = action.timestamp
-                
-                # Execute the action with mouse offset
-                self.execute_action(action, offset_x, offset_y)
-            
-            if self.running:  # Only print completion if not interrupted
+            if stats.cancelled:
+                print("\n⛔ Playback interrupted by Esc")
+            else:
                 print(f"✅ Playback complete for Ctrl+{hotkey.upper()}")
+            print(f"   Timing: {stats.format()}")
+            return stats
         
         except Exception as e:
             print(f"Playback error: {e}")
+            return None
         
         finally:
             self.is_playing = False
     
     def execute_action(self, action: RecordedAction, offset_x: int = 0, offset_y: int = 0):
-        """Execute a single recorded action.
+        """Execute a single recorded action through the output backend.
         
         Args:
             action: The action to execute
@@ -471,39 +569,7 @@ class MacroRecorder:
             offset_y: Y offset to apply to mouse positions
         """
         try:
-            if action.action_type == ActionType.KEY_PRESS:
-                key = self.serializable_to_key(action.data["key"])
-                keyboard_controller.press(key)
-            
-            elif action.action_type == ActionType.KEY_RELEASE:
-                key = self.serializable_to_key(action.data["key"])
-                keyboard_controller.release(key)
-            
-            elif action.action_type == ActionType.MOUSE_MOVE:
-                x = action.data["x"] + offset_x
-                y = action.data["y"] + offset_y
-                mouse_controller.position = (x, y)
-            
-            elif action.action_type == ActionType.MOUSE_CLICK:
-                button = getattr(Button, action.data["button"])
-                x = action.data["x"] + offset_x
-                y = action.data["y"] + offset_y
-                mouse_controller.position = (x, y)
-                mouse_controller.press(button)
-            
-            elif action.action_type == ActionType.MOUSE_RELEASE:
-                button = getattr(Button, action.data["button"])
-                x = action.data["x"] + offset_x
-                y = action.data["y"] + offset_y
-                mouse_controller.position = (x, y)
-                mouse_controller.release(button)
-            
-            elif action.action_type == ActionType.MOUSE_SCROLL:
-                x = action.data["x"] + offset_x
-                y = action.data["y"] + offset_y
-                mouse_controller.position = (x, y)
-                mouse_controller.scroll(action.data["dx"], action.data["dy"])
-        
+            self.backend.execute(action, offset_x, offset_y)
         except Exception as e:
             print(f"Action execution error: {e}")
     
@@ -515,49 +581,35 @@ class MacroRecorder:
         
         print("\n📋 Available recordings:")
         for hotkey, recording in self.recordings.items():
-            duration = recording.actions[-1].timestamp if recording.actions else 0
+            duration = recording.duration
             print(f"   Ctrl+{hotkey.upper()}: {len(recording.actions)} actions, {duration:.2f}s")
     
     def find_macro_file(self, hotkey: str) -> Optional[Path]:
-        """Find the most recent macro file for a given hotkey."""
-        # Find all macro files for this hotkey
-        pattern = f"macro_{hotkey}_*.json"
-        matches = list(MACROS_DIR.glob(pattern))
-        
-        if not matches:
-            return None
-        
-        # Return the most recent one (sorted by filename timestamp)
-        return sorted(matches)[-1]
+        """Find the most recent macro file for a given hotkey (index lookup, no globbing)."""
+        entry = self.index.lookup(hotkey)
+        return entry["path"] if entry else None
     
     def load_macro(self, hotkey: str) -> bool:
-        """Load a specific macro by hotkey if it exists.
+        """Load a specific macro by hotkey if it exists (actions are parsed on first playback).
         
         Returns:
             True if macro was loaded, False otherwise
         """
-        filepath = self.find_macro_file(hotkey)
-        if not filepath:
+        entry = self.index.lookup(hotkey)
+        if not entry:
             return False
         
-        try:
-            recording = MacroRecording.load(filepath)
-            self.recordings[recording.hotkey] = recording
-            print(f"📂 Loaded existing macro: {filepath.name}")
-            return True
-        except Exception as e:
-            print(f"Failed to load {filepath.name}: {e}")
-            return False
+        self.recordings[hotkey] = MacroRecording.from_index_entry(entry)
+        print(f"📂 Loaded existing macro: {entry['path'].name}")
+        return True
     
     def load_all_recordings(self):
-        """Load all saved recordings from the macros directory."""
-        for filepath in MACROS_DIR.glob("macro_*.json"):
-            try:
-                recording = MacroRecording.load(filepath)
-                self.recordings[recording.hotkey] = recording
-                print(f"Loaded: {filepath.name}")
-            except Exception as e:
-                print(f"Failed to load {filepath.name}: {e}")
+        """Register every indexed macro (actions are parsed on first playback)."""
+        for hotkey in list(self.index.hotkeys):
+            entry = self.index.lookup(hotkey)
+            if entry:
+                self.recordings[hotkey] = MacroRecording.from_index_entry(entry)
+                print(f"Loaded: {entry['path'].name}")
     
     def run(self):
         """Start the macro recorder."""
@@ -570,8 +622,10 @@ class MacroRecorder:
         print("  • Esc               → Exit")
         print("\nOptions:")
         print(f"  • Mouse movement recording: {'ON' if self.record_mouse_movement else 'OFF'}")
-        print(f"  • Playback speed: {PLAYBACK_SPEED}x")
-        print(f"  • Macros directory: {MACROS_DIR}")
+        print(f"  • Playback speed: {self.playback_speed}x")
+        if self.playback_loops != 1:
+            print(f"  • Playback loops: {self.playback_loops or 'until Esc'}")
+        print(f"  • Macros directory: {self.macros_dir}")
         print("=" * 60 + "\n")
         
         # Load existing recordings
@@ -618,6 +672,11 @@ class MacroRecorder:
 
 def main():
     """Main entry point."""
+    if not HAS_PYNPUT:
+        print("Missing dependency: pynput is required to run this script.")
+        print("Install with: python3 -m pip install pynput")
+        sys.exit(1)
+    
     recorder = MacroRecorder()
     
     # Command line options
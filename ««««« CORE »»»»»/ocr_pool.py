@@ -0,0 +1,241 @@
+"""Persistent OCR worker pool with a content-hash result cache.
+
+arrastools.py used to call pytesseract synchronously on its own thread, one
+psm mode after another. OcrPool keeps a few long-lived worker threads fed by
+a bounded queue (submit() blocks when it is full instead of piling up
+screenshots) and caches results in an LRU keyed by a digest of the image
+bytes plus the preprocessing step, task and config:
+
+- a region whose pixels are identical to an earlier one returns the cached
+  result without preprocessing or OCR,
+- a request identical to one still in flight shares its future,
+- several configs (e.g. psm 6 and psm 11) run in parallel via first_text().
+
+The digest is xxhash (xxh3_64) when the xxhash package is installed and
+BLAKE2b otherwise. It is an exact hash of the crop *before* preprocessing,
+so hits also skip the upscaling; preprocessing is deterministic, so this
+is equivalent to keying by the preprocessed image. pytesseract still runs
+the tesseract binary once per cache miss.
+
+Latency percentiles (of cache misses, from submit to result) and hit rates
+are available from stats() / format_stats().
+"""
+
+import hashlib
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    import pytesseract
+    HAS_TESSERACT = True
+except ImportError:
+    HAS_TESSERACT = False
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 8
+DEFAULT_CACHE_SIZE = 256
+LATENCY_WINDOW = 1000  # Latencies kept for percentiles
+
+
+def image_digest(image) -> bytes:
+    """Digest of a PIL image's or NumPy array's pixels, mode and size."""
+    if hasattr(image, 'mode'):
+        header = f"{image.mode}{image.size}".encode()
+    else:
+        header = f"{image.dtype}{image.shape}".encode()
+    data = image.tobytes()
+    if HAS_XXHASH:
+        return xxhash.xxh3_64_digest(header + data)
+    return hashlib.blake2b(header + data, digest_size=16).digest()
+
+
+def tesseract_engine(image, kind: str, config: str):
+    """Run pytesseract: kind 'string' (image_to_string) or 'data' (image_to_data as a dict)."""
+    if kind == 'data':
+        return pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+    return pytesseract.image_to_string(image, config=config)
+
+
+class OcrPool:
+    """Long-lived OCR worker threads behind a bounded queue and an LRU result cache."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 cache_size: int = DEFAULT_CACHE_SIZE, engine: Optional[Callable[[Any, str, str], Any]] = None):
+        """
+        Start the workers.
+
+        Args:
+            workers: Number of worker threads (each runs one OCR at a time)
+            queue_size: Maximum queued requests; submit() blocks beyond this
+            cache_size: Maximum cached results (least recently used are evicted)
+            engine: Function (image, kind, config) -> result (default: pytesseract)
+        """
+        self.engine = engine or tesseract_engine
+        self.cache_size = cache_size
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.cache: OrderedDict = OrderedDict()
+        self.pending: Dict[tuple, Future] = {}
+        self.lock = threading.Lock()
+        self.latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self.hits = 0
+        self.joined = 0  # Requests that shared an in-flight future
+        self.misses = 0
+        self.errors = 0
+        self.threads = [threading.Thread(target=self._worker, name=f"ocr-worker-{i}", daemon=True)
+                        for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, image, kind: str = 'string', config: str = '',
+               preprocess: Optional[Callable] = None, timeout: Optional[float] = None) -> Future:
+        """
+        Queue an OCR request (or answer it from the cache).
+
+        Args:
+            image: PIL image (or array the engine accepts)
+            kind: 'string' for text, 'data' for word boxes (image_to_data dict)
+            config: Tesseract config string, e.g. '--oem 1 --psm 6'
+            preprocess: Deterministic image -> image step run on the worker; the function object is part
+                of the cache key, so pass the same function (not a new lambda) to get cache hits
+            timeout: Seconds to wait for queue space (None = wait forever); raises queue.Full
+
+        Returns:
+            Future with the OCR result (treat cached results as read-only)
+        """
+        # The callable itself (hashed by identity) is part of the key: distinct steps never share results
+        key = (image_digest(image), kind, config, preprocess)
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                future = Future()
+                future.set_result(self.cache[key])
+                return future
+            if key in self.pending:
+                self.joined += 1
+                return self.pending[key]
+            self.misses += 1
+            future = Future()
+            self.pending[key] = future
+        try:
+            self.queue.put((key, image, kind, config, preprocess, future, time.perf_counter()), timeout=timeout)
+        except queue.Full:
+            with self.lock:
+                self.pending.pop(key, None)
+                self.misses -= 1
+            raise
+        return future
+
+    def _worker(self):
+        while True:
+            task = self.queue.get()
+            if task is None:
+                return
+            key, image, kind, config, preprocess, future, submitted = task
+            try:
+                if preprocess is not None:
+                    image = preprocess(image)
+                result = self.engine(image, kind, config)
+            except Exception as e:
+                with self.lock:
+                    self.pending.pop(key, None)
+                    self.errors += 1
+                future.set_exception(e)
+                continue
+            with self.lock:
+                self.cache[key] = result
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+                self.pending.pop(key, None)
+                self.latencies.append(time.perf_counter() - submitted)
+            future.set_result(result)
+
+    def image_to_string(self, image, config: str = '', preprocess: Optional[Callable] = None) -> str:
+        """Blocking text OCR through the pool."""
+        return self.submit(image, 'string', config, preprocess).result()
+
+    def image_to_data(self, image, config: str = '', preprocess: Optional[Callable] = None) -> Dict[str, List]:
+        """Blocking word-box OCR (pytesseract Output.DICT format) through the pool."""
+        return self.submit(image, 'data', config, preprocess).result()
+
+    def first_text(self, image, configs: Sequence[str], preprocess: Optional[Callable] = None) -> str:
+        """
+        Run several configs in parallel and return the first non-empty text in config order.
+
+        Args:
+            image: Image to read
+            configs: Tesseract configs in order of preference
+            preprocess: Preprocessing step shared by all configs
+
+        Returns:
+            Stripped text, or '' if every config found nothing
+        """
+        futures = [self.submit(image, 'string', config, preprocess) for config in configs]
+        for future in futures:
+            text = future.result().strip()
+            if text:
+                return text
+        return ''
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counts, hit rate, queue depth and miss latency percentiles (seconds)."""
+        with self.lock:
+            latencies = sorted(self.latencies)
+            hits, joined, misses, errors = self.hits, self.joined, self.misses, self.errors
+            cached = len(self.cache)
+        requests = hits + joined + misses
+
+        def percentile(q):
+            return latencies[min(int(q * len(latencies)), len(latencies) - 1)] if latencies else 0.0
+
+        return {
+            'requests': requests,
+            'hits': hits,
+            'joined': joined,
+            'misses': misses,
+            'errors': errors,
+            'hit_rate': (hits + joined) / requests if requests else 0.0,
+            'cached': cached,
+            'queued': self.queue.qsize(),
+            'p50': percentile(0.50),
+            'p95': percentile(0.95),
+            'p99': percentile(0.99),
+            'max': latencies[-1] if latencies else 0.0,
+        }
+
+    def format_stats(self) -> str:
+        """One-line summary of stats()."""
+        s = self.stats()
+        return (f"{s['requests']} requests, {s['hit_rate'] * 100:.0f}% cached | "
+                f"OCR latency p50 {s['p50'] * 1000:.0f}ms, p95 {s['p95'] * 1000:.0f}ms, "
+                f"p99 {s['p99'] * 1000:.0f}ms, max {s['max'] * 1000:.0f}ms")
+
+    def shutdown(self):
+        """Stop the workers after the queued requests finish."""
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+
+
+_pool: Optional[OcrPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> OcrPool:
+    """The shared pool, started on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = OcrPool()
+        return _pool
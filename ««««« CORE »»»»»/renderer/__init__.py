@@ -5,5 +5,6 @@ Provides abstract renderer interface and implementations for GPU (OpenGL) and CP
 
 from .base_renderer import BaseRenderer
 from .sprite_pool import SpritePool
+from .profiler import FrameProfiler
 
-__all__ = ['BaseRenderer', 'SpritePool']
+__all__ = ['BaseRenderer', 'SpritePool', 'FrameProfiler']
@@ -0,0 +1,249 @@
+"""
+Per-phase frame profiler for the rhythm game loop.
+Times named spans with perf_counter_ns, keeps a ring buffer of samples per span
+for percentile breakdowns, and can export a Chrome trace (chrome://tracing, Perfetto).
+"""
+
+import json
+import os
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+
+class _Span:
+    """Reusable context manager that records one named span into the profiler."""
+
+    __slots__ = ('profiler', 'name', 'start_ns')
+
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start_ns = 0
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, self.start_ns, time.perf_counter_ns())
+        return False
+
+
+class _NullSpan:
+    """No-op span used while profiling is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class SpanRing:
+    """Fixed-size ring buffer of span durations (nanoseconds)."""
+
+    __slots__ = ('samples', 'capacity', 'index', 'count', 'total_ns')
+
+    def __init__(self, capacity: int):
+        """
+        Initialize ring buffer.
+
+        Args:
+            capacity: Number of most recent samples to keep
+        """
+        self.samples = [0] * capacity
+        self.capacity = capacity
+        self.index = 0
+        self.count = 0
+        self.total_ns = 0  # Lifetime sum, used for share-of-frame reporting
+
+    def push(self, duration_ns: int):
+        """Store a duration, overwriting the oldest sample when full."""
+        self.samples[self.index] = duration_ns
+        self.index = (self.index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        self.total_ns += duration_ns
+
+    def percentiles(self, pcts: Tuple[float, ...]) -> List[float]:
+        """
+        Get percentiles over the buffered samples (nearest-rank).
+
+        Args:
+            pcts: Percentiles to compute, each in 0-100
+
+        Returns:
+            List of durations in milliseconds, one per requested percentile
+        """
+        if self.count == 0:
+            return [0.0 for _ in pcts]
+        ordered = sorted(self.samples[:self.count])
+        last = self.count - 1
+        return [ordered[min(last, int(round(p / 100.0 * last)))] / 1e6 for p in pcts]
+
+
+class FrameProfiler:
+    """
+    Lightweight per-phase profiler.
+
+    Usage:
+        profiler.begin_frame()
+        with profiler.span('update_notes'):
+            update_notes(current_time)
+        profiler.end_frame()
+    """
+
+    FRAME_SPAN = 'frame'
+
+    def __init__(self, capacity: int = 600, enabled: bool = True,
+                 trace_enabled: bool = False, max_trace_events: int = 500000):
+        """
+        Initialize profiler.
+
+        Args:
+            capacity: Samples kept per span for percentile calculation
+            enabled: Whether spans are recorded at all
+            trace_enabled: Whether to keep raw events for Chrome trace export
+            max_trace_events: Cap on buffered trace events (oldest kept, newest dropped)
+        """
+        self.capacity = capacity
+        self.enabled = enabled
+        self.trace_enabled = trace_enabled
+        self.max_trace_events = max_trace_events
+        self.rings: Dict[str, SpanRing] = {}
+        self.span_order: List[str] = []  # First-seen order, for stable display
+        self.trace_events: List[Tuple[str, int, int]] = []  # (name, start_ns, dur_ns)
+        self.dropped_events = 0
+        self.frame_count = 0
+        self._spans: Dict[str, _Span] = {}
+        self._frame_start_ns = 0
+        self._origin_ns = time.perf_counter_ns()
+
+    def reset(self):
+        """Clear all samples and trace events (call at the start of a run)."""
+        self.rings.clear()
+        self.span_order.clear()
+        self.trace_events.clear()
+        self.dropped_events = 0
+        self.frame_count = 0
+        self._frame_start_ns = 0
+        self._origin_ns = time.perf_counter_ns()
+
+    def span(self, name: str):
+        """
+        Get a context manager that times the enclosed block.
+
+        Args:
+            name: Span name (e.g. 'update_notes')
+
+        Returns:
+            Context manager (shared no-op instance when disabled)
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        span = self._spans.get(name)
+        if span is None:
+            span = _Span(self, name)
+            self._spans[name] = span
+        return span
+
+    def begin_frame(self):
+        """Mark the start of a frame."""
+        if self.enabled:
+            self._frame_start_ns = time.perf_counter_ns()
+
+    def end_frame(self):
+        """Mark the end of a frame and record the whole-frame span."""
+        if self.enabled and self._frame_start_ns:
+            self.record(self.FRAME_SPAN, self._frame_start_ns, time.perf_counter_ns())
+            self.frame_count += 1
+
+    def record(self, name: str, start_ns: int, end_ns: int):
+        """
+        Record a finished span.
+
+        Args:
+            name: Span name
+            start_ns: perf_counter_ns() at span start
+            end_ns: perf_counter_ns() at span end
+        """
+        ring = self.rings.get(name)
+        if ring is None:
+            ring = SpanRing(self.capacity)
+            self.rings[name] = ring
+            self.span_order.append(name)
+        duration = end_ns - start_ns
+        ring.push(duration)
+
+        if self.trace_enabled:
+            if len(self.trace_events) < self.max_trace_events:
+                self.trace_events.append((name, start_ns, duration))
+            else:
+                self.dropped_events += 1
+
+    def get_breakdown(self, pcts: Tuple[float, ...] = (50, 95, 99)) -> List[Dict[str, Any]]:
+        """
+        Get per-span statistics over the buffered samples.
+
+        Args:
+            pcts: Percentiles to report
+
+        Returns:
+            List of dicts with name, percentiles (ms), max (ms) and share of total frame time
+        """
+        frame_ring = self.rings.get(self.FRAME_SPAN)
+        frame_total = frame_ring.total_ns if frame_ring else 0
+        breakdown = []
+        for name in self.span_order:
+            ring = self.rings[name]
+            values = ring.percentiles(pcts)
+            breakdown.append({
+                'name': name,
+                'percentiles': dict(zip(pcts, values)),
+                'max': max(ring.samples[:ring.count]) / 1e6 if ring.count else 0.0,
+                'share': ring.total_ns / frame_total if frame_total else 0.0,
+                'samples': ring.count,
+            })
+        return breakdown
+
+    def write_chrome_trace(self, path: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Write buffered events as Chrome trace JSON (load in chrome://tracing or ui.perfetto.dev).
+
+        Args:
+            path: Output file path
+            metadata: Optional extra metadata stored in the trace
+
+        Returns:
+            True if the file was written, False on error
+        """
+        pid = os.getpid()
+        events = [{
+            'name': name,
+            'ph': 'X',
+            'ts': (start_ns - self._origin_ns) / 1000.0,  # Trace format uses microseconds
+            'dur': dur_ns / 1000.0,
+            'pid': pid,
+            'tid': 0 if name == self.FRAME_SPAN else 1,
+        } for name, start_ns, dur_ns in self.trace_events]
+
+        trace = {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': dict(metadata or {}, dropped_events=self.dropped_events),
+        }
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(trace, f)
+            return True
+        except Exception as e:
+            print(f"Error writing trace: {e}")
+            return False
@@ -6,9 +6,13 @@ from PIL import Image, ImageTk
 import threading
 import os
 import glob
+import bisect
 import signal
 import sys
 import pygame
+from renderer import FrameProfiler
+from chart_analyzer import ChartMetricsCache, format_metrics_summary
+from chart_parser import parse_chart
 
 # Disable pygame/audio support
 AUDIO_AVAILABLE = True
@@ -95,7 +99,8 @@ hit_sprite_images = [None, None, None, None]
 slide_sprite_images = [None, None, None, None]
 
 # Game state
-chart = []
+chart = []  # Full compiled chart, sorted by time (never mutated during play)
+chart_index = 0  # Cursor: next note in chart to spawn
 bpm_changes = []  # List of (beat, bpm) tuples
 initial_bpm = 60
 speed_changes = []  # List of (beat, speed_multiplier) tuples for spd% option
@@ -115,7 +120,8 @@ good_count = 0
 bad_count = 0
 miss_count = 0
 game_running = False
-start_time = 0
+start_time = 0  # Wall time at which song time 0 occurs (scaled by song_rate)
+song_rate = 1.0  # Song clock rate (practice speed), see get_song_time()
 replay_data = []  # List of (timestamp, event_type, lane) tuples
 is_replay = False  # Whether currently playing a replay
 replay_index = 0  # Current position in replay
@@ -123,16 +129,75 @@ current_chart_id = None
 current_difficulty = None
 music_playing = False
 
+class InputRing:
+    """Bounded single-producer/single-consumer ring of (song_time, kind, lane) input events.
+    
+    The producer only writes slots and advances tail; the consumer only reads slots and
+    advances head. Each index has exactly one writer, so neither side needs a lock.
+    """
+    
+    __slots__ = ('slots', 'capacity', 'head', 'tail', 'dropped')
+    
+    def __init__(self, capacity):
+        self.slots = [None] * capacity
+        self.capacity = capacity
+        self.head = 0  # Next slot to read (consumer-owned)
+        self.tail = 0  # Next slot to write (producer-owned)
+        self.dropped = 0  # Events rejected because the ring was full (producer-owned)
+    
+    def push(self, event):
+        """Producer side: enqueue an event, returns False if the ring is full"""
+        tail = self.tail
+        if tail - self.head >= self.capacity:
+            self.dropped += 1
+            return False
+        self.slots[tail % self.capacity] = event
+        self.tail = tail + 1  # Publish only after the slot is written
+        return True
+    
+    def drain(self):
+        """Consumer side: return all queued events in order"""
+        head, tail = self.head, self.tail
+        events = [self.slots[i % self.capacity] for i in range(head, tail)]
+        self.head = tail
+        return events
+    
+    def clear(self):
+        """Consumer side: discard queued events"""
+        self.head = self.tail
+
+# Key events are only queued by input callbacks and applied by the game loop (apply_input_events),
+# so the game thread is the single writer of key, score and note state.
+# One ring per producer: Tkinter handlers and the pynput listener thread.
+tk_input = InputRing(1024)
+listener_input = InputRing(1024)
+
+# Auto mode input schedule (see build_auto_schedule)
+AUTO_TAP_HOLD = 0.05  # Seconds a tap key is held by auto play
+auto_schedule = []
+auto_schedule_times = []  # Event times, for bisecting
+auto_schedule_index = 0  # Next event to inject
+
 # Game modes
 game_mode = 'normal'  # 'normal', 'auto', or 'practice'
 practice_speed = 1.0  # Practice mode speed multiplier
 practice_loop_start = None  # Practice mode loop start (in seconds)
 practice_loop_end = None  # Practice mode loop end (in seconds)
 practice_looping = False  # Whether loop is enabled
+practice_snapshot = None  # Game state captured at practice_loop_start (see take_practice_snapshot)
 
 # Particle system for hit effects
 active_particles = []  # List of (x, y, size, color, end_time) tuples
 
+# Chart density metrics, filled in by a background scan when the chart menu opens
+chart_metrics = ChartMetricsCache()
+CHART_SORT_MODES = ['name', 'peak nps', 'duration', 'notes']
+
+# Per-phase frame profiler (enabled per run in game_loop)
+profiler = FrameProfiler(capacity=600, enabled=False)
+profiler_overlay_text = ""  # Cached breakdown text, refreshed every PROFILER_OVERLAY_INTERVAL frames
+PROFILER_OVERLAY_INTERVAL = 30
+
 # Settings
 settings = {
     'scroll_speed_multiplier': 1.0,  # Global scroll speed multiplier (0.1 to 10)
@@ -156,6 +221,8 @@ settings = {
     'fps_target': 60,  # Target FPS (1 to 600)
     'renderer': 'auto',  # 'auto', 'tkinter', or 'opengl'
     'show_performance_metrics': False,  # Show detailed performance metrics
+    'show_phase_breakdown': False,  # Show per-phase frame timing overlay (F3 toggles in game)
+    'write_profile_trace': False,  # Write Chrome trace JSON to traces/ after each run
 }
 
 # Key mappings (will be rebuilt from settings)
@@ -179,6 +246,19 @@ ARROW_MAPPINGS = {
     Key.right: 3,
 }
 
+def get_song_time(now=None):
+    """Current song time in seconds (wall clock since start_time, scaled by song_rate)"""
+    if now is None:
+        now = time.time()
+    return (now - start_time) * song_rate
+
+def set_song_time(song_time, rate=None):
+    """Rebase the song clock so it reads song_time now, optionally changing its rate"""
+    global start_time, song_rate
+    if rate is not None:
+        song_rate = rate
+    start_time = time.time() - song_time / song_rate
+
 def beats_to_seconds(beat, bpm_changes_list, initial_bpm):
     """Convert beat position to seconds"""
     if not bpm_changes_list:
@@ -272,252 +352,44 @@ def calculate_max_score():
             max_possible_score += SCORE_PERFECT * multiplier
 
 def load_chart(id, difficulty):
-    global chart, bpm_changes, speed_changes, initial_bpm
+    global chart, chart_index, bpm_changes, speed_changes, initial_bpm
     chart_path = f"{CHART_DIRECTORY}/{id}_{difficulty}.txt"
     with open(chart_path, "r") as f:
         lines = f.readlines()
 
+    parsed = parse_chart(lines, id, LANE_COUNT)
+    initial_bpm = parsed['initial_bpm']
+    bpm_changes = parsed['bpm_changes']
+    speed_changes = parsed['speed_changes']
     chart = []
-    bpm_changes = []
-    speed_changes = []
-
-    is_percent_format = any('%' in line for line in lines)
-
-    if is_percent_format:
-        initial_bpm = float(id.split("_")[1])
-
-        # Calculate beat offset for 2-second delay
-        # At BPM X: 2 seconds = (2 * X) / 60 beats
-        beat_offset = (2.0 * initial_bpm) / 60.0
-
-        slide_starts = {}  # Track slide start positions by lane:  {lane:  (beat, multiplier)}
-        last_beat = 0  # Track last beat for BPM changes
-
-        for line in lines:
-            if '%' not in line:
-                continue
-
-            parts = line.split("%")
-
-            # Check for BPM change first (format: bpm%{new_bpm})
-            if parts[0].strip() == "bpm":
-                try:
-                    new_bpm = float(parts[1].strip())
-                    # BPM changes at the last processed beat (with offset)
-                    bpm_changes.append((last_beat + beat_offset, new_bpm))
-                    continue
-                except:
-                    pass
-
-            # Check for speed change (format: spd%{percentage})
-            if parts[0].strip() == "spd":
-                try:
-                    speed_percent = float(parts[1].strip())
-                    # Speed changes at the last processed beat (with offset)
-                    speed_changes.append((last_beat + beat_offset, speed_percent / 100.0))
-                    continue
-                except:
-                    pass
-
-            beat = float(parts[0]) + beat_offset  # Add offset for 2-second delay
-            last_beat = beat  # Update last beat
-            note_data = parts[1] if len(parts) > 1 else ""
-
-            # Check for BPM change at specific beat (format: {beat}%bpm{new_bpm})
-            if note_data.strip().startswith("bpm"):
-                # Format: {beat}%bpm{new_bpm}
-                try:
-                    new_bpm = float(note_data.strip().replace("bpm", "").strip())
-                    bpm_changes.append((beat, new_bpm))
-                    continue
-                except:
-                    pass
-
-            # Check for speed change at specific beat (format: {beat}%spd{percentage})
-            if note_data.strip().startswith("spd"):
-                # Format: {beat}%spd{percentage}
-                try:
-                    speed_percent = float(note_data.strip().replace("spd", "").strip())
-                    speed_changes.append((beat, speed_percent / 100.0))
-                    continue
-                except:
-                    pass
-
-            char_index = 0
-            for char in note_data:
-                lane = char_index % LANE_COUNT
-
-                if char == "X":
-                    # Regular tap note
-                    note_time = beats_to_seconds(beat, bpm_changes, initial_bpm)
-                    chart.append({
-                        'time': note_time,
-                        'beat': beat,
-                        'lane': lane,
-                        'type': 'tap',
-                        'multiplier': 1,
-                        'id': f"tap_{beat}_{lane}_{random.randint(1000, 9999)}"
-                    })
-
-                elif char == "x":
-                    # Double score tap note
-                    note_time = beats_to_seconds(beat, bpm_changes, initial_bpm)
-                    chart.append({
-                        'time': note_time,
-                        'beat': beat,
-                        'lane': lane,
-                        'type': 'tap',
-                        'multiplier': 2,
-                        'id': f"tap_{beat}_{lane}_{random.randint(1000, 9999)}"
-                    })
-
-                elif char == "s":
-                    # Slide start
-                    if lane in slide_starts:
-                        print(f"Warning: Overlapping slide starts in lane {lane} at beat {beat}")
-                    slide_starts[lane] = (beat, 1)  # Normal slide
-
-                elif char == "S":
-                    # Double score slide start (uppercase S)
-                    if lane in slide_starts:
-                        print(f"Warning: Overlapping slide starts in lane {lane} at beat {beat}")
-                    slide_starts[lane] = (beat, 2)  # Double score slide
-
-                elif char == "e":
-                    # Slide end
-                    if lane in slide_starts:
-                        start_beat, multiplier = slide_starts[lane]
-                        end_beat = beat
-                        start_time = beats_to_seconds(start_beat, bpm_changes, initial_bpm)
-                        end_time = beats_to_seconds(end_beat, bpm_changes, initial_bpm)
-
-                        chart.append({
-                            'time': start_time,
-                            'end_time': end_time,
-                            'beat': start_beat,
-                            'end_beat': end_beat,
-                            'lane': lane,
-                            'type': 'slide',
-                            'multiplier': multiplier,
-                            'id': f"slide_{start_beat}_{lane}_{random.randint(1000, 9999)}"
-                        })
-                        del slide_starts[lane]
-                    else:
-                        print(f"Warning: Slide end without start in lane {lane} at beat {beat}")
-
-                char_index += 1
-
-        # Warn about unclosed slides
-        for lane, (start_beat, _) in slide_starts.items():
-            print(f"Warning: Slide start without end in lane {lane} at beat {start_beat}")
-    else:
-        initial_bpm = None
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith("#") or line.startswith("---"):
-                continue
-            if line.lower().startswith("bpm="):
-                try:
-                    initial_bpm = float(line.split("=", 1)[1].strip())
-                    break
-                except Exception:
-                    pass
-
-        if initial_bpm is None:
-            try:
-                initial_bpm = float(id.split("_")[1])
-            except Exception:
-                initial_bpm = 60
-
-        beat_offset = (2.0 * initial_bpm) / 60.0
-
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith("#") or line.startswith("---"):
-                continue
-
-            lower = line.lower()
-            if lower.startswith("bpm="):
-                continue
-
-            if lower.startswith("bpm_change"):
-                parts = [p.strip() for p in line.split(",")]
-                if len(parts) >= 3:
-                    try:
-                        beat = float(parts[1]) + beat_offset
-                        new_bpm = float(parts[2])
-                        bpm_changes.append((beat, new_bpm))
-                    except Exception:
-                        pass
-                continue
-
-            if lower.startswith("spd"):
-                parts = [p.strip() for p in line.split(",")]
-                if len(parts) >= 3:
-                    try:
-                        beat = float(parts[1]) + beat_offset
-                        mult = float(parts[2])
-                        speed_changes.append((beat, mult))
-                    except Exception:
-                        pass
-                continue
-
-            if lower.startswith("tap"):
-                parts = [p.strip() for p in line.split(",")]
-                if len(parts) >= 3:
-                    try:
-                        lane = int(parts[1])
-                        beat = float(parts[2]) + beat_offset
-                        multiplier = 1
-                        if len(parts) >= 4 and parts[3].lower().startswith("x"):
-                            try:
-                                multiplier = int(parts[3][1:])
-                            except Exception:
-                                multiplier = 1
-
-                        note_time = beats_to_seconds(beat, bpm_changes, initial_bpm)
-                        chart.append({
-                            'time': note_time,
-                            'beat': beat,
-                            'lane': lane,
-                            'type': 'tap',
-                            'multiplier': multiplier,
-                            'id': f"tap_{beat}_{lane}_{random.randint(1000, 9999)}"
-                        })
-                    except Exception:
-                        pass
-                continue
+    chart_index = 0
 
-            if lower.startswith("slide"):
-                parts = [p.strip() for p in line.split(",")]
-                if len(parts) >= 4:
-                    try:
-                        lane = int(parts[1])
-                        start_beat = float(parts[2]) + beat_offset
-                        end_beat = float(parts[3]) + beat_offset
-                        multiplier = 1
-                        if len(parts) >= 5 and parts[4].lower().startswith("x"):
-                            try:
-                                multiplier = int(parts[4][1:])
-                            except Exception:
-                                multiplier = 1
-
-                        start_time = beats_to_seconds(start_beat, bpm_changes, initial_bpm)
-                        end_time = beats_to_seconds(end_beat, bpm_changes, initial_bpm)
-
-                        chart.append({
-                            'time': start_time,
-                            'end_time': end_time,
-                            'beat': start_beat,
-                            'end_beat': end_beat,
-                            'lane': lane,
-                            'type': 'slide',
-                            'multiplier': multiplier,
-                            'id': f"slide_{start_beat}_{lane}_{random.randint(1000, 9999)}"
-                        })
-                    except Exception:
-                        pass
-                continue
+    for note in parsed['notes']:
+        # Notes are timed with the BPM changes read before them
+        known_changes = bpm_changes[:note['bpm_index']]
+        beat = note['beat']
+        lane = note['lane']
+        if note['type'] == 'tap':
+            chart.append({
+                'time': beats_to_seconds(beat, known_changes, initial_bpm),
+                'beat': beat,
+                'lane': lane,
+                'type': 'tap',
+                'multiplier': note['multiplier'],
+                'id': f"tap_{beat}_{lane}_{random.randint(1000, 9999)}"
+            })
+        else:
+            end_beat = note['end_beat']
+            chart.append({
+                'time': beats_to_seconds(beat, known_changes, initial_bpm),
+                'end_time': beats_to_seconds(end_beat, known_changes, initial_bpm),
+                'beat': beat,
+                'end_beat': end_beat,
+                'lane': lane,
+                'type': 'slide',
+                'multiplier': note['multiplier'],
+                'id': f"slide_{beat}_{lane}_{random.randint(1000, 9999)}"
+            })
 
     chart.sort(key=lambda x: x['time'])
     bpm_changes.sort(key=lambda x: x[0])
@@ -841,7 +713,7 @@ def check_hit(lane, current_time):
     best_diff = float('inf')
     
     # Check tap notes
-    for note in active_notes[: ]:
+    for note in active_notes:
         if note['lane'] == lane and note['type'] == 'tap':
             time_diff = current_time - note['time']
             abs_diff = abs(time_diff)
@@ -870,7 +742,7 @@ def check_hit(lane, current_time):
         return hit
     
     # Check slide notes
-    for slide in active_slides[:]:
+    for slide in active_slides:
         if slide['lane'] == lane: 
             # Check if we're at the start of the slide
             if not slide. get('holding', False):
@@ -903,7 +775,7 @@ def update_slide_combo(current_time):
     """Update combo for slides being held - +1 per beat, awards 1/10 of perfect score OR register miss"""
     global combo, max_combo, score, miss_count
     
-    for slide in active_slides[:]: 
+    for slide in active_slides:
         # Only process slides that have been started
         if slide.get('hit_start', False):
             # Calculate current beat
@@ -938,7 +810,7 @@ def check_slide_hold(lane, current_time, is_holding):
     """Check if a slide is being held correctly"""
     global score, combo, max_combo, active_slides, miss_count
     
-    for slide in active_slides[: ]:
+    for slide in active_slides:
         if slide['lane'] == lane and slide. get('holding', False):
             if not is_holding:
                 # Released the key
@@ -962,8 +834,8 @@ def check_slide_hold(lane, current_time, is_holding):
                     spawn_particle(lane, 'MISS')  # Add particle effect
 
 def on_press(key):
-    """Handle key press - only register if key wasn't already down"""
-    global key_pressed_flags, key_is_down, game_running
+    """Handle pynput key press - queue it for the game loop"""
+    global game_running
     
     print(f"DEBUG on_press: key={key}, game_running={game_running}")
     
@@ -984,19 +856,11 @@ def on_press(key):
         lane = ARROW_MAPPINGS[key]
     
     if lane is not None:
-        # Only register as a new press if the key wasn't already down
-        if not key_is_down[lane]:
-            key_is_down[lane] = True
-            key_pressed_flags[lane] = True
-            # Record in replay (only if not currently replaying)
-            if not is_replay and game_running:
-                current_time = time.time() - start_time
-                replay_data.append((current_time, 'press', lane))
-            check_hit(lane, time.time() - start_time)
+        # Timestamp now, judge later on the game thread
+        listener_input.push((get_song_time(), 'press', lane))
 
 def on_release(key):
-    """Handle key release"""
-    global key_pressed_flags, key_is_down
+    """Handle pynput key release - queue it for the game loop"""
     
     print(f"DEBUG: Key released: {key}")
     
@@ -1012,19 +876,12 @@ def on_release(key):
         lane = ARROW_MAPPINGS[key]
     
     if lane is not None:
-        key_is_down[lane] = False
-        key_pressed_flags[lane] = False
-        # Record in replay (only if not currently replaying)
-        if not is_replay and game_running:
-            current_time = time.time() - start_time
-            replay_data.append((current_time, 'release', lane))
-        # Check if we released during a slide
-        check_slide_hold(lane, time.time() - start_time, False)
+        listener_input.push((get_song_time(), 'release', lane))
 
 def on_tkinter_press(event):
     """Handle tkinter key press events during gameplay"""
-    global key_pressed_flags, key_is_down, game_running
-    global practice_speed, practice_loop_start, practice_loop_end, practice_looping
+    global game_running
+    global practice_speed, practice_loop_start, practice_loop_end, practice_looping, practice_snapshot
     
     print(f"DEBUG tkinter_press: keysym={event.keysym}, char={event.char}, game_running={game_running}")
     
@@ -1032,17 +889,23 @@ def on_tkinter_press(event):
         game_running = False
         return
     
+    if event.keysym == 'F3':
+        # Toggle phase timing overlay (not saved to settings file)
+        settings['show_phase_breakdown'] = not settings.get('show_phase_breakdown', False)
+        return
+    
     # Practice mode controls
     if game_mode == 'practice':
         if event.char == '[':
-            # Set loop start
-            current_time = time.time() - start_time
+            # Set loop start (the game loop snapshots state once it reaches this time)
+            current_time = get_song_time()
             practice_loop_start = current_time
+            practice_snapshot = None
             print(f"Practice loop start set at {current_time:.2f}s")
             return
         elif event.char == ']':
             # Set loop end
-            current_time = time.time() - start_time
+            current_time = get_song_time()
             practice_loop_end = current_time
             print(f"Practice loop end set at {current_time:.2f}s")
             return
@@ -1054,11 +917,15 @@ def on_tkinter_press(event):
         elif event.char == '-':
             # Decrease speed
             practice_speed = max(0.25, practice_speed - 0.25)
+            set_song_time(get_song_time(), rate=practice_speed)
+            sync_music(get_song_time())
             print(f"Practice speed: {practice_speed:.2f}x")
             return
         elif event.char == '=':
             # Increase speed
             practice_speed = min(2.0, practice_speed + 0.25)
+            set_song_time(get_song_time(), rate=practice_speed)
+            sync_music(get_song_time())
             print(f"Practice speed: {practice_speed:.2f}x")
             return
     
@@ -1068,17 +935,10 @@ def on_tkinter_press(event):
         lane = KEY_MAPPINGS[event.char.lower()]
     
     if lane is not None:
-        key_is_down[lane] = True
-        if not is_replay and game_running and game_mode != 'auto':
-            if not key_pressed_flags[lane]:
-                key_pressed_flags[lane] = True
-                current_time = time.time() - start_time
-                replay_data.append((current_time, 'press', lane))
-                check_hit(lane, current_time)
+        tk_input.push((get_song_time(), 'press', lane))
 
 def on_tkinter_release(event):
     """Handle tkinter key release events during gameplay"""
-    global key_pressed_flags, key_is_down, game_running
     
     print(f"DEBUG tkinter_release: keysym={event.keysym}, char={event.char}")
     
@@ -1088,12 +948,37 @@ def on_tkinter_release(event):
         lane = KEY_MAPPINGS[event.char.lower()]
     
     if lane is not None:
-        key_pressed_flags[lane] = False
-        key_is_down[lane] = False
-        if not is_replay and game_running and game_mode != 'auto':
-            current_time = time.time() - start_time
-            replay_data.append((current_time, 'release', lane))
-            check_slide_hold(lane, current_time, False)
+        tk_input.push((get_song_time(), 'release', lane))
+
+def apply_input_events(current_time):
+    """Apply queued key events in timestamp order (game thread only)"""
+    events = tk_input.drain()
+    listener_events = listener_input.drain()
+    if game_mode == 'auto':
+        # Auto play replaces player input with the precomputed schedule
+        events = take_auto_inputs(current_time)
+    elif listener_events:
+        events.extend(listener_events)
+        events.sort(key=lambda event: event[0])
+    
+    judging = not is_replay and game_running
+    for event_time, kind, lane in events:
+        if kind == 'press':
+            # Ignore key repeat: only a press after a release counts
+            if key_pressed_flags[lane]:
+                continue
+            key_is_down[lane] = True
+            key_pressed_flags[lane] = True
+            if judging:
+                replay_data.append((event_time, 'press', lane))
+                check_hit(lane, event_time)
+        else:
+            key_is_down[lane] = False
+            key_pressed_flags[lane] = False
+            if judging:
+                replay_data.append((event_time, 'release', lane))
+                # Check if we released during a slide
+                check_slide_hold(lane, event_time, False)
 
 def get_rank(score, max_score):
     """Calculate rank based on percentage of max possible score"""
@@ -1222,6 +1107,39 @@ def draw_ui():
                          text="[ = Loop Start  |  ] = Loop End  |  L = Toggle Loop  |  - = Slower  |  + = Faster",
                          fill='#555555', font=('Arial', 14), tags='ui')
 
+def draw_profiler_overlay(frame_budget_ms):
+    """Draw per-phase timing breakdown (p50/p95/p99 in ms) at bottom left"""
+    global profiler_overlay_text
+    
+    # Sorting ring buffers every frame would show up in the profile itself, so refresh periodically
+    if profiler.frame_count % PROFILER_OVERLAY_INTERVAL == 0 or not profiler_overlay_text:
+        lines = [f"{'phase':<14}{'p50':>7}{'p95':>7}{'p99':>7}{'max':>7}  budget {frame_budget_ms:.1f}ms"]
+        for entry in profiler.get_breakdown():
+            p = entry['percentiles']
+            flag = " !" if p[99] > frame_budget_ms else ""
+            lines.append(f"{entry['name']:<14}{p[50]:>7.2f}{p[95]:>7.2f}{p[99]:>7.2f}{entry['max']:>7.2f}{flag}")
+        profiler_overlay_text = "\n".join(lines)
+    
+    canvas.create_text(20, height - 120, text=profiler_overlay_text,
+                      fill='#AAAAAA', font=('Courier', 12), tags='ui', anchor='sw')
+
+def write_profile_trace():
+    """Write the profiler's Chrome trace for the current run to traces/"""
+    from datetime import datetime
+    
+    trace_dir = os.path.join(os.path.dirname(__file__), "traces")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filepath = os.path.join(trace_dir, f"{current_chart_id}_{current_difficulty}_{timestamp}.json")
+    metadata = {
+        'chart_id': current_chart_id,
+        'difficulty': current_difficulty,
+        'game_mode': game_mode,
+        'fps_target': fps,
+        'frames': profiler.frame_count,
+    }
+    if profiler.write_chrome_trace(filepath, metadata):
+        print(f"Profile trace saved to {filepath}")
+
 def get_pixel_speed(current_beat):
     """Get the current pixel speed based on BPM, spd% changes, and global multiplier"""
     current_bpm = get_current_bpm(current_beat, bpm_changes, initial_bpm)
@@ -1231,55 +1149,61 @@ def get_pixel_speed(current_beat):
 
 def update_notes(current_time):
     """Update note positions and spawn new notes"""
-    global active_notes, active_slides, chart, combo
+    global active_notes, active_slides, chart_index, combo
     
     # Calculate current beat for pixel speed
     current_beat = seconds_to_beats(current_time, bpm_changes, initial_bpm)
     pixel_ps = get_pixel_speed(current_beat)
-    while chart and chart[0]['time'] <= current_time + 2:
-        note = chart.pop(0)
+    while chart_index < len(chart) and chart[chart_index]['time'] <= current_time + 2:
+        # Spawn a copy so judging never mutates the chart (practice loops re-spawn from it)
+        note = dict(chart[chart_index])
+        chart_index += 1
         if note['type'] == 'tap':
             active_notes.append(note)
         elif note['type'] == 'slide':
             active_slides. append(note)
     
-    # Update and draw tap notes
-    for note in active_notes[:]:
+    # Update and draw tap notes (removed notes are filtered out rather than list.remove'd)
+    global miss_count
+    remaining_notes = []
+    for note in active_notes:
         # Remove hit notes
         if note.get('hit', False):
             canvas.delete(f"note_{note['id']}")
-            active_notes.remove(note)
             continue
             
         y_pos = BAR_Y - ((note['time'] - current_time) * pixel_ps)
         
         if y_pos > height + 100:
             canvas.delete(f"note_{note['id']}")
-            active_notes.remove(note)
             combo = 0
-            global miss_count
             miss_count += 1
             show_judgment('MISS', auto_miss=True)
-        elif 0 <= y_pos <= height:
+            continue
+        
+        remaining_notes.append(note)
+        if 0 <= y_pos <= height:
             canvas.delete(f"note_{note['id']}")
             # Check for simultaneous notes
             simultaneous_lanes = []
             for other_note in active_notes:
-                if other_note != note and other_note.get('type') == 'tap':
+                if other_note is not note and other_note.get('type') == 'tap' and not other_note.get('hit', False):
                     if abs(other_note['time'] - note['time']) < 0.01:  # Within 10ms
                         simultaneous_lanes.append(other_note['lane'])
             draw_note(note['lane'], int(y_pos), note['id'], note. get('multiplier', 1), simultaneous_lanes if simultaneous_lanes else None)
+    active_notes = remaining_notes
     
     # Update and draw slide notes
-    for slide in active_slides[:]:
+    remaining_slides = []
+    for slide in active_slides:
         # Remove marked slides
         if slide.get('remove', False):
             canvas.delete(f"note_{slide['id']}")
             # Clean up image reference
             if hasattr(canvas, '_slide_images') and slide['id'] in canvas._slide_images:
                 del canvas._slide_images[slide['id']]
-            active_slides.remove(slide)
             continue
+        remaining_slides.append(slide)
         
         # Calculate pixel speed based on slide's beat position
         slide_pixel_ps = get_pixel_speed(slide['beat'])
@@ -1306,7 +1230,7 @@ def update_notes(current_time):
             canvas.delete(f"note_{slide['id']}")
             if hasattr(canvas, '_slide_images') and slide['id'] in canvas._slide_images:
                 del canvas._slide_images[slide['id']]
-            active_slides.remove(slide)
+            remaining_slides.pop()
             combo = 0
             miss_count += 1
             show_judgment('MISS', auto_miss=True)
@@ -1320,6 +1244,7 @@ def update_notes(current_time):
                 del canvas._slide_images[slide['id']]
             draw_slide(slide['lane'], int(y_start), int(y_end), slide['id'],
                       slide.get('holding', False), slide.get('multiplier', 1))
+    active_slides = remaining_slides
 
 def save_replay(chart_id, difficulty, score, accuracy, inputs, rank):
     """Save replay data to file in JSON format"""
@@ -1543,72 +1468,104 @@ def get_available_replays():
     replays.sort(key=lambda x: x['data'].get('timestamp', ''), reverse=True)
     return replays
 
-def auto_play_ai(current_time):
-    """AI that plays notes perfectly in auto mode - directly scores without simulating keypresses"""
-    global score, combo, max_combo, perfect_count
+def sync_music(song_time):
+    """Seek music to song_time at 1x, or pause it while the song clock runs at another rate"""
+    if not (AUDIO_AVAILABLE and music_playing):
+        return
+    try:
+        if song_rate == 1.0:
+            # Music starts with the 2 second lead-in, so it is 2s ahead of song time
+            pygame.mixer.music.play(start=max(0.0, song_time + 2.0))
+        else:
+            pygame.mixer.music.pause()
+    except Exception as e:
+        print(f"Could not sync music: {e}")
+
+def take_practice_snapshot(song_time):
+    """Capture the state needed to replay a practice section from song_time"""
+    return {
+        'time': song_time,
+        'chart_index': chart_index,
+        # Active notes are mutated by judging, so keep private copies
+        'active_notes': [dict(note) for note in active_notes],
+        'active_slides': [dict(slide) for slide in active_slides],
+        'scoring': (score, combo, max_combo, perfect_count, great_count,
+                    good_count, bad_count, miss_count),
+        'replay_length': len(replay_data),
+    }
+
+def restore_practice_snapshot(snapshot):
+    """Rewind to a practice snapshot (cost is proportional to the section, not the chart)"""
+    global chart_index, active_notes, active_slides, active_particles, judgment_display
+    global score, combo, max_combo, perfect_count, great_count, good_count, bad_count, miss_count
     
-    # Auto-hit tap notes - wider window to catch high-BPM notes
-    for note in active_notes[:]:
-        if note['type'] == 'tap' and not note.get('hit', False):
-            time_diff = current_time - note['time']
-            # Expanded window: catch notes slightly before and well after their time
-            # This ensures we don't miss any notes at high BPM (e.g., 250 BPM)
-            if -0.05 <= time_diff <= (2.0 / fps):
-                # Award perfect score directly
-                multiplier = note.get('multiplier', 1)
-                score += SCORE_PERFECT * multiplier
-                combo += 1
-                max_combo = max(max_combo, combo)
-                perfect_count += 1
-                note['hit'] = True
-                show_judgment('PERFECT', 0.0)
-                spawn_particle(note['lane'], 'PERFECT')
-    
-    # Auto-hit and hold slides
-    for slide in active_slides[:]:
-        # Start slide at perfect timing
-        if not slide.get('hit_start', False):
-            time_diff = current_time - slide['time']
-            # Expanded window for slides too
-            if -0.05 <= time_diff <= (2.0 / fps):
-                # Start the slide with perfect timing
-                multiplier = slide.get('multiplier', 1)
-                score += SCORE_PERFECT * multiplier
-                combo += 1
-                max_combo = max(max_combo, combo)
-                perfect_count += 1
-                slide['hit_start'] = True
-                slide['holding'] = True
-                slide['next_tick'] = slide['beat'] + 1.0
-                show_judgment('PERFECT', 0.0)
-                spawn_particle(slide['lane'], 'PERFECT')
-        
-        # Auto-complete slide at end
-        if slide.get('holding', False) and not slide.get('auto_completed', False):
-            time_diff = current_time - slide['end_time']
-            # Use same expanded window for slide completion
-            if -0.05 <= time_diff <= (2.0 / fps):
-                # Complete the slide with perfect timing
-                multiplier = slide.get('multiplier', 1)
-                score += SCORE_PERFECT * multiplier
-                combo += 1
-                max_combo = max(max_combo, combo)
-                perfect_count += 1
-                slide['auto_completed'] = True
-                slide['remove'] = True
-                show_judgment('PERFECT', 0.0)
-                spawn_particle(slide['lane'], 'PERFECT')
+    # Remove drawings of notes that belong to the discarded pass
+    for note in active_notes + active_slides:
+        canvas.delete(f"note_{note['id']}")
+        if hasattr(canvas, '_slide_images') and note['id'] in canvas._slide_images:
+            del canvas._slide_images[note['id']]
+    
+    chart_index = snapshot['chart_index']
+    active_notes = [dict(note) for note in snapshot['active_notes']]
+    active_slides = [dict(slide) for slide in snapshot['active_slides']]
+    (score, combo, max_combo, perfect_count, great_count,
+     good_count, bad_count, miss_count) = snapshot['scoring']
+    active_particles = []
+    judgment_display = None
+    # Drop inputs from the discarded pass so the saved replay stays monotonic
+    del replay_data[snapshot['replay_length']:]
+    
+    set_song_time(snapshot['time'])
+    sync_music(snapshot['time'])
+
+def build_auto_schedule():
+    """Perfect input schedule for the loaded chart, in replay_data format: (time, kind, lane)
+    
+    Taps are pressed on their time and released AUTO_TAP_HOLD later (or halfway to the next
+    note in the lane); slides are held from start to end. Auto mode feeds this through
+    apply_input_events, so it is judged exactly like player input.
+    """
+    notes_by_lane = {}
+    for note in chart:
+        end_time = note['end_time'] if note['type'] == 'slide' else None
+        notes_by_lane.setdefault(note['lane'], []).append((note['time'], end_time))
+    
+    events = []
+    for lane, lane_notes in notes_by_lane.items():
+        lane_notes.sort(key=lambda n: n[0])
+        for i, (press_time, end_time) in enumerate(lane_notes):
+            if end_time is None:
+                next_press = lane_notes[i + 1][0] if i + 1 < len(lane_notes) else float('inf')
+                release_time = min(press_time + AUTO_TAP_HOLD, (press_time + next_press) / 2)
+            else:
+                release_time = end_time
+            events.append((press_time, 'press', lane))
+            events.append((release_time, 'release', lane))
+    
+    # At equal timestamps, release before press so back-to-back notes in a lane both register
+    events.sort(key=lambda event: (event[0], event[1] == 'press'))
+    return events
+
+def take_auto_inputs(current_time):
+    """Return scheduled auto inputs due by current_time (O(events) over the whole run)"""
+    global auto_schedule_index
+    end = bisect.bisect_right(auto_schedule_times, current_time, lo=auto_schedule_index)
+    events = auto_schedule[auto_schedule_index:end]
+    auto_schedule_index = end
+    return events
 
 def game_loop():
     """Main game loop"""
-    global start_time, game_running, chart, music_playing, active_particles
+    global game_running, chart, music_playing, active_particles
     global score, combo, max_combo, perfect_count, great_count, good_count, bad_count, miss_count
-    global active_notes, active_slides, key_pressed_flags, key_is_down
+    global active_notes, active_slides, key_pressed_flags, key_is_down, profiler_overlay_text
+    global practice_snapshot, auto_schedule, auto_schedule_times, auto_schedule_index
     
     # Reset all game state
     active_particles = []
     active_notes = []
     active_slides = []
+    practice_snapshot = None
     score = 0
     combo = 0
     max_combo = 0
@@ -1618,10 +1575,23 @@ def game_loop():
     bad_count = 0
     miss_count = 0
     
-    # Reset key states
+    # Reset key states and drop input queued before the run
     for i in range(LANE_COUNT):
         key_pressed_flags[i] = False
         key_is_down[i] = False
+    tk_input.clear()
+    listener_input.clear()
+    
+    # Auto play injects a perfect schedule through the normal input path
+    auto_schedule = build_auto_schedule() if game_mode == 'auto' else []
+    auto_schedule_times = [event[0] for event in auto_schedule]
+    auto_schedule_index = 0
+    
+    # Reset profiler (trace buffering is only decided at the start of a run)
+    profiler.reset()
+    profiler.trace_enabled = settings.get('write_profile_trace', False)
+    profiler_overlay_text = ""
+    frame_budget_ms = 1000.0 / fps
     
     # Start music if available
     if AUDIO_AVAILABLE and current_chart_id and current_difficulty:
@@ -1636,9 +1606,10 @@ def game_loop():
                 print(f"Could not play music: {e}")
     
     frame_dur = 1 / fps
-    # Set start_time 2 seconds in the future so current_time starts at -2.0
-    # This gives a 2 second delay before notes start spawning
-    start_time = time.time() + 2.0
+    # Start the song clock at -2.0 so there is a 2 second delay before notes start spawning
+    # Practice speed is applied as the clock rate, so everything downstream runs in song time
+    set_song_time(-2.0, rate=practice_speed if game_mode == 'practice' else 1.0)
+    wall_start = time.time() + 2.0  # For playtime, which is wall-clock regardless of speed
     game_running = True
     
     # Draw static elements
@@ -1647,45 +1618,65 @@ def game_loop():
     draw_key_labels()  # Initial key labels
     
     # Continue while there are notes/slides to process OR slides being held
-    while game_running and (chart or active_notes or active_slides):
+    while game_running and (chart_index < len(chart) or active_notes or active_slides):
+        # Profiling only costs anything while the overlay is shown or a trace is being written
+        profiler.enabled = profiler.trace_enabled or settings.get('show_phase_breakdown', False)
+        profiler.begin_frame()
         frame_start = time.time()
-        current_time = frame_start - start_time
+        current_time = get_song_time(frame_start)
         
         # Practice mode loop check
-        if game_mode == 'practice' and practice_looping:
-            if practice_loop_start is not None and practice_loop_end is not None:
-                if current_time >= practice_loop_end:
-                    # Loop back to start
-                    # This is simplified - ideally we'd reset all game state
-                    start_time += (practice_loop_end - practice_loop_start)
-                    current_time = practice_loop_start
-        
-        # Auto-play AI
-        if game_mode == 'auto':
-            auto_play_ai(current_time)
-        
-        # Check slide holds for currently pressed keys (normal gameplay)
-        if game_mode != 'auto':
+        if game_mode == 'practice':
+            # Snapshot the first frame at/after the loop start
+            if practice_loop_start is not None and practice_snapshot is None and current_time >= practice_loop_start:
+                practice_snapshot = take_practice_snapshot(current_time)
+            if practice_looping and practice_snapshot is not None and practice_loop_end is not None:
+                if practice_loop_end > practice_snapshot['time'] and current_time >= practice_loop_end:
+                    # Loop back to start with the section's notes and scoring restored
+                    restore_practice_snapshot(practice_snapshot)
+                    current_time = practice_snapshot['time']
+                    # Inputs timestamped in the discarded pass must not be judged in the new one
+                    tk_input.clear()
+                    listener_input.clear()
+        
+        # Apply key events queued since the last frame (judged at their own timestamps)
+        with profiler.span('input'):
+            apply_input_events(current_time)
+        
+        # Check slide holds for currently pressed keys
+        with profiler.span('slide_holds'):
             for lane in range(LANE_COUNT):
                 if key_is_down.get(lane, False):
                     check_slide_hold(lane, current_time, True)
         
         # Update slide combo (awards score per beat for held slides)
-        update_slide_combo(current_time)
+        with profiler.span('slide_combo'):
+            update_slide_combo(current_time)
         
         # Clear dynamic elements
-        canvas.delete('note')
+        with profiler.span('clear_notes'):
+            canvas.delete('note')
         
         # Update game state
-        update_notes(current_time)
-        draw_ui()
+        with profiler.span('update_notes'):
+            update_notes(current_time)
+        with profiler.span('draw_ui'):
+            draw_ui()
+            if settings.get('show_phase_breakdown', False):
+                draw_profiler_overlay(frame_budget_ms)
         
         # Maintain frame rate
         elapsed = time.time() - frame_start
         sleep_time = max(0, frame_dur - elapsed)
-        time.sleep(sleep_time)
+        with profiler.span('sleep'):
+            time.sleep(sleep_time)
         
-        root.update()
+        with profiler.span('root_update'):
+            root.update()
+        profiler.end_frame()
+    
+    if profiler.trace_enabled and current_chart_id and current_difficulty:
+        write_profile_trace()
     
     # Delay after last note
     time.sleep(0.5)
@@ -1732,7 +1723,7 @@ def game_loop():
     
     # Update progress (only if not replay and not auto mode)
     if not is_replay and game_mode != 'auto' and current_chart_id and current_difficulty:
-        playtime = time.time() - start_time
+        playtime = time.time() - wall_start
         updated_progress = update_progress(current_chart_id, current_difficulty, 
                                           score, rank, calculate_accuracy(), playtime)
         
@@ -1973,7 +1964,7 @@ def play_replay():
     
     root.bind('<KeyPress>', on_replay_key)
     
-    while game_running and (chart or active_notes or active_slides):
+    while game_running and (chart_index < len(chart) or active_notes or active_slides):
         if not paused:
             frame_start = time.time()
             current_time = frame_start - start_time
@@ -2259,12 +2250,44 @@ def show_chart_menu():
     charts_per_page = 10
     refresh_text_alpha = 0  # For fading effect
     refresh_text_time = 0
+    sort_mode = 0  # Index into CHART_SORT_MODES
+    drawn_metrics_generation = -1  # Redraw when background analysis produces new results
+    showing_difficulties = False
+    
+    def chart_sort_value(chart_id, difficulties):
+        """Sort key for a chart: its hardest difficulty's value for the current sort mode"""
+        values = []
+        for diff in difficulties:
+            metrics = chart_metrics.get(chart_id, diff)
+            if metrics is None:
+                continue
+            if CHART_SORT_MODES[sort_mode] == 'peak nps':
+                values.append(max(metrics['peak_nps'].values()))
+            elif CHART_SORT_MODES[sort_mode] == 'duration':
+                values.append(metrics['duration'])
+            else:
+                values.append(metrics['notes'])
+        return max(values) if values else -1  # Unanalyzed charts sort last
+    
+    def get_sorted_chart_list(charts):
+        chart_list = sorted(charts.keys())
+        if CHART_SORT_MODES[sort_mode] != 'name':
+            chart_list.sort(key=lambda chart_id: chart_sort_value(chart_id, charts[chart_id]), reverse=True)
+        return chart_list
+    
+    def hardest_metrics(chart_id, difficulties):
+        """Metrics of the densest analyzed difficulty (None until analyzed)"""
+        analyzed = [m for m in (chart_metrics.get(chart_id, d) for d in difficulties) if m is not None]
+        if not analyzed:
+            return None
+        return max(analyzed, key=lambda m: max(m['peak_nps'].values()))
     
     def refresh_menu():
         nonlocal current_page, refresh_text_alpha, refresh_text_time
         current_page = 0
         refresh_text_alpha = 1.0
         refresh_text_time = time.time()
+        chart_metrics.start_background_scan(CHART_DIRECTORY)
         draw_menu()
     
     def draw_menu():
@@ -2276,8 +2299,15 @@ def show_chart_menu():
                          fill='white', font=('Arial', 48, 'bold'))
         
         # Instructions
-        canvas.create_text(width // 2, 120, text="Use number keys or click to select | R to refresh | ←→ to change page | ESC to quit",
+        canvas.create_text(width // 2, 120, text="Use number keys or click to select | R to refresh | S to sort | ←→ to change page | ESC to quit",
                          fill='gray', font=('Arial', 16))
+        nonlocal drawn_metrics_generation
+        drawn_metrics_generation = chart_metrics.generation
+        sort_text = f"Sort: {CHART_SORT_MODES[sort_mode]}"
+        if chart_metrics.scanning:
+            sort_text += "  (analyzing charts...)"
+        canvas.create_text(width - 50, 150, text=sort_text,
+                         fill='gray', font=('Arial', 16), anchor='e')
         
         # Fading refresh text
         nonlocal refresh_text_alpha, refresh_text_time
@@ -2300,7 +2330,7 @@ def show_chart_menu():
             return
         
         # Calculate pagination
-        chart_list = sorted(charts.keys())
+        chart_list = get_sorted_chart_list(charts)
         total_pages = (len(chart_list) + charts_per_page - 1) // charts_per_page
         nonlocal current_page
         current_page = max(0, min(current_page, total_pages - 1))
@@ -2329,7 +2359,7 @@ def show_chart_menu():
                     audio_icon = " ♫"
                     break
             
-            text = f"{index + 1}. {chart_id} [{diff_text}]{audio_icon}"
+            text = f"{index + 1}. {chart_id} [{diff_text}]{audio_icon}  -  {format_metrics_summary(hardest_metrics(chart_id, difficulties))}"
             canvas.create_text(width // 2, y_pos, text=text,
                              fill='cyan', font=('Arial', 20), tags=f'chart_{index}')
             y_pos += 40
@@ -2339,7 +2369,7 @@ def show_chart_menu():
     
     def on_tkinter_key(event):
         """Handle tkinter key events for menu"""
-        nonlocal menu_running, selected_chart, selected_difficulty, current_page
+        nonlocal menu_running, selected_chart, selected_difficulty, current_page, sort_mode
         
         print(f"DEBUG tkinter_key: {event.keysym}, {event.char}")
         
@@ -2351,6 +2381,12 @@ def show_chart_menu():
             refresh_menu()
             return
         
+        if event.char and event.char.lower() == 's':
+            sort_mode = (sort_mode + 1) % len(CHART_SORT_MODES)
+            current_page = 0
+            draw_menu()
+            return
+        
         # Left/Right arrows for pagination
         if event.keysym == 'Left':
             charts = get_available_charts()
@@ -2373,7 +2409,7 @@ def show_chart_menu():
             num = int(event.char)
             if num > 0:
                 charts = get_available_charts()
-                chart_list = sorted(charts.keys())
+                chart_list = get_sorted_chart_list(charts)
                 start_idx = current_page * charts_per_page
                 page_charts = chart_list[start_idx:start_idx + charts_per_page]
                 if num <= len(page_charts):
@@ -2393,7 +2429,7 @@ def show_chart_menu():
                 if tag.startswith('chart_'):
                     chart_index = int(tag.split('_')[1])
                     charts = get_available_charts()
-                    chart_list = sorted(charts.keys())
+                    chart_list = get_sorted_chart_list(charts)
                     start_idx = current_page * charts_per_page
                     page_charts = chart_list[start_idx:start_idx + charts_per_page]
                     if chart_index < len(page_charts):
@@ -2402,9 +2438,10 @@ def show_chart_menu():
                     return
 
     def select_difficulty(chart_id, difficulties):
-        nonlocal menu_running, selected_chart, selected_difficulty
+        nonlocal menu_running, selected_chart, selected_difficulty, showing_difficulties
         global current_chart_id, current_difficulty, game_mode
         
+        showing_difficulties = True
         canvas.delete('all')
         canvas.configure(bg='black')
         
@@ -2433,6 +2470,13 @@ def show_chart_menu():
             
             canvas.create_text(width // 2, y_pos, text=f"{i + 1}. {diff}{audio_icon}",
                              fill='yellow', font=('Arial', 24), tags=f'diff_{i}')
+            metrics = chart_metrics.get(chart_id, diff)
+            if metrics is not None:
+                canvas.create_text(width // 2, y_pos + 22,
+                                 text=f"{format_metrics_summary(metrics)} | chords {metrics['chord_ratio'] * 100:.0f}% | "
+                                      f"jacks {sum(metrics['jacks_per_lane'])} | slides {metrics['slide_coverage'] * 100:.0f}%",
+                                 fill='gray', font=('Arial', 14))
+                y_pos += 20
             y_pos += 50
         
         canvas.create_text(width // 2, height - 50, text="Press number/letter or click to select | ESC to go back",
@@ -2440,12 +2484,13 @@ def show_chart_menu():
         root.update()
         
         def on_diff_tkinter_key(event):
-            nonlocal selected_difficulty, menu_running
+            nonlocal selected_difficulty, menu_running, showing_difficulties
             global current_chart_id, current_difficulty, game_mode
             
             print(f"DEBUG diff_tkinter_key: {event.keysym}, {event.char}")
             
             if event.keysym == 'Escape':
+                showing_difficulties = False
                 root.unbind('<KeyPress>')
                 root.unbind('<Button-1>')
                 draw_menu()
@@ -2540,6 +2585,7 @@ def show_chart_menu():
         root.bind('<KeyPress>', on_diff_tkinter_key)
         root.bind('<Button-1>', on_diff_mouse_click)
     
+    chart_metrics.start_background_scan(CHART_DIRECTORY)
     draw_menu()
     
     # Bind tkinter keys for menu
@@ -2548,8 +2594,8 @@ def show_chart_menu():
     root.bind('<Button-1>', on_mouse_click)
     
     while menu_running:
-        # Redraw if refresh text is fading
-        if refresh_text_alpha > 0:
+        # Redraw if refresh text is fading or new chart metrics arrived
+        if not showing_difficulties and (refresh_text_alpha > 0 or drawn_metrics_generation != chart_metrics.generation):
             draw_menu()
         root.update()
         time.sleep(0.01)
@@ -2596,7 +2642,7 @@ def show_options_menu():
         1: ['Note Size', 'Hit Bar Position', 'Background Dim', 'Show FPS', 'Show Timing Zones', 'Colorblind Mode', 'High Contrast Mode', 'Show Late/Early', 'Back'],
         2: ['Music Volume', 'SFX Volume', 'Global Offset', 'Back'],
         3: ['Timing Windows', 'Back'],
-        4: ['FPS Target', 'Renderer', 'Show Performance Metrics', 'Back']
+        4: ['FPS Target', 'Renderer', 'Show Performance Metrics', 'Show Phase Breakdown', 'Write Profile Trace', 'Back']
     }
     options = options_pages[current_page]  # Current options list
     
@@ -2665,6 +2711,10 @@ def show_options_menu():
                     text = f"{option}: {settings.get('renderer', 'auto').upper()}"
                 elif option == 'Show Performance Metrics':
                     text = f"{option}: {'ON' if settings.get('show_performance_metrics', False) else 'OFF'}"
+                elif option == 'Show Phase Breakdown':
+                    text = f"{option}: {'ON' if settings.get('show_phase_breakdown', False) else 'OFF'}"
+                elif option == 'Write Profile Trace':
+                    text = f"{option}: {'ON' if settings.get('write_profile_trace', False) else 'OFF'}"
                 else:
                     text = option
                 
@@ -2711,7 +2761,7 @@ def show_options_menu():
             if option_name == 'Change Keys':
                 # Start key remapping for each lane
                 show_key_remap_screen()
-            elif option_name in ['Show FPS', 'Show Timing Zones', 'Colorblind Mode', 'High Contrast Mode', 'Show Late/Early', 'Show Performance Metrics']:
+            elif option_name in ['Show FPS', 'Show Timing Zones', 'Colorblind Mode', 'High Contrast Mode', 'Show Late/Early', 'Show Performance Metrics', 'Show Phase Breakdown', 'Write Profile Trace']:
                 # Toggle boolean settings
                 setting_key = {
                     'Show FPS': 'show_fps',
@@ -2719,7 +2769,9 @@ def show_options_menu():
                     'Colorblind Mode': 'colorblind_mode',
                     'High Contrast Mode': 'high_contrast_mode',
                     'Show Late/Early': 'show_late_early',
-                    'Show Performance Metrics': 'show_performance_metrics'
+                    'Show Performance Metrics': 'show_performance_metrics',
+                    'Show Phase Breakdown': 'show_phase_breakdown',
+                    'Write Profile Trace': 'write_profile_trace'
                 }[option_name]
                 settings[setting_key] = not settings.get(setting_key, False)
                 draw_options()
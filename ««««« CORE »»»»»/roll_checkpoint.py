@@ -0,0 +1,177 @@
+"""Checkpoints for long rollbot.py simulations.
+
+A checkpoint directory holds one manifest describing the run (seed, roll
+count, chunk size, the combo carried in from the save file) and one file per
+chunk with that chunk's RollState. A worker rewrites its chunk file every few
+seconds and once more when the chunk is done. Each file is replaced
+atomically (write temp file, fsync, os.replace), so a crash leaves the
+previous checkpoint intact.
+
+The RNG needs no separate state: each chunk reads a fixed slice of one PCG64
+stream (see roll_sim.stream_rng), so a RollState's roll position is its RNG
+position. Sums are accumulated in roll order whatever the batch size, which
+means a resumed run finishes bit-identical to an uninterrupted one.
+
+File layout (little-endian, all versioned):
+    manifest.ckpt: b"RCKM", version u16, simulate_count u64, chunk_rolls u64,
+                   base_count u64, last_tier i64, combo_quantity i64,
+                   seed u128, RollRules.fingerprint() (20 bytes)
+    chunk_N.ckpt:  b"RCKC", version u16, done u8, log_bytes u64, RollState,
+                   stats_bytes u32, RollStats (roll_stats.py; absent when stats_bytes is 0)
+"""
+
+import glob
+import os
+import struct
+from typing import Optional, Dict, Any, Tuple
+
+import numpy as np
+
+from roll_sim import RollState
+from roll_stats import RollStats
+
+VERSION = 2  # 2: chunk files carry the streaming statistics
+MANIFEST_MAGIC = b"RCKM"
+CHUNK_MAGIC = b"RCKC"
+MANIFEST = struct.Struct("<4sHQQQqq16s20s")
+CHUNK_HEADER = struct.Struct("<4sHBQ")
+STATS_LENGTH = struct.Struct("<I")
+# Scalar RollState fields after the three per-tier arrays
+STATE_SCALARS = struct.Struct("<HddqqqqqqH")
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rollbotsim_checkpoint")
+DEFAULT_INTERVAL = 30.0  # Seconds between chunk checkpoints
+
+
+def atomic_write(path: str, data: bytes):
+    """Replace path with data so readers see either the old or the new file, never a partial one."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def pack_state(state: RollState) -> bytes:
+    """Serialize a RollState."""
+    name = state.name.encode("utf-8")
+    return b"".join((
+        STATE_SCALARS.pack(len(state.tier_data), state.stars, state.rarest, state.index,
+                           state.highest_combo_quantity, state.highest_combo_tier,
+                           state.last_tier, state.combo_quantity, state.rolls, len(name)),
+        state.tier_data.astype("<i8").tobytes(),
+        state.tier_stars.astype("<f8").tobytes(),
+        state.tier_roll_count.astype("<i8").tobytes(),
+        name,
+    ))
+
+
+def unpack_state(data: bytes, pos: int = 0) -> RollState:
+    """Deserialize a RollState written by pack_state."""
+    (tier_count, stars, rarest, index, highest_quantity, highest_tier,
+     last_tier, combo_quantity, rolls, name_len) = STATE_SCALARS.unpack_from(data, pos)
+    pos += STATE_SCALARS.size
+    state = RollState(tier_count, last_tier, combo_quantity)
+    for field, dtype in (('tier_data', "<i8"), ('tier_stars', "<f8"), ('tier_roll_count', "<i8")):
+        getattr(state, field)[:] = np.frombuffer(data, dtype=dtype, count=tier_count, offset=pos)
+        pos += 8 * tier_count
+    state.stars = stars
+    state.rarest = rarest
+    state.index = index
+    state.highest_combo_quantity = highest_quantity
+    state.highest_combo_tier = highest_tier
+    state.rolls = rolls
+    state.name = data[pos:pos + name_len].decode("utf-8")
+    return state
+
+
+class SimulationCheckpoint:
+    """Reads and writes the checkpoint files of one simulation run."""
+
+    def __init__(self, directory: str = DEFAULT_CHECKPOINT_DIR):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, "manifest.ckpt")
+
+    def chunk_path(self, chunk_id: int) -> str:
+        return os.path.join(self.directory, f"chunk_{chunk_id:06d}.ckpt")
+
+    def start(self, seed: int, simulate_count: int, chunk_rolls: int, base_count: int,
+              last_tier: int, combo_quantity: int, fingerprint: bytes):
+        """Discard any previous checkpoint and record the parameters of a new run."""
+        self.clear()
+        os.makedirs(self.directory, exist_ok=True)
+        atomic_write(self.manifest_path, MANIFEST.pack(
+            MANIFEST_MAGIC, VERSION, simulate_count, chunk_rolls, base_count,
+            last_tier, combo_quantity, seed.to_bytes(16, "little"), fingerprint))
+
+    def load_manifest(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the run parameters.
+
+        Returns:
+            Dict of manifest fields, or None if there is no usable checkpoint
+        """
+        try:
+            with open(self.manifest_path, "rb") as f:
+                data = f.read()
+            (magic, version, simulate_count, chunk_rolls, base_count,
+             last_tier, combo_quantity, seed, fingerprint) = MANIFEST.unpack(data)
+        except (OSError, struct.error):
+            return None
+        if magic != MANIFEST_MAGIC or version != VERSION:
+            print(f"Ignoring checkpoint with unsupported format (version {version})")
+            return None
+        return {
+            'seed': int.from_bytes(seed, "little"),
+            'simulate_count': simulate_count,
+            'chunk_rolls': chunk_rolls,
+            'base_count': base_count,
+            'last_tier': last_tier,
+            'combo_quantity': combo_quantity,
+            'fingerprint': fingerprint,
+        }
+
+    def save_chunk(self, chunk_id: int, state: RollState, done: bool, log_bytes: int = 0,
+                   stats: Optional[RollStats] = None):
+        """
+        Atomically record a chunk's progress.
+
+        Args:
+            chunk_id: Chunk index
+            state: Chunk state (its rolls field is the stream position)
+            done: Whether the chunk has finished
+            log_bytes: Size of the chunk's log shard at this point (for truncation on resume)
+            stats: The chunk's statistics collector, if it keeps one
+        """
+        stats_data = stats.to_bytes() if stats is not None else b""
+        atomic_write(self.chunk_path(chunk_id),
+                     CHUNK_HEADER.pack(CHUNK_MAGIC, VERSION, int(done), log_bytes) + pack_state(state)
+                     + STATS_LENGTH.pack(len(stats_data)) + stats_data)
+
+    def load_chunk(self, chunk_id: int) -> Optional[Tuple[RollState, bool, int, Optional[RollStats]]]:
+        """
+        Read a chunk's last checkpoint.
+
+        Returns:
+            (state, done, log_bytes, stats), or None if the chunk has no checkpoint
+        """
+        try:
+            with open(self.chunk_path(chunk_id), "rb") as f:
+                data = f.read()
+            magic, version, done, log_bytes = CHUNK_HEADER.unpack_from(data)
+            if magic != CHUNK_MAGIC or version != VERSION:
+                return None
+            state = unpack_state(data, CHUNK_HEADER.size)
+            pos = (CHUNK_HEADER.size + STATE_SCALARS.size + 24 * len(state.tier_data)
+                   + len(state.name.encode("utf-8")))
+            (stats_len,) = STATS_LENGTH.unpack_from(data, pos)
+            stats = RollStats.from_bytes(data, pos + STATS_LENGTH.size) if stats_len else None
+            return state, bool(done), log_bytes, stats
+        except (OSError, struct.error, ValueError):
+            return None
+
+    def clear(self):
+        """Delete the checkpoint (after the run's results are saved)."""
+        for path in glob.glob(os.path.join(self.directory, "*.ckpt*")):
+            os.remove(path)
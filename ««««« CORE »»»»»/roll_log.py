@@ -0,0 +1,219 @@
+"""Streaming binary roll logs for rollbot.py simulations.
+
+Each simulation chunk writes its own shard as it goes instead of collecting
+formatted strings in memory. A shard is a small header followed by compressed
+blocks; each block stores one batch of rolls as columns (tier, quantity, combo,
+gained). Roll lines are only formatted when a shard is viewed or exported, so
+simulation memory stays constant regardless of simulate_count.
+
+Shard layout (little-endian):
+    header: b"RLOG", version u8, codec u8, first_roll u64
+    block:  rolls u32, payload_bytes u32, payload (compressed columns)
+
+Compression uses zstandard when installed, zlib otherwise.
+
+Usage:
+    python roll_log.py [log_dir]                      # Print every roll
+    python roll_log.py [log_dir] --from N --count M   # Print rolls N..N+M-1 (1-based)
+    python roll_log.py [log_dir] --export out.txt     # Write rollbotsimlog-style text
+"""
+
+import glob
+import os
+import struct
+import sys
+import zlib
+from typing import Iterator, Dict, Optional
+
+import numpy as np
+
+from roll_rules import RollRules, DEFAULT_RULES, format_roll
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b"RLOG"
+VERSION = 1
+CODEC_ZLIB = 0
+CODEC_ZSTD = 1
+HEADER = struct.Struct("<4sBBQ")
+BLOCK_HEADER = struct.Struct("<II")
+# Column order and types inside a block payload
+COLUMNS = (('tier', np.uint8), ('quantity', np.uint8), ('combo', np.uint32), ('gained', np.float64))
+
+DEFAULT_LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rollbotsim_logs")
+
+
+def shard_path(log_dir: str, chunk_id: int) -> str:
+    """Path of the shard for one simulation chunk (zero-padded so names sort in stream order)."""
+    return os.path.join(log_dir, f"shard_{chunk_id:06d}.rlog")
+
+
+def clear_shards(log_dir: str = DEFAULT_LOG_DIR):
+    """Remove shards left by a previous simulation."""
+    os.makedirs(log_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(log_dir, "shard_*.rlog")):
+        os.remove(path)
+
+
+class RollLogWriter:
+    """Appends batches of rolls to one shard file."""
+
+    def __init__(self, path: str, first_roll: int, compress_level: int = 1, resume_bytes: int = 0):
+        """
+        Open a shard for writing.
+
+        Args:
+            path: Shard file path
+            first_roll: 0-based stream index of the shard's first roll
+            compress_level: zlib/zstd level (low levels keep the simulation CPU-bound on rolling)
+            resume_bytes: Keep this many bytes of an existing shard (from a checkpoint) and append
+        """
+        self.compress_level = compress_level
+        if resume_bytes and os.path.exists(path):
+            self.file = open(path, "r+b")
+            self.codec = HEADER.unpack(self.file.read(HEADER.size))[2]
+            # Drop blocks written after the checkpoint; they will be rolled again
+            self.file.truncate(resume_bytes)
+            self.file.seek(resume_bytes)
+        else:
+            self.codec = CODEC_ZSTD if zstandard else CODEC_ZLIB
+            self.file = open(path, "wb")
+            self.file.write(HEADER.pack(MAGIC, VERSION, self.codec, first_roll))
+        if self.codec == CODEC_ZSTD and zstandard is None:
+            raise ValueError(f"{path} is zstd-compressed; install zstandard to append to it")
+        self._zstd = zstandard.ZstdCompressor(level=compress_level) if self.codec == CODEC_ZSTD else None
+        self.rolls = 0
+
+    def flush(self) -> int:
+        """Flush buffered blocks to disk and return the shard size in bytes."""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def write_batch(self, batch: Dict[str, np.ndarray]):
+        """Append one batch (arrays from VectorRollSimulator.roll_batch)."""
+        n = len(batch['tier'])
+        if n == 0:
+            return
+        raw = b"".join(np.ascontiguousarray(batch[name], dtype=dtype).tobytes() for name, dtype in COLUMNS)
+        payload = self._zstd.compress(raw) if self._zstd else zlib.compress(raw, self.compress_level)
+        self.file.write(BLOCK_HEADER.pack(n, len(payload)))
+        self.file.write(payload)
+        self.rolls += n
+
+    def close(self):
+        """Flush and close the shard."""
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def read_shard(path: str, skip_before: int = 0) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Lazily decode a shard block by block.
+
+    Args:
+        path: Shard file path
+        skip_before: Seek past (without decompressing) blocks that end before this roll index
+
+    Yields:
+        Dicts with 'first_roll' (0-based stream index) and the tier/quantity/combo/gained columns
+    """
+    with open(path, "rb") as f:
+        magic, version, codec, first_roll = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} roll log")
+        if codec == CODEC_ZSTD and zstandard is None:
+            raise ValueError(f"{path} is zstd-compressed; install zstandard to read it")
+        decompressor = zstandard.ZstdDecompressor() if codec == CODEC_ZSTD else None
+        roll = first_roll
+        while True:
+            header = f.read(BLOCK_HEADER.size)
+            if len(header) < BLOCK_HEADER.size:
+                return  # End of shard (or a block cut off by an interrupted run)
+            n, size = BLOCK_HEADER.unpack(header)
+            if roll + n <= skip_before:
+                f.seek(size, os.SEEK_CUR)
+                roll += n
+                continue
+            payload = f.read(size)
+            if len(payload) < size:
+                return
+            raw = decompressor.decompress(payload) if decompressor else zlib.decompress(payload)
+            block = {'first_roll': roll}
+            pos = 0
+            for name, dtype in COLUMNS:
+                width = np.dtype(dtype).itemsize * n
+                block[name] = np.frombuffer(raw, dtype=dtype, count=n, offset=pos)
+                pos += width
+            yield block
+            roll += n
+
+
+def iter_roll_lines(log_dir: str, rules: RollRules = DEFAULT_RULES,
+                    start: int = 0, count: Optional[int] = None) -> Iterator[str]:
+    """
+    Format logged rolls as rollbotsimlog lines, decoding only the blocks needed.
+
+    Args:
+        log_dir: Directory holding shard_*.rlog files
+        rules: Rules the simulation ran under (for the R% and bonus columns)
+        start: 0-based index of the first roll to show
+        count: Number of rolls to show (all remaining if None)
+
+    Yields:
+        "Roll N: ..." lines in stream order
+    """
+    end = None if count is None else start + count
+    for path in sorted(glob.glob(os.path.join(log_dir, "shard_*.rlog"))):
+        for block in read_shard(path, start):
+            first = block['first_roll']
+            n = len(block['tier'])
+            if first + n <= start:
+                continue
+            if end is not None and first >= end:
+                return
+            lo = max(0, start - first)
+            hi = n if end is None else min(n, end - first)
+            for i in range(lo, hi):
+                tier = int(block['tier'][i])
+                quantity = int(block['quantity'][i])
+                combo = int(block['combo'][i])
+                # Re-derive the roll's columns from the combo it continued
+                roll = rules.score(tier, quantity, tier, combo - quantity)
+                roll['gained'] = float(block['gained'][i])  # Stored value, exactly as simulated
+                yield f"Roll {first + i + 1}: {format_roll(roll)}"
+
+
+def export_text(log_dir: str, out_path: str, rules: RollRules = DEFAULT_RULES) -> int:
+    """Write every logged roll as text. Returns the number of lines written."""
+    written = 0
+    with open(out_path, "w") as out:
+        for line in iter_roll_lines(log_dir, rules):
+            out.write(line + "\n")
+            written += 1
+    return written
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    log_dir = args.pop(0) if args and not args[0].startswith("--") else DEFAULT_LOG_DIR
+    options = dict(zip(args[::2], args[1::2]))
+
+    if "--export" in options:
+        lines = export_text(log_dir, options["--export"])
+        print(f"Exported {lines} rolls to {options['--export']}")
+    else:
+        start = int(options.get("--from", 1)) - 1
+        count = int(options["--count"]) if "--count" in options else None
+        for line in iter_roll_lines(log_dir, DEFAULT_RULES, start, count):
+            print(line)
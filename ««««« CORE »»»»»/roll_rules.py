@@ -0,0 +1,211 @@
+"""Rules of the roll game shared by rollbot.py, rollbot2.py and the simulator.
+
+The game is defined declaratively by RollRules: geometric tier and quantity
+distributions (each step is 1/base as likely as the one before), a reward of
+quantity * round(star_base**tier, star_decimals) - star_offset, and a combo
+bonus of combo_bonus * (quantity already in the combo) times that reward when a
+roll repeats the previous tier.
+
+From one RollRules object:
+- roll() is the scalar live-roll step the bots use,
+- simulator() compiles the vectorized batch engine (roll_sim.py),
+- economics() builds the analytic model (roll_analytics.py),
+and all three agree exactly, so changing a rule means changing it here only.
+"""
+
+import hashlib
+import math
+import random
+from typing import Dict, Any
+
+
+def build_thresholds(base, count):
+    """
+    base: the denominator base (3 for tiers, 6 for quantities)
+    count: how many items (32 tiers, 5 quantities)
+
+    Returns:
+        (cumulative thresholds, normalized weights)
+    """
+    # Step 1: raw weights
+    weights = [(1 / (base ** i)) for i in range(count)]
+
+    # Step 2: normalize
+    total = sum(weights)
+    normalized_weights = [w / total for w in weights]
+
+    # Step 3: cumulative thresholds
+    cumulative = []
+    running = 0
+    for w in normalized_weights:
+        running += w
+        cumulative.append(running)
+
+    return cumulative, normalized_weights
+
+
+def weighted_roll(thresholds, r=None):
+    """
+    thresholds: cumulative probability list
+    r: uniform draw in [0, 1) (random.random() if None)
+    Returns: index (0-based) of selected item
+    """
+    if r is None:
+        r = random.random()
+    for i, t in enumerate(thresholds):
+        if r < t:
+            return i
+    return len(thresholds) - 1  # fallback (should never hit)
+
+
+class RollRules:
+    """Declarative definition of the roll game."""
+
+    def __init__(self, tier_base: float = 3, tier_count: int = 32, quantity_base: float = 6,
+                 quantity_count: int = 5, star_base: float = 3.5, star_decimals: int = 2,
+                 star_offset: float = 2.5, combo_bonus: float = 0.4):
+        """
+        Define the rules.
+
+        Args:
+            tier_base: Each tier is 1/tier_base as likely as the previous one
+            tier_count: Number of tiers (T1..Tn)
+            quantity_base: Each quantity is 1/quantity_base as likely as the previous one
+            quantity_count: Number of quantities (1..n)
+            star_base: Stars per unit quantity of tier t are round(star_base**t, star_decimals)
+            star_decimals: Rounding applied to the per-tier star value
+            star_offset: Subtracted from every roll's base stars
+            combo_bonus: Bonus per quantity already in the combo, as a fraction of base stars
+        """
+        self.tier_base = tier_base
+        self.tier_count = tier_count
+        self.quantity_base = quantity_base
+        self.quantity_count = quantity_count
+        self.star_base = star_base
+        self.star_decimals = star_decimals
+        self.star_offset = star_offset
+        self.combo_bonus = combo_bonus
+
+        self.tier_thresholds, self.tier_weights = build_thresholds(base=tier_base, count=tier_count)
+        self.quantity_thresholds, self.quantity_weights = build_thresholds(base=quantity_base, count=quantity_count)
+        self.stars_per_quantity = [round(star_base ** t, star_decimals) for t in range(1, tier_count + 1)]
+
+    def chance(self, tier: int, quantity: int) -> float:
+        """Chance of this exact roll, in percent."""
+        return self.tier_weights[tier - 1] * self.quantity_weights[quantity - 1] * 100
+
+    def base_stars(self, tier: int, quantity: int) -> float:
+        """Stars for a roll before any combo bonus."""
+        return quantity * self.stars_per_quantity[tier - 1] - self.star_offset
+
+    def roll(self, last_tier: int, combo_quantity: int, rand=random.random) -> Dict[str, Any]:
+        """
+        Make one live roll and apply the combo rule.
+
+        Args:
+            last_tier: Tier of the open combo (0 if none)
+            combo_quantity: Quantity in the open combo
+            rand: Uniform [0, 1) source; called twice (tier, then quantity)
+
+        Returns:
+            Dict with tier, quantity, previous_combo, combo (new open combo quantity),
+            chance, base_gained, combo_bonus and gained
+        """
+        tier = weighted_roll(self.tier_thresholds, rand()) + 1
+        quantity = weighted_roll(self.quantity_thresholds, rand()) + 1
+        return self.score(tier, quantity, last_tier, combo_quantity)
+
+    def score(self, tier: int, quantity: int, last_tier: int, combo_quantity: int) -> Dict[str, Any]:
+        """Apply the combo rule and reward formula to a given (tier, quantity)."""
+        # Track previous combo for this roll
+        if tier == last_tier:
+            previous_combo = combo_quantity
+            combo = combo_quantity + quantity
+        else:
+            previous_combo = 0
+            combo = quantity
+        base_gained = self.base_stars(tier, quantity)
+        # Apply combo bonus: combo_bonus per quantity in previous combo
+        combo_bonus = previous_combo * self.combo_bonus * base_gained if previous_combo > 0 else 0
+        return {
+            'tier': tier,
+            'quantity': quantity,
+            'previous_combo': previous_combo,
+            'combo': combo,
+            'chance': self.chance(tier, quantity),
+            'base_gained': base_gained,
+            'combo_bonus': combo_bonus,
+            'gained': base_gained + combo_bonus,
+        }
+
+    def simulator(self):
+        """Compile the vectorized batch simulator for these rules."""
+        from roll_sim import VectorRollSimulator
+        return VectorRollSimulator(self)
+
+    def economics(self):
+        """Build the analytic expectation model for these rules."""
+        from roll_analytics import RollEconomics
+        return RollEconomics(self)
+
+    def fingerprint(self) -> bytes:
+        """Hash of every rule parameter (checkpoints refuse to resume under different rules)."""
+        params = [self.tier_base, self.tier_count, self.quantity_base, self.quantity_count,
+                  self.star_base, self.star_decimals, self.star_offset, self.combo_bonus]
+        return hashlib.sha1(repr([float(p) for p in params]).encode()).digest()
+
+
+DEFAULT_RULES = RollRules()
+
+
+# scientific notation formatter
+def format_number(num):
+    """Format large numbers as x×10^y, otherwise return as-is"""
+    if num >= 1000:
+        exponent = int(math.log10(num))
+        mantissa = num / (10 ** exponent)
+        return f"{mantissa:.2f}×10^{exponent}"
+    return str(round(num, 2))
+
+
+def format_rarity(chance):
+    """Safely format rarity as '1 in X', handling very small chances"""
+    if chance <= 0:
+        return "∞"
+    rarity = 100 / chance
+    if rarity >= 1000:  # Use scientific notation for large rarities (1 in 1000+)
+        return format_number(rarity)
+    return str(round(rarity, 3))
+
+
+def format_chance(chance):
+    """Format chance percentage with scientific notation for very small values"""
+    if chance <= 0:
+        return "0 (≈0)"
+    if chance < 0.001:  # Use scientific notation for very small percentages
+        exponent = int(math.floor(math.log10(chance)))
+        mantissa = chance / (10 ** exponent)
+        return f"{mantissa:.3f}×10^{exponent}"
+    return f"{chance:.6f}" if chance < 0.01 else f"{round(chance, 3)}"
+
+
+def format_roll_info(tier, quantity, previous_combo_quantity, combo_quantity, chance, gained, combo_bonus):
+    """Format a roll line, showing the previous/new combo total when it continues a combo"""
+    if previous_combo_quantity > 0:
+        combo_display = f"(+{previous_combo_quantity}/{combo_quantity}) {quantity} × T{tier}"
+        bonus_display = f" [+{round(combo_bonus, 2)}]"
+    else:
+        combo_display = f"{quantity} × T{tier}"
+        bonus_display = ""
+
+    # Format rarity - use scientific notation for very small chances
+    if chance < 0.0001:
+        # For very rare rolls (< 0.0001%), only show "1 in X" format
+        return f"{combo_display} | R%: 1 in {format_rarity(chance)} | {round(gained, 2)} ★{bonus_display}"
+    return f"{combo_display} | R%: {format_chance(chance)}% (1 in {format_rarity(chance)}) | {round(gained, 2)} ★{bonus_display}"
+
+
+def format_roll(outcome: Dict[str, Any]) -> str:
+    """format_roll_info for a dict returned by RollRules.roll/score."""
+    return format_roll_info(outcome['tier'], outcome['quantity'], outcome['previous_combo'], outcome['combo'],
+                            outcome['chance'], outcome['gained'], outcome['combo_bonus'])
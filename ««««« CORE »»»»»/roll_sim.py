@@ -0,0 +1,420 @@
+"""Vectorized roll simulator for rollbot.py (compiled from roll_rules.RollRules).
+
+Draws tiers and quantities in large NumPy batches (searchsorted over the
+cumulative thresholds), looks up base stars in a precomputed round(3.5**tier, 2)
+table and derives combos from run-lengths of the tier array, carrying the open
+combo across batch boundaries.
+
+Every roll consumes two uniforms from a numpy Generator (tier, then quantity),
+so the vectorized path and the scalar reference produce identical rolls,
+stars and statistics for the same seed regardless of batch size.
+
+Parallel runs split the rolls into fixed-size chunks of one PCG64 stream
+(each worker jumps ahead to its chunk with advance()). The combo carried into
+each chunk is found up front from the trailing run of the chunks before it,
+so combos continue across chunk seams exactly as in a sequential run, and the
+merged result does not depend on the number of workers.
+
+Usage:
+    python roll_sim.py [rolls] [seed]   # Benchmark and check against the scalar reference
+"""
+
+import sys
+import time
+from typing import Optional, Dict, List, Any
+
+import numpy as np
+
+from roll_rules import RollRules, DEFAULT_RULES
+
+DEFAULT_BATCH = 1 << 20  # Rolls per vectorized batch (~40MB of temporaries)
+CHUNK_ROLLS = 1 << 22  # Rolls per parallel work unit (fixed so results don't depend on core count)
+DRAWS_PER_ROLL = 2
+
+
+class RollState:
+    """Aggregate statistics plus the open combo, updated batch by batch."""
+
+    def __init__(self, tier_count=DEFAULT_RULES.tier_count, last_tier=0, combo_quantity=0):
+        self.tier_data = np.zeros(tier_count, dtype=np.int64)
+        self.tier_stars = np.zeros(tier_count, dtype=np.float64)
+        self.tier_roll_count = np.zeros(tier_count, dtype=np.int64)
+        self.stars = 0.0
+        self.rarest = 100.0
+        self.name = "1 × T1"
+        self.index = 0
+        self.highest_combo_quantity = 0
+        self.highest_combo_tier = 0
+        self.last_tier = last_tier
+        self.combo_quantity = combo_quantity
+        self.rolls = 0
+
+    def to_result(self) -> Dict[str, Any]:
+        """Result dict in the format rollbot's simulate_worker returns."""
+        return {
+            'tier_data': [int(v) for v in self.tier_data],
+            'tier_stars': [float(v) for v in self.tier_stars],
+            'tier_roll_count': [int(v) for v in self.tier_roll_count],
+            'stars': float(self.stars),
+            'rarest': float(self.rarest),
+            'name': self.name,
+            'index': int(self.index),
+            'highest_combo_quantity': int(self.highest_combo_quantity),
+            'highest_combo_tier': int(self.highest_combo_tier),
+            'last_tier': int(self.last_tier),
+            'combo_quantity': int(self.combo_quantity),
+            'rolls': int(self.rolls),
+        }
+
+
+class VectorRollSimulator:
+    """Batch roll engine compiled from a RollRules definition."""
+
+    def __init__(self, rules: RollRules = DEFAULT_RULES):
+        self.rules = rules
+        self.tier_thresholds = np.asarray(rules.tier_thresholds, dtype=np.float64)
+        self.quantity_thresholds = np.asarray(rules.quantity_thresholds, dtype=np.float64)
+        self.tier_count = rules.tier_count
+        self.quantity_count = rules.quantity_count
+        self.stars_per_quantity = np.asarray(rules.stars_per_quantity, dtype=np.float64)
+        self.star_offset = rules.star_offset
+        self.combo_bonus = rules.combo_bonus
+        # Same per-roll operations as RollRules.chance
+        self.chance_table = np.array([[rules.chance(t, q) for q in range(1, rules.quantity_count + 1)]
+                                      for t in range(1, rules.tier_count + 1)], dtype=np.float64)
+
+    def draw(self, rng: np.random.Generator, n: int):
+        """Draw n (tier, quantity) pairs as 1-based int arrays."""
+        u = rng.random((n, DRAWS_PER_ROLL))
+        # weighted_roll picks the first threshold with r < t == searchsorted side='right'
+        tiers = np.minimum(np.searchsorted(self.tier_thresholds, u[:, 0], side='right'),
+                           self.tier_count - 1) + 1
+        quantities = np.minimum(np.searchsorted(self.quantity_thresholds, u[:, 1], side='right'),
+                                self.quantity_count - 1) + 1
+        return tiers, quantities
+
+    def trailing_run(self, seed, offset: int, n: int):
+        """
+        Find the combo left open at the end of a chunk, without simulating the chunk.
+
+        Args:
+            seed: Simulation seed
+            offset: Index of the chunk's first roll in the stream
+            n: Rolls in the chunk
+
+        Returns:
+            (tier, quantity_sum, covers_chunk) of the chunk's last run of equal tiers;
+            covers_chunk means the whole chunk is one run and extends the incoming combo
+        """
+        probe = 64
+        while True:
+            k = min(probe, n)
+            tiers, quantities = self.draw(stream_rng(seed, offset + n - k), k)
+            changes = np.flatnonzero(tiers != tiers[-1])
+            if len(changes):
+                first = changes[-1] + 1
+                return int(tiers[-1]), int(quantities[first:].sum()), False
+            if k == n:
+                return int(tiers[-1]), int(quantities.sum()), True
+            probe *= 4
+
+    def roll_batch(self, rng: np.random.Generator, n: int, state: RollState) -> Dict[str, np.ndarray]:
+        """
+        Roll n times, folding the results into state.
+
+        Args:
+            rng: Generator to draw from (two uniforms per roll)
+            n: Number of rolls
+            state: Running aggregate and combo carry
+
+        Returns:
+            Per-roll arrays: tier, quantity, previous_combo, combo, gained, combo_bonus, chance
+        """
+        tiers, quantities = self.draw(rng, n)
+
+        # Combo runs: a run starts wherever the tier differs from the previous roll
+        starts = np.empty(n, dtype=bool)
+        starts[0] = tiers[0] != state.last_tier
+        np.not_equal(tiers[1:], tiers[:-1], out=starts[1:])
+        running_qty = np.cumsum(quantities)
+        run_base = running_qty - quantities
+        if not starts[0]:
+            run_base[0] = -state.combo_quantity  # First run continues the carried combo
+        anchor = np.where(starts, np.arange(n), 0)
+        np.maximum.accumulate(anchor, out=anchor)
+        combo = running_qty - run_base[anchor]
+        previous_combo = combo - quantities
+
+        base_gained = quantities * self.stars_per_quantity[tiers - 1] - self.star_offset
+        combo_bonus = previous_combo * self.combo_bonus * base_gained
+        gained = base_gained + combo_bonus
+        chance = self.chance_table[tiers - 1, quantities - 1]
+
+        self._fold(state, tiers, quantities, combo, gained, chance)
+        return {
+            'tier': tiers,
+            'quantity': quantities,
+            'previous_combo': previous_combo,
+            'combo': combo,
+            'gained': gained,
+            'combo_bonus': combo_bonus,
+            'chance': chance,
+        }
+
+    def _fold(self, state, tiers, quantities, combo, gained, chance):
+        """Merge one batch into the running state in roll order."""
+        n = len(tiers)
+        tier_idx = tiers - 1
+        counts = np.bincount(tier_idx, minlength=self.tier_count)
+        state.tier_roll_count += counts
+        state.tier_data += np.bincount(tier_idx, weights=quantities, minlength=self.tier_count).astype(np.int64)
+
+        # Sequential sums (cumsum accumulates left to right) so totals match the scalar loop bit for bit
+        state.stars = float(np.cumsum(np.concatenate(([state.stars], gained)))[-1])
+        for t in np.flatnonzero(counts):
+            seg = gained[tier_idx == t]
+            state.tier_stars[t] = np.cumsum(np.concatenate(([state.tier_stars[t]], seg)))[-1]
+
+        i = int(np.argmin(chance))  # First occurrence, matching the strict < in the scalar loop
+        if chance[i] < state.rarest:
+            state.rarest = float(chance[i])
+            state.name = f"{int(quantities[i])} × T{int(tiers[i])}"
+            state.index = state.rolls + i
+
+        j = int(np.argmax(combo))
+        if combo[j] > state.highest_combo_quantity:
+            state.highest_combo_quantity = int(combo[j])
+            state.highest_combo_tier = int(tiers[j])
+
+        state.last_tier = int(tiers[-1])
+        state.combo_quantity = int(combo[-1])
+        state.rolls += n
+
+    def simulate(self, rng: np.random.Generator, num_rolls: int, state: Optional[RollState] = None,
+                 batch_size: int = DEFAULT_BATCH, on_batch=None) -> RollState:
+        """
+        Roll num_rolls times in batches.
+
+        Args:
+            rng: Generator to draw from
+            num_rolls: Total rolls
+            state: State to continue from (new one if None)
+            batch_size: Rolls per batch
+            on_batch: Optional callback(batch_arrays, state) after each batch
+
+        Returns:
+            The updated RollState
+        """
+        if state is None:
+            state = RollState(self.tier_count)
+        remaining = num_rolls
+        while remaining > 0:
+            n = min(batch_size, remaining)
+            batch = self.roll_batch(rng, n, state)
+            if on_batch:
+                on_batch(batch, state)
+            remaining -= n
+        return state
+
+
+def stream_rng(seed, offset: int = 0) -> np.random.Generator:
+    """Generator positioned at roll `offset` of the simulation stream for `seed`."""
+    bit_generator = np.random.PCG64(np.random.SeedSequence(seed))
+    bit_generator.advance(offset * DRAWS_PER_ROLL)
+    return np.random.Generator(bit_generator)
+
+
+def plan_chunks(num_rolls: int, chunk_rolls: int = CHUNK_ROLLS):
+    """Split num_rolls into (offset, count) chunks of the roll stream."""
+    return [(offset, min(chunk_rolls, num_rolls - offset)) for offset in range(0, num_rolls, chunk_rolls)]
+
+
+def chunk_carries(sim: VectorRollSimulator, seed, chunks, last_tier: int = 0, combo_quantity: int = 0):
+    """
+    Prefix-merge chunk trailing runs into the combo state entering each chunk.
+
+    Args:
+        sim: Simulator (for drawing)
+        seed: Simulation seed
+        chunks: Output of plan_chunks
+        last_tier: Combo tier carried in from before the simulation (save file)
+        combo_quantity: Combo quantity carried in from before the simulation
+
+    Returns:
+        List of (last_tier, combo_quantity) to start each chunk with
+    """
+    carries = []
+    carry = (last_tier, combo_quantity)
+    for offset, n in chunks:
+        carries.append(carry)
+        tier, quantity, covers_chunk = sim.trailing_run(seed, offset, n)
+        if covers_chunk and tier == carry[0]:
+            carry = (tier, carry[1] + quantity)
+        else:
+            carry = (tier, quantity)
+    return carries
+
+
+def simulate_chunk(sim: VectorRollSimulator, seed, offset: int, n: int, last_tier: int = 0,
+                   combo_quantity: int = 0, batch_size: int = DEFAULT_BATCH, on_batch=None,
+                   state: Optional[RollState] = None) -> RollState:
+    """
+    Simulate one chunk of the stream starting from the given combo carry.
+
+    Passing a state saved part-way through the chunk resumes it: the stream
+    restarts at state.rolls, so the finished state is bit-identical to an
+    uninterrupted run.
+    """
+    if state is None:
+        state = RollState(sim.tier_count, last_tier, combo_quantity)
+        state.rolls = offset  # Rarest index is relative to the start of the simulation
+    done = state.rolls - offset
+    return sim.simulate(stream_rng(seed, state.rolls), n - done, state, batch_size, on_batch)
+
+
+def merge_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fold chunk results in stream order (same order a sequential run accumulates them).
+
+    Args:
+        results: RollState.to_result() dicts, one per chunk, in chunk order
+
+    Returns:
+        Combined result dict; last_tier/combo_quantity are those after the final chunk
+    """
+    merged = RollState(len(results[0]['tier_data'])).to_result()
+    for result in results:
+        for i in range(len(merged['tier_data'])):
+            merged['tier_data'][i] += result['tier_data'][i]
+            merged['tier_stars'][i] += result['tier_stars'][i]
+            merged['tier_roll_count'][i] += result['tier_roll_count'][i]
+        merged['stars'] += result['stars']
+        if result['rarest'] < merged['rarest']:
+            merged['rarest'] = result['rarest']
+            merged['name'] = result['name']
+            merged['index'] = result['index']
+        if result['highest_combo_quantity'] > merged['highest_combo_quantity']:
+            merged['highest_combo_quantity'] = result['highest_combo_quantity']
+            merged['highest_combo_tier'] = result['highest_combo_tier']
+        merged['last_tier'] = result['last_tier']
+        merged['combo_quantity'] = result['combo_quantity']
+        merged['rolls'] = result['rolls']  # Chunk states count from the simulation start
+    return merged
+
+
+def simulate_sequential(sim: VectorRollSimulator, seed, num_rolls: int, last_tier: int = 0,
+                        combo_quantity: int = 0, chunk_rolls: int = CHUNK_ROLLS) -> Dict[str, Any]:
+    """Single-process reference for the parallel split: chunks run in order, each continuing the last."""
+    results = []
+    for offset, n in plan_chunks(num_rolls, chunk_rolls):
+        state = simulate_chunk(sim, seed, offset, n, last_tier, combo_quantity)
+        last_tier, combo_quantity = state.last_tier, state.combo_quantity
+        results.append(state.to_result())
+    return merge_results(results)
+
+
+def simulate_scalar(rng: np.random.Generator, num_rolls: int, rules: RollRules = DEFAULT_RULES,
+                    state: Optional[RollState] = None) -> RollState:
+    """Reference implementation: the bots' live roll (RollRules.roll) drawing from the same Generator stream."""
+    if state is None:
+        state = RollState(rules.tier_count)
+    tier_stars: List[float] = [float(v) for v in state.tier_stars]
+
+    for _ in range(num_rolls):
+        roll = rules.roll(state.last_tier, state.combo_quantity, rng.random)
+        tier, quantity, gained = roll['tier'], roll['quantity'], roll['gained']
+        state.last_tier = tier
+        state.combo_quantity = roll['combo']
+
+        if state.combo_quantity > state.highest_combo_quantity:
+            state.highest_combo_quantity = state.combo_quantity
+            state.highest_combo_tier = tier
+
+        state.stars += gained
+        if roll['chance'] < state.rarest:
+            state.rarest = roll['chance']
+            state.name = f"{quantity} × T{tier}"
+            state.index = state.rolls
+
+        state.tier_data[tier - 1] += quantity
+        tier_stars[tier - 1] += gained
+        state.tier_roll_count[tier - 1] += 1
+        state.rolls += 1
+
+    state.tier_stars[:] = tier_stars
+    return state
+
+
+def _check_chunk(args):
+    """Pool entry point for the parallel self-check."""
+    sim, seed, offset, n, last_tier, combo_quantity = args
+    return simulate_chunk(sim, seed, offset, n, last_tier, combo_quantity).to_result()
+
+
+if __name__ == '__main__':
+    import multiprocessing
+
+    rolls = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 12345
+    rules = DEFAULT_RULES
+    sim = rules.simulator()
+
+    t0 = time.perf_counter()
+    state = sim.simulate(stream_rng(seed), rolls)
+    elapsed = time.perf_counter() - t0
+    print(f"Vectorized: {rolls} rolls in {elapsed:.2f}s ({rolls / elapsed * 60 / 1e6:.1f}M rolls/min)")
+    print(f"Stars: {state.stars} | Rarest: {state.name} | Highest combo: "
+          f"{state.highest_combo_quantity} × T{state.highest_combo_tier}")
+
+    check_rolls = min(rolls, 200_000)
+    vec = sim.simulate(stream_rng(seed), check_rolls, batch_size=4096).to_result()
+    ref = simulate_scalar(stream_rng(seed), check_rolls, rules).to_result()
+    mismatched = [key for key in ref if ref[key] != vec[key]]
+    if mismatched:
+        print(f"❌ Mismatch against scalar reference ({check_rolls} rolls): {', '.join(mismatched)}")
+        sys.exit(1)
+    print(f"✅ Matches scalar reference exactly ({check_rolls} rolls)")
+
+    # Parallel chunks (small, so many seams) must equal the sequential chunked run,
+    # and every non-float statistic must equal one continuous scalar run of the same stream
+    chunk_rolls = 1000
+    carry = (1, 3)  # Pretend the save file left a 3 × T1 combo open
+    chunks = plan_chunks(check_rolls, chunk_rolls)
+    carries = chunk_carries(sim, seed, chunks, *carry)
+    with multiprocessing.Pool() as pool:
+        parallel = merge_results(pool.map(_check_chunk, [(sim, seed, offset, n, lt, cq)
+                                                         for (offset, n), (lt, cq) in zip(chunks, carries)]))
+    sequential = simulate_sequential(sim, seed, check_rolls, *carry, chunk_rolls=chunk_rolls)
+    continuous = simulate_scalar(stream_rng(seed), check_rolls, rules,
+                                 RollState(rules.tier_count, *carry)).to_result()
+    mismatched = [key for key in sequential if sequential[key] != parallel[key]]
+    mismatched += [key for key in continuous if key not in ('stars', 'tier_stars') and continuous[key] != parallel[key]]
+    if mismatched:
+        print(f"❌ Parallel chunks differ from sequential run: {', '.join(mismatched)}")
+        sys.exit(1)
+    print(f"✅ Parallel chunks match sequential run ({len(chunks)} chunks, stars differ from scalar by "
+          f"{abs(parallel['stars'] - continuous['stars']):.3g} rounding)")
+
+    # The rarest-roll list must not depend on how the stream is split into chunks and batches
+    from roll_stats import RollStats
+
+    def collect_rarest(chunk_rolls, batch_size, top_k=1000):
+        chunks = plan_chunks(check_rolls, chunk_rolls)
+        merged = None
+        for (offset, n), (lt, cq) in zip(chunks, chunk_carries(sim, seed, chunks, *carry)):
+            stats = RollStats(sim.tier_count, offset, top_k=top_k)
+            simulate_chunk(sim, seed, offset, n, lt, cq, batch_size,
+                           lambda batch, st: stats.update(batch, st.rolls - len(batch['tier'])))
+            stats.finish()
+            if merged is None:
+                merged = stats
+            else:
+                merged.merge(stats)
+        return merged.summary()['rarest']
+
+    whole = collect_rarest(check_rolls, check_rolls)
+    split = [collect_rarest(chunk_rolls, batch_size) for chunk_rolls, batch_size in ((33_333, 4096), (1000, 300))]
+    if any(rarest != whole for rarest in split):
+        print("❌ Rarest rolls depend on chunk/batch size")
+        sys.exit(1)
+    print(f"✅ Rarest rolls identical for 1 and {len(chunks)} chunks ({len(whole)} kept)")
@@ -0,0 +1,324 @@
+"""Streaming statistics for large rollbot.py simulations.
+
+Each simulation chunk feeds its batches into a RollStats collector, and the
+parent merges the collectors at the end. Memory stays bounded however many
+rolls are simulated:
+
+- quantiles of stars per window of N rolls (windows aligned to the roll
+  stream; windows cut by chunk seams are stitched together on merge, and a
+  final incomplete window is left out),
+  kept in a merging t-digest (over asinh(stars), since a rare high tier makes
+  the upper tail span orders of magnitude),
+- the first roll reaching each tier T>=k,
+- the top-K rarest rolls (bounded heap),
+- the biggest combo reached in each tier.
+"""
+
+import heapq
+import struct
+from typing import List, Dict, Any, Tuple, Optional
+
+import numpy as np
+
+DEFAULT_WINDOW = 100  # Rolls per stars window (matches the live bot's 100-roll breakdown)
+DEFAULT_TOP_K = 10
+DEFAULT_COMPRESSION = 500
+REPORT_QUANTILES = (0.01, 0.1, 0.5, 0.9, 0.99, 0.999)
+
+
+class TDigest:
+    """Merging t-digest (Dunning) over float64 values, built for batched NumPy input."""
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self._buffer: List[np.ndarray] = []
+        self._buffered = 0
+
+    def add(self, values: np.ndarray, weights: Optional[np.ndarray] = None):
+        """Add values (optionally weighted); compresses once the buffer is large."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        if weights is None:
+            weights = np.ones(len(values))
+        self._buffer.append(np.stack((values, np.asarray(weights, dtype=np.float64))))
+        self._buffered += len(values)
+        if self._buffered > 20 * self.compression:
+            self._compress()
+
+    def merge(self, other: 'TDigest'):
+        """Fold another digest's centroids into this one."""
+        other._compress()
+        self.add(other.means, other.weights)
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        data = np.concatenate([np.stack((self.means, self.weights))] + self._buffer, axis=1)
+        self._buffer = []
+        self._buffered = 0
+        order = np.argsort(data[0], kind='stable')
+        means, weights = data[0][order], data[1][order]
+        total = weights.sum()
+        # Scale function k1: centroids are small near the tails, large in the middle
+        q_mid = (np.cumsum(weights) - weights / 2) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1)
+        cluster = np.floor(k - k[0]).astype(np.int64)
+        _, cluster = np.unique(cluster, return_inverse=True)
+        merged_weights = np.bincount(cluster, weights=weights)
+        self.means = np.bincount(cluster, weights=means * weights) / merged_weights
+        self.weights = merged_weights
+
+    @property
+    def count(self) -> float:
+        self._compress()
+        return float(self.weights.sum())
+
+    def quantile(self, q: float) -> float:
+        """Estimated value at quantile q in [0, 1] (nan when empty)."""
+        self._compress()
+        if len(self.means) == 0:
+            return float('nan')
+        if len(self.means) == 1:
+            return float(self.means[0])
+        centers = (np.cumsum(self.weights) - self.weights / 2) / self.weights.sum()
+        return float(np.interp(q, centers, self.means))
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(centroid means, centroid weights, 2 x n buffer), left uncompressed so a restore is exact."""
+        buffer = np.concatenate(self._buffer, axis=1) if self._buffer else np.zeros((2, 0))
+        return self.means, self.weights, buffer
+
+    @classmethod
+    def from_arrays(cls, means: np.ndarray, weights: np.ndarray, buffer: np.ndarray,
+                    compression: float = DEFAULT_COMPRESSION) -> 'TDigest':
+        digest = cls(compression)
+        digest.means, digest.weights = means, weights
+        if buffer.shape[1]:
+            digest._buffer = [buffer]
+            digest._buffered = buffer.shape[1]
+        return digest
+
+
+class RollStats:
+    """Bounded-memory statistics for one chunk (or, after merging, a whole run)."""
+
+    def __init__(self, tier_count: int, first_roll: int = 0, window: int = DEFAULT_WINDOW,
+                 top_k: int = DEFAULT_TOP_K):
+        """
+        Initialize collector.
+
+        Args:
+            tier_count: Number of tiers
+            first_roll: Stream index of the first roll this collector sees
+            window: Rolls per stars window
+            top_k: Number of rarest rolls to keep
+        """
+        self.tier_count = tier_count
+        self.window = window
+        self.top_k = top_k
+        self.digest = TDigest()
+        self.first_tier_roll = np.full(tier_count, -1, dtype=np.int64)  # Index of first roll with tier >= k
+        # Heap of the rarest rolls, stored as (-chance, -index, quantity, tier) so the root is evicted first
+        self.rarest: List[Tuple[float, int, int, int]] = []
+        self.best_combo = np.zeros(tier_count, dtype=np.int64)
+        self.best_combo_roll = np.full(tier_count, -1, dtype=np.int64)
+        # Windows not fully seen by this collector: {window id: [stars, rolls]}
+        self.partial_windows: Dict[int, List[float]] = {}
+        self.head_window = first_roll // window if first_roll % window else None
+        self.open_window: Optional[List[float]] = None  # [window id, stars, rolls]
+
+    def update(self, batch: Dict[str, np.ndarray], first_roll: int):
+        """
+        Add one batch from VectorRollSimulator.roll_batch.
+
+        Args:
+            batch: Per-roll arrays (tier, quantity, combo, gained, chance)
+            first_roll: Stream index of the batch's first roll
+        """
+        tiers, gained, chance, combo = batch['tier'], batch['gained'], batch['chance'], batch['combo']
+        n = len(tiers)
+        if n == 0:
+            return
+
+        # Stars per window: bincount over window ids relative to the batch's first window
+        window_ids = (first_roll + np.arange(n)) // self.window
+        base_id = int(window_ids[0])
+        relative = window_ids - base_id
+        sums = np.bincount(relative, weights=gained)
+        counts = np.bincount(relative)
+        if self.open_window is not None and self.open_window[0] == base_id:
+            sums[0] += self.open_window[1]
+            counts[0] += self.open_window[2]
+        elif self.open_window is not None:
+            self._close_window(*self.open_window)
+        # Every window but the last is closed by this batch; the last may continue in the next one
+        for i in range(len(sums) - 1):
+            if base_id + i == self.head_window or counts[i] < self.window:
+                self._close_window(base_id + i, sums[i], counts[i])
+        if len(sums) > 1:
+            complete = counts[:-1] == self.window
+            if self.head_window is not None and base_id <= self.head_window < base_id + len(sums) - 1:
+                complete[self.head_window - base_id] = False
+            self._add_windows(sums[:-1][complete])
+        self.open_window = [base_id + len(sums) - 1, float(sums[-1]), int(counts[-1])]
+
+        # First roll reaching each tier: the running max tier is non-decreasing, so searchsorted finds it
+        running_max = np.maximum.accumulate(tiers)
+        unseen = np.flatnonzero(self.first_tier_roll < 0)
+        if len(unseen):
+            positions = np.searchsorted(running_max, unseen + 1, side='left')
+            hit = positions < n
+            self.first_tier_roll[unseen[hit]] = first_roll + positions[hit]
+
+        # Rarest rolls: only the top_k smallest chances of a batch can enter the heap. argpartition
+        # picks an arbitrary subset of the rolls tied at the k-th chance, so take all of them and keep
+        # the earliest, like the heap does; otherwise the result depends on batch and chunk size
+        k = min(self.top_k, n)
+        kth = chance[np.argpartition(chance, k - 1)[k - 1]]
+        candidates = np.flatnonzero(chance <= kth)
+        for i in candidates[np.lexsort((candidates, chance[candidates]))][:k]:
+            self._push_rare(float(chance[i]), first_roll + int(i), int(batch['quantity'][i]), int(tiers[i]))
+
+        # Biggest combo per tier (first roll reaching it); only rolls beating the current best can matter
+        candidates = np.flatnonzero(combo > self.best_combo[tiers - 1])
+        order = candidates[np.lexsort((candidates, -combo[candidates], tiers[candidates]))]
+        firsts = order[np.r_[True, tiers[order][1:] != tiers[order][:-1]]] if len(order) else order
+        for i in firsts:
+            t = int(tiers[i]) - 1
+            if combo[i] > self.best_combo[t]:
+                self.best_combo[t] = int(combo[i])
+                self.best_combo_roll[t] = first_roll + int(i)
+
+    def _add_windows(self, stars: np.ndarray):
+        # Interpolating in asinh space keeps the heavy upper tail's quantiles accurate
+        self.digest.add(np.arcsinh(stars))
+
+    def _close_window(self, window_id, stars, rolls):
+        if rolls == self.window and window_id != self.head_window:
+            self._add_windows(np.array([stars]))
+        else:
+            self.partial_windows[int(window_id)] = [float(stars), int(rolls)]
+
+    def _push_rare(self, chance, index, quantity, tier):
+        entry = (-chance, -index, quantity, tier)
+        if len(self.rarest) < self.top_k:
+            heapq.heappush(self.rarest, entry)
+        elif entry > self.rarest[0]:
+            heapq.heapreplace(self.rarest, entry)
+
+    def finish(self):
+        """Close the open window (call when the chunk ends)."""
+        if self.open_window is not None:
+            window_id, stars, rolls = self.open_window
+            self.open_window = None
+            if rolls == self.window and window_id != self.head_window:
+                self._add_windows(np.array([stars]))
+            else:
+                self.partial_windows[int(window_id)] = [stars, rolls]
+
+    def merge(self, other: 'RollStats'):
+        """Fold another finished collector into this one (order doesn't matter)."""
+        self.digest.merge(other.digest)
+        seen = other.first_tier_roll >= 0
+        mine = self.first_tier_roll >= 0
+        self.first_tier_roll = np.where(seen & (~mine | (other.first_tier_roll < self.first_tier_roll)),
+                                        other.first_tier_roll, self.first_tier_roll)
+        for neg_chance, neg_index, quantity, tier in other.rarest:
+            self._push_rare(-neg_chance, -neg_index, quantity, tier)
+        better = (other.best_combo > self.best_combo) | (
+            (other.best_combo == self.best_combo) & (other.best_combo_roll >= 0) &
+            ((self.best_combo_roll < 0) | (other.best_combo_roll < self.best_combo_roll)))
+        self.best_combo = np.where(better, other.best_combo, self.best_combo)
+        self.best_combo_roll = np.where(better, other.best_combo_roll, self.best_combo_roll)
+        # Stitch windows split across chunk seams
+        for window_id, (stars, rolls) in other.partial_windows.items():
+            current = self.partial_windows.setdefault(window_id, [0.0, 0])
+            current[0] += stars
+            current[1] += rolls
+            if current[1] == self.window:
+                self._add_windows(np.array([current[0]]))
+                del self.partial_windows[window_id]
+
+    def summary(self) -> Dict[str, Any]:
+        """Plain-dict results (quantiles, first tier rolls, rarest rolls, best combos)."""
+        return {
+            'window': self.window,
+            'windows': int(self.digest.count),
+            'quantiles': {q: float(np.sinh(self.digest.quantile(q))) for q in REPORT_QUANTILES},
+            'first_tier_roll': {k + 1: int(i) for k, i in enumerate(self.first_tier_roll) if i >= 0},
+            'rarest': [{'chance': -c, 'index': -i, 'name': f"{q} × T{t}"}
+                       for c, i, q, t in sorted(self.rarest, reverse=True)],
+            'best_combo': {t + 1: (int(self.best_combo[t]), int(self.best_combo_roll[t]))
+                           for t in range(self.tier_count) if self.best_combo[t] > 0},
+        }
+
+    # Binary form for checkpoints
+    # tier_count, window, top_k, centroids, buffered values, partials, head_window (-1 = none)
+    HEADER = struct.Struct("<HIHIIIq")
+
+    def to_bytes(self) -> bytes:
+        """Serialize (used by roll_checkpoint)."""
+        means, weights, buffer = self.digest.to_arrays()
+        parts = [self.HEADER.pack(self.tier_count, self.window, self.top_k, len(means), buffer.shape[1],
+                                  len(self.partial_windows), -1 if self.head_window is None else self.head_window)]
+        parts += [means.astype("<f8").tobytes(), weights.astype("<f8").tobytes(), buffer.astype("<f8").tobytes(),
+                  self.first_tier_roll.astype("<i8").tobytes(),
+                  self.best_combo.astype("<i8").tobytes(), self.best_combo_roll.astype("<i8").tobytes()]
+        rare = sorted(self.rarest, reverse=True)
+        parts.append(struct.pack("<H", len(rare)))
+        parts += [struct.pack("<dqqq", -c, -i, q, t) for c, i, q, t in rare]
+        parts += [struct.pack("<qdq", w, s, r) for w, (s, r) in self.partial_windows.items()]
+        open_window = self.open_window or [-1, 0.0, 0]
+        parts.append(struct.pack("<qdq", int(open_window[0]), open_window[1], int(open_window[2])))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, pos: int = 0) -> 'RollStats':
+        """Deserialize a collector written by to_bytes."""
+        tier_count, window, top_k, centroids, buffered, partials, head_window = cls.HEADER.unpack_from(data, pos)
+        pos += cls.HEADER.size
+        stats = cls(tier_count, 0, window, top_k)
+        stats.head_window = None if head_window < 0 else head_window
+
+        def take(dtype, count):
+            nonlocal pos
+            array = np.frombuffer(data, dtype=dtype, count=count, offset=pos).copy()
+            pos += 8 * count
+            return array
+
+        means = take("<f8", centroids)
+        weights = take("<f8", centroids)
+        stats.digest = TDigest.from_arrays(means, weights, take("<f8", 2 * buffered).reshape(2, buffered))
+        stats.first_tier_roll = take("<i8", tier_count)
+        stats.best_combo = take("<i8", tier_count)
+        stats.best_combo_roll = take("<i8", tier_count)
+        (rare_count,) = struct.unpack_from("<H", data, pos)
+        pos += 2
+        for _ in range(rare_count):
+            chance, index, quantity, tier = struct.unpack_from("<dqqq", data, pos)
+            pos += 32
+            stats._push_rare(chance, index, quantity, tier)
+        for _ in range(partials):
+            window_id, stars, rolls = struct.unpack_from("<qdq", data, pos)
+            pos += 24
+            stats.partial_windows[window_id] = [stars, rolls]
+        window_id, stars, rolls = struct.unpack_from("<qdq", data, pos)
+        stats.open_window = None if window_id < 0 else [window_id, stars, rolls]
+        return stats
+
+
+def format_stats(summary: Dict[str, Any], format_number, format_chance, format_rarity) -> List[str]:
+    """Report lines for a RollStats summary (formatters passed in from roll_rules)."""
+    lines = [f"Stars per {summary['window']} rolls ({summary['windows']} windows): " + " | ".join(
+        f"p{q * 100:g}: {format_number(max(v, 0))}" for q, v in summary['quantiles'].items())]
+    lines.append("First roll reaching tier: " + ", ".join(
+        f"T{k}+ @ {i + 1}" for k, i in summary['first_tier_roll'].items()))
+    lines.append(f"Top {len(summary['rarest'])} rarest rolls:")
+    lines += [f"  {r['name']} (roll {r['index'] + 1}) | R%: {format_chance(r['chance'])}% (1/{format_rarity(r['chance'])})"
+              for r in summary['rarest']]
+    lines.append("Biggest combo per tier: " + ", ".join(
+        f"T{t}: {q} (roll {i + 1})" for t, (q, i) in summary['best_combo'].items()))
+    return lines
@@ -1,20 +1,22 @@
 from pynput.keyboard import Controller, Key, Listener
 from pynput.mouse import Controller as MouseController, Button
-import time, random
-import math
-import mss
+import time
 import numpy as np
 import signal
 import sys
 import multiprocessing
 import os
+from roll_rules import RollRules, format_number, format_rarity, format_chance, format_roll
+from roll_sim import DEFAULT_BATCH, CHUNK_ROLLS, plan_chunks, chunk_carries, simulate_chunk, merge_results
+from roll_checkpoint import SimulationCheckpoint, DEFAULT_CHECKPOINT_DIR as SIM_CHECKPOINT_DIR
+from roll_log import RollLogWriter, shard_path, clear_shards, DEFAULT_LOG_DIR as SIM_LOG_DIR
+from roll_stats import RollStats, format_stats
+from screen_sampler import get_sampler
 
-# Note: GPU acceleration isn't applicable for this simulation as it's dominated by
-# random number generation and branching logic which CPUs handle more efficiently.
-# Multiprocessing across CPU cores provides the best performance for this workload.
+# Note: the simulation is vectorized with NumPy (roll_sim.py) and split across CPU cores.
+# Per-roll logs are written as compressed binary shards and formatted on demand (roll_log.py).
+# Distribution statistics are streamed per chunk and merged at the end (roll_stats.py).
 
-tier_thresholds = []
-quantity_thresholds = []
 stars = 0.00
 rarest = 100.00
 name = "1 × T1"
@@ -23,7 +25,6 @@ start = time.time()
 count = 0
 c = Controller()
 mouse = MouseController()
-sct = mss.mss()
 running = True
 paused = False
 step_mode = False
@@ -32,6 +33,13 @@ esc_press_count = 0
 load = False
 load_save = True  # Set to False to wipe save and start fresh, True to load existing save
 simulate_count = 50000  # Number of rolls to simulate before stopping
+sim_seed = None  # Fixed seed for a reproducible simulation (None = random, printed at start)
+progress_report_interval = 2  # Seconds between simulation progress lines
+checkpoint_interval = 30  # Seconds between simulation checkpoints (an interrupted simulation resumes on restart)
+sim_progress = None  # Shared progress counters (set in simulation workers)
+log_simulation = True  # Stream every simulated roll to compressed shards in rollbotsim_logs/ (see roll_log.py)
+sim_stats_window = 100  # Rolls per window for the stars-per-window quantiles
+sim_top_k = 10  # Number of rarest simulated rolls to report
 firefox = False  # Set to True if using Firefox, False for other browsers
 MONITOR_INDEX = 1  # Adjust if needed
 SCALE = 2  # 2 on Retina displays (macOS); 1 on standard displays
@@ -109,11 +117,11 @@ with open("rollbotlog.txt", "w") as f:
     f.write("")
 
 # Screen detection functions (from arrasbot.py)
+# Probes share one cached capture of the status pixels (screen_sampler.py)
+STATUS_REGION = (26, 925, 3, 6)  # Covers (26, 930) for Firefox and (28, 925) for other browsers
+
 def get_pixel_rgb(x, y):
-    bbox = {"top": int(y), "left": int(x), "width": 1, "height": 1}
-    img = sct.grab(bbox)
-    pixel = np.array(img.pixel(0, 0))
-    return tuple(int(v) for v in pixel[:3])
+    return get_sampler(region=STATUS_REGION).pixel(x, y)
 
 def color_close(c1, c2, tol=6):
     # tolerant RGB compare
@@ -172,15 +180,6 @@ def check_and_respawn():
     
     return False
 
-# scientific notation formatter
-def format_number(num):
-    """Format large numbers as x×10^y, otherwise return as-is"""
-    if num >= 1000:
-        exponent = int(math.log10(num))
-        mantissa = num / (10 ** exponent)
-        return f"{mantissa:.2f}×10^{exponent}"
-    return str(round(num, 2))
-
 # time formatter
 def format_time(seconds):
     """Format elapsed time as DD:HH:MM:SS"""
@@ -238,161 +237,75 @@ def on_press(key):
 listener = Listener(on_press=on_press)
 listener.start()
 
-# generate thresholds
+# Roll game definition shared with rollbot2.py and the simulator (see roll_rules.py)
 # tiers: each tier has a 1/3 chance of being rolled compared to the previous tier
 # quantities: each quantity has a 1/6 chance of being rolled
+rules = RollRules(tier_base=3, tier_count=32, quantity_base=6, quantity_count=5)
+
+
+def rarest_roll_stars(roll_name):
+    """Base stars of a roll named like '3 × T12'"""
+    quantity, tier = roll_name.split(' × T')
+    return round(rules.base_stars(int(tier), int(quantity)), 2)
+
+def simulate_worker(chunk_id, roll_offset, num_rolls, seed, start_tier, start_combo, rules):
+    """Worker function to simulate one chunk of the roll stream (vectorized, see roll_sim.py)"""
+    checkpoint = SimulationCheckpoint(SIM_CHECKPOINT_DIR)
+    saved = checkpoint.load_chunk(chunk_id)
+    state, log_bytes, stats = None, 0, None
+    if saved:
+        state, done, log_bytes, stats = saved
+        sim_progress[chunk_id] = state.rolls - roll_offset  # Count rolls finished before the interruption
+        if done:
+            result = state.to_result()
+            result['stats'] = stats
+            return result
+    if stats is None:
+        # Bounded-memory distribution statistics for this chunk (merged by the parent)
+        stats = RollStats(rules.tier_count, roll_offset, sim_stats_window, sim_top_k)
+
+    sim = rules.simulator()
+    # Stream every roll to this chunk's log shard as it goes (formatted later by roll_log.py)
+    log_writer = None
+    if log_simulation:
+        log_path = shard_path(SIM_LOG_DIR, chunk_id)
+        # A resumed chunk without its shard (logging was off at the checkpoint, or the file is gone)
+        # starts a new shard at the first roll that is still to be simulated
+        first_roll = state.rolls if state is not None and not (log_bytes and os.path.exists(log_path)) else roll_offset
+        log_writer = RollLogWriter(log_path, first_roll, resume_bytes=log_bytes)
+    last_checkpoint = time.time()
+
+    def on_batch(batch, state):
+        nonlocal last_checkpoint
+        if log_writer:
+            log_writer.write_batch(batch)
+        stats.update(batch, state.rolls - len(batch['tier']))
+        # Publish rolls done so far (this chunk's slot has no other writer, so no lock needed)
+        sim_progress[chunk_id] = state.rolls - roll_offset
+        # Periodically checkpoint so an interrupted run can resume here
+        if time.time() - last_checkpoint >= checkpoint_interval:
+            checkpoint.save_chunk(chunk_id, state, False, log_writer.flush() if log_writer else 0, stats)
+            last_checkpoint = time.time()
 
-def build_thresholds(base, count):
-    """
-    base: the denominator base (3 for tiers, 6 for quantities)
-    count: how many items (32 tiers, 5 quantities)
-    
-    Returns:
-        (cumulative thresholds, normalized weights)
-    """
-    # Step 1: raw weights
-    weights = [(1 / (base ** i)) for i in range(count)]
-    
-    # Step 2: normalize
-    total = sum(weights)
-    normalized_weights = [w / total for w in weights]
-    
-    # Step 3: cumulative thresholds
-    cumulative = []
-    running = 0
-    for w in normalized_weights:
-        running += w
-        cumulative.append(running)
-    
-    return cumulative, normalized_weights
-
-
-# Build thresholds using the new function
-tier_thresholds, tier_weights = build_thresholds(base=3, count=32)
-quantity_thresholds, quantity_weights = build_thresholds(base=6, count=5)
-
-
-def weighted_roll(thresholds):
-    """
-    thresholds: cumulative probability list
-    Returns: index (0-based) of selected item
-    """
-    r = random.random()
-    for i, t in enumerate(thresholds):
-        if r < t:
-            return i
-    return len(thresholds) - 1  # fallback (should never hit)
-
-def format_rarity(chance):
-    """Safely format rarity as '1 in X', handling very small chances"""
-    if chance <= 0:
-        return "∞"
-    rarity = 100 / chance
-    if rarity >= 1000:  # Use scientific notation for large rarities (1 in 1000+)
-        return format_number(rarity)
-    return str(round(rarity, 3))
-
-def format_chance(chance):
-    """Format chance percentage with scientific notation for very small values"""
-    if chance <= 0:
-        return "0 (≈0)"
-    if chance < 0.001:  # Use scientific notation for very small percentages
-        exponent = int(math.floor(math.log10(chance)))
-        mantissa = chance / (10 ** exponent)
-        return f"{mantissa:.3f}×10^{exponent}"
-    return f"{chance:.6f}" if chance < 0.01 else f"{round(chance, 3)}"
-
-def simulate_worker(worker_id, num_rolls, tier_thresholds, tier_weights, quantity_thresholds, quantity_weights, progress_queue, roll_offset):
-    """Worker function to simulate rolls in parallel"""
-    # Set unique random seed for this worker
-    random.seed(int(time.time() * 1000) + worker_id * 12345)
-    
-    # Local tracking variables
-    local_tier_data = [0 for _ in range(32)]
-    local_tier_stars = [0.0 for _ in range(32)]
-    local_tier_roll_count = [0 for _ in range(32)]
-    local_stars = 0.0
-    local_rarest = 100.0
-    local_name = "1 × T1"
-    local_index = 0
-    local_last_tier = 0
-    local_combo_quantity = 0
-    local_highest_combo_quantity = 0
-    local_highest_combo_tier = 0
-    local_roll_logs = []  # Collect log entries for each roll
-    
-    for i in range(num_rolls):
-        tier = weighted_roll(tier_thresholds) + 1
-        quantity = weighted_roll(quantity_thresholds) + 1
-        
-        # Track previous combo for this roll
-        previous_combo_quantity = 0
-        if tier == local_last_tier:
-            previous_combo_quantity = local_combo_quantity
-            local_combo_quantity += quantity
-        else:
-            previous_combo_quantity = 0
-            local_combo_quantity = quantity
-            local_last_tier = tier
-        
-        # Track highest combo
-        if local_combo_quantity > local_highest_combo_quantity:
-            local_highest_combo_quantity = local_combo_quantity
-            local_highest_combo_tier = tier
-        
-        tier_prob = tier_weights[tier - 1]
-        quantity_prob = quantity_weights[quantity - 1]
-        chance = tier_prob * quantity_prob * 100  # Keep full precision, don't round
-        base_gained = quantity * round(3.5 ** tier, 2) - 2.5
-        
-        # Apply combo bonus: 40% per quantity in previous combo
-        combo_bonus = previous_combo_quantity * 0.4 * base_gained if previous_combo_quantity > 0 else 0
-        gained = base_gained + combo_bonus
-        
-        local_stars += gained
-        
-        if chance < local_rarest:
-            local_rarest = chance
-            local_name = f"{quantity} × T{tier}"
-            local_index = i
-        
-        local_tier_data[tier - 1] += quantity
-        local_tier_stars[tier - 1] += gained
-        local_tier_roll_count[tier - 1] += 1
-        
-        # Format log entry (same as normal rolling loop)
-        if previous_combo_quantity > 0:
-            combo_display = f"(+{previous_combo_quantity}/{local_combo_quantity}) {quantity} × T{tier}"
-            bonus_display = f" [+{round(combo_bonus, 2)}]"
-        else:
-            combo_display = f"{quantity} × T{tier}"
-            bonus_display = ""
-        
-        if chance < 0.0001:
-            info = f"{combo_display} | R%: 1 in {format_rarity(chance)} | {round(gained, 2)} ★{bonus_display}"
-        else:
-            info = f"{combo_display} | R%: {format_chance(chance)}% (1 in {format_rarity(chance)}) | {round(gained, 2)} ★{bonus_display}"
-        
-        # Add to log with global roll number
-        local_roll_logs.append(f"Roll {roll_offset + i + 1}: {info}")
-        
-        # Report progress periodically
-        if (i + 1) % max(1, num_rolls // 10) == 0:
-            progress_queue.put(1)
-    
-    return {
-        'tier_data': local_tier_data,
-        'tier_stars': local_tier_stars,
-        'tier_roll_count': local_tier_roll_count,
-        'stars': local_stars,
-        'rarest': local_rarest,
-        'name': local_name,
-        'index': local_index,
-        'highest_combo_quantity': local_highest_combo_quantity,
-        'highest_combo_tier': local_highest_combo_tier,
-        'roll_logs': local_roll_logs
-    }
-
+    try:
+        # Chunk starts with the exact combo left open by everything before it
+        state = simulate_chunk(sim, seed, roll_offset, num_rolls, start_tier, start_combo,
+                               batch_size=min(DEFAULT_BATCH, max(1, num_rolls // 10)), on_batch=on_batch, state=state)
+    finally:
+        if log_writer:
+            log_writer.close()
+    stats.finish()
+    checkpoint.save_chunk(chunk_id, state, True, stats=stats)
+    result = state.to_result()
+    result['stats'] = stats
+    return result
+
+
+def init_sim_worker(progress):
+    """Pool initializer: share the progress counters and leave Ctrl+C to the parent (workers would save stale globals)"""
+    global sim_progress
+    sim_progress = progress
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
 
 if __name__ == '__main__':
     # get data from file
@@ -454,91 +367,112 @@ if __name__ == '__main__':
             print(f"Using {num_cores} CPU cores for parallel simulation")
             sim_start = time.time()
             
-            # Split work across cores
-            rolls_per_worker = simulate_count // num_cores
-            remaining_rolls = simulate_count % num_cores
+            # Split the roll stream into fixed chunks; results don't depend on core count
+            checkpoint = SimulationCheckpoint(SIM_CHECKPOINT_DIR)
+            fingerprint = rules.fingerprint()
+            manifest = checkpoint.load_manifest()
+            if (manifest and manifest['simulate_count'] == simulate_count and manifest['chunk_rolls'] == CHUNK_ROLLS
+                    and manifest['base_count'] == count and manifest['fingerprint'] == fingerprint
+                    and manifest['last_tier'] == last_tier and manifest['combo_quantity'] == combo_quantity
+                    and (sim_seed is None or manifest['seed'] == sim_seed)):
+                # Interrupted run of this same simulation: resume from its checkpoint
+                seed = manifest['seed']
+                print(f"♻️  Resuming simulation from checkpoint (seed {seed})")
+            else:
+                seed = sim_seed if sim_seed is not None else int(np.random.SeedSequence().entropy)
+                print(f"Simulation seed: {seed}")
+                checkpoint.start(seed, simulate_count, CHUNK_ROLLS, count, last_tier, combo_quantity, fingerprint)
+                if log_simulation:
+                    clear_shards(SIM_LOG_DIR)
+            sim = rules.simulator()
+            chunks = plan_chunks(simulate_count)
+            # Exact expectation for this run, to check the Monte Carlo result against
+            expected_stars = rules.economics().expected_stars(simulate_count, last_tier, combo_quantity).sum()
+            # Combo entering each chunk (starting from the saved combo state)
+            carries = chunk_carries(sim, seed, chunks, last_tier, combo_quantity)
             
-            # Create progress queue and manager
-            manager = multiprocessing.Manager()
-            progress_queue = manager.Queue()
+            # Shared-memory progress counters, one slot per chunk (rolls done)
+            progress = multiprocessing.RawArray('q', len(chunks))
             
             # Create worker pool
-            with multiprocessing.Pool(processes=num_cores) as pool:
+            with multiprocessing.Pool(processes=min(num_cores, len(chunks)), initializer=init_sim_worker, initargs=(progress,)) as pool:
                 # Launch workers
                 worker_args = []
-                current_offset = 0
-                for worker_id in range(num_cores):
-                    num_rolls = rolls_per_worker + (1 if worker_id < remaining_rolls else 0)
-                    worker_args.append((worker_id, num_rolls, tier_thresholds, tier_weights, 
-                                       quantity_thresholds, quantity_weights, progress_queue, current_offset))
-                    current_offset += num_rolls
+                for chunk_id, ((roll_offset, num_rolls), (start_tier, start_combo)) in enumerate(zip(chunks, carries)):
+                    worker_args.append((chunk_id, roll_offset, num_rolls, seed, start_tier, start_combo, rules))
                 
                 # Start async workers
-                print("Launching workers...")
+                print(f"Launching workers for {len(chunks)} chunk(s)...")
                 results_async = pool.starmap_async(simulate_worker, worker_args)
                 
-                # Monitor progress
-                total_progress = 0
-                progress_interval = max(1, simulate_count // 1000)
+                # Monitor progress by polling the shared counters
+                rate_start_time = None
                 while not results_async.ready():
-                    try:
-                        progress_queue.get(timeout=0.1)
-                        total_progress += rolls_per_worker // 10
-                        if total_progress % progress_interval < (rolls_per_worker // 10):
-                            print(f"Simulation progress: ~{total_progress}/{simulate_count} rolls (~{total_progress*100//simulate_count}%)")
-                    except:
-                        pass
+                    results_async.wait(progress_report_interval)
+                    total_progress = sum(progress)
+                    if rate_start_time is None:
+                        # First sample includes rolls restored from a checkpoint; measure the rate from here
+                        rate_start_time, rate_start_rolls = time.time(), total_progress
+                        continue
+                    elapsed = time.time() - rate_start_time
+                    rate = (total_progress - rate_start_rolls) / elapsed if elapsed > 0 else 0
+                    eta = format_time((simulate_count - total_progress) / rate) if rate > 0 else "--:--:--:--"
+                    print(f"Simulation progress: {total_progress}/{simulate_count} rolls ({total_progress*100//simulate_count}%) | {format_number(rate)} rolls/s | ETA {eta}")
                 
-                # Get results
+                # Get results (in chunk order)
                 results = results_async.get()
             
-            # Aggregate results from all workers
+            # Aggregate results in stream order, as a sequential run would
             print("Aggregating results from workers...")
-            all_roll_logs = []
-            for result in results:
-                for i in range(32):
-                    tier_data[i] += result['tier_data'][i]
-                    tier_stars[i] += result['tier_stars'][i]
-                    tier_roll_count[i] += result['tier_roll_count'][i]
-                
-                stars += result['stars']
-                
-                # Collect roll logs from this worker
-                all_roll_logs.extend(result['roll_logs'])
-                
-                # Track global rarest
-                if result['rarest'] < rarest:
-                    rarest = result['rarest']
-                    name = result['name']
-                    index = count + result['index']
-                
-                # Track global highest combo
-                if result['highest_combo_quantity'] > highest_combo_quantity:
-                    highest_combo_quantity = result['highest_combo_quantity']
-                    highest_combo_tier = result['highest_combo_tier']
+            merged = merge_results(results)
+            sim_stats = results[0]['stats']
+            for result in results[1:]:
+                sim_stats.merge(result['stats'])
+            stats_lines = format_stats(sim_stats.summary(), format_number, format_chance, format_rarity)
+            for i in range(32):
+                tier_data[i] += merged['tier_data'][i]
+                tier_stars[i] += merged['tier_stars'][i]
+                tier_roll_count[i] += merged['tier_roll_count'][i]
+            
+            stars += merged['stars']
+            
+            # Track global rarest
+            if merged['rarest'] < rarest:
+                rarest = merged['rarest']
+                name = merged['name']
+                index = count + merged['index']
+            
+            # Track global highest combo
+            if merged['highest_combo_quantity'] > highest_combo_quantity:
+                highest_combo_quantity = merged['highest_combo_quantity']
+                highest_combo_tier = merged['highest_combo_tier']
             
-            count = simulate_count
+            # Live rolling continues the combo the simulation left open
+            last_tier = merged['last_tier']
+            combo_quantity = merged['combo_quantity']
+            count += simulate_count
 
             
             sim_time = time.time() - sim_start
             print(f"=== Simulation complete in {format_time(sim_time)} ===")
             print(f"Total stars: {format_number(stars)} ★")
+            print(f"Expected from simulation: {format_number(expected_stars)} ★ (analytic, got {format_number(merged['stars'])} ★)")
             print(f"Rarest roll: {name} | R%: {format_chance(rarest)}% (1/{format_rarity(rarest)})")
 
             stars = round(stars, 2)
             
-            # Write all roll logs and summary to rollbotsimlog.txt
-            print("Writing simulation logs...")
+            # Write summary to rollbotsimlog.txt (per-roll lines live in the log shards)
+            print("Writing simulation summary...")
             with open("/Users/alexoh/Documents/GitHub/arrastools/««««« CORE »»»»»/rollbotsimlog.txt", "w") as simlog:
-                # Write individual roll logs
-                for log_entry in all_roll_logs:
-                    simlog.write(log_entry + "\n")
+                if log_simulation:
+                    simlog.write(f"Per-roll log: {SIM_LOG_DIR} (view or export with: python roll_log.py --export rolls.txt)\n")
                 
                 # Write summary statistics
                 simlog.write(f"\n=== Simulation Results ===\n")
                 simlog.write(f"{count} rolls | {stars} ★ | Uptime: {format_time(sim_time)}\n")
+                simlog.write(f"Simulated {simulate_count} rolls: {round(merged['stars'], 2)} ★ (analytic expectation {round(expected_stars, 2)} ★)\n")
                 simlog.write(f"Rarest so far: {name} | R%: {format_chance(rarest)}% (1/{format_rarity(rarest)})\n")
-                simlog.write(f"Rarest roll ({index + 1}/{count}) gained {round(round(3.5 ** (int(name.split('× T')[1])), 3)*int(name.split('× T')[0]) - 2.5, 2)} ★\n")
+                simlog.write(f"Rarest roll ({index + 1}/{count}) gained {rarest_roll_stars(name)} ★\n")
                 simlog.write(f"Highest combo: {highest_combo_quantity} × T{highest_combo_tier} | Current: {combo_quantity} × T{last_tier}\n")
                 simlog.write(f"\n=== Tier Breakdown after {count} rolls ===\n")
                 
@@ -562,12 +496,16 @@ if __name__ == '__main__':
                     
                     # Show all tiers (including 0 rolls) up to max tier
                     simlog.write(f"T{tier_num}: {format_number(tier_star_total)} ★ ({percentage:.4f}%) | {tier_rolls} rolls\n")
+                
+                simlog.write(f"\n=== Distribution of the {simulate_count} simulated rolls ===\n")
+                for line in stats_lines:
+                    simlog.write(line + "\n")
             
             # Show detailed statistics after simulation (console)
             print(f"\n--- Simulation Statistics ---")
             print(f"{count} rolls | {stars} ★ | Uptime: {format_time(sim_time)}")
             print(f"Rarest so far: {name} | R%: {format_chance(rarest)}% (1/{format_rarity(rarest)})")
-            print(f"Rarest roll ({index + 1}/{count}) gained {round(round(3.5 ** (int(name.split('× T')[1])), 3)*int(name.split('× T')[0]) - 2.5, 2)} ★")
+            print(f"Rarest roll ({index + 1}/{count}) gained {rarest_roll_stars(name)} ★")
             print(f"Highest combo: {highest_combo_quantity} × T{highest_combo_tier} | Current: {combo_quantity} × T{last_tier}")
             
             # Show tier breakdown after simulation (console)
@@ -587,7 +525,12 @@ if __name__ == '__main__':
                 
                 # Show all tiers (including 0 rolls) up to max tier
                 print(f"T{tier_num}: {format_number(tier_star_total)} ★ ({percentage:.4f}%) | {tier_rolls} rolls")
-            
+
+            # Distribution statistics (roll numbers count from the start of this simulation)
+            print(f"\n=== Distribution of the {simulate_count} simulated rolls ===")
+            for line in stats_lines:
+                print(line)
+
             # Type stats and breakdown in-game after simulation
             print("Typing simulation results in-game...")
             c.tap(Key.enter)
@@ -604,7 +547,7 @@ if __name__ == '__main__':
             time.sleep(2.5)
             c.tap(Key.enter)
             time.sleep(0.1)
-            type2(f"Rarest roll ({index + 1}/{count}) gained {round(round(3.5 ** (int(name.split('× T')[1])), 3)*int(name.split('× T')[0]) - 2.5, 2)} 2.1385%) | 33335 ★")
+            type2(f"Rarest roll ({index + 1}/{count}) gained {rarest_roll_stars(name)} ★")
             time.sleep(0.1)
             c.tap(Key.enter)
             time.sleep(2.5)
@@ -648,6 +591,7 @@ if __name__ == '__main__':
                 save_file.write(f"{highest_combo_quantity},{highest_combo_tier}\n")
                 save_file.write(f"{last_tier},{combo_quantity}\n")
             print("✅ Simulation data saved")
+            checkpoint.clear()  # Results are in the save file; nothing left to resume
             
             print(f"\nStarting normal operation...\n")
             time.sleep(2)
@@ -668,35 +612,16 @@ if __name__ == '__main__':
                 time.sleep(2)  # Brief pause after respawn
                 continue  # Skip this roll cycle, proceed to next
             
-            tier = weighted_roll(tier_thresholds) + 1
-            quantity = weighted_roll(quantity_thresholds) + 1
-
-            # Update combo - track cumulative quantity for same tier
-            previous_combo_quantity = 0
-            if tier == last_tier:
-                previous_combo_quantity = combo_quantity
-                combo_quantity += quantity
-            else:
-                combo_quantity = quantity
-                last_tier = tier
+            # Roll and apply the combo rule (tracks cumulative quantity for same tier)
+            roll = rules.roll(last_tier, combo_quantity)
+            tier, quantity, chance, gained = roll['tier'], roll['quantity'], roll['chance'], roll['gained']
+            last_tier = tier
+            combo_quantity = roll['combo']
             
             # Track highest combo by quantity
             if combo_quantity > highest_combo_quantity:
                 highest_combo_quantity = combo_quantity
                 highest_combo_tier = tier
-
-            # format:
-            # rolled quantity tier | chance of getting (multiply tier chance and quantity) | total stars
-            # tier n gives int(1.5^(n)) stars each
-            # calculate chance using ACTUAL normalized weights
-            tier_prob = tier_weights[tier - 1]  # tier is 1-indexed, weights are 0-indexed
-            quantity_prob = quantity_weights[quantity - 1]  # quantity is 1-indexed, weights are 0-indexed
-            chance = tier_prob * quantity_prob * 100  # Keep full precision
-            base_gained = quantity * round(3.5 **tier, 2) - 2.5
-            
-            # Apply combo bonus: 40% per quantity in previous combo
-            combo_bonus = previous_combo_quantity * 0.4 * base_gained if previous_combo_quantity > 0 else 0
-            gained = base_gained + combo_bonus
             
             stars += gained
             if chance < rarest:
@@ -705,20 +630,7 @@ if __name__ == '__main__':
                 index = count
 
             # Format with combo if applicable (show previous total / new total combo)
-            if previous_combo_quantity > 0:
-                combo_display = f"(+{previous_combo_quantity}/{combo_quantity}) {quantity} × T{tier}"
-                bonus_display = f" [+{round(combo_bonus, 2)}]"
-            else:
-                combo_display = f"{quantity} × T{tier}"
-                bonus_display = ""
-            
-            # Format rarity - use scientific notation for very small chances
-            rarity_value = 100 / chance if chance > 0 else float('inf')
-            if chance < 0.0001:
-                # For very rare rolls (< 0.0001%), only show "1 in X" format
-                info = f"{combo_display} | R%: 1 in {format_rarity(chance)} | {round(gained, 2)} ★{bonus_display}"
-            else:
-                info = f"{combo_display} | R%: {format_chance(chance)}% (1 in {format_rarity(chance)}) | {round(gained, 2)} ★{bonus_display}"
+            info = format_roll(roll)
             
             print(f"Roll {count + 1}: {info}")
             log.write(info + "\n")
@@ -776,7 +688,7 @@ if __name__ == '__main__':
                 pausable_sleep(2.5)
                 c.tap(Key.enter)
                 pausable_sleep(0.1)
-                type2(f"Rarest roll ({index + 1}/{count}) gained {round(round(3.5 ** (int(name.split('× T')[1])), 3)*int(name.split('× T')[0]) - 2.5, 2)} ★")
+                type2(f"Rarest roll ({index + 1}/{count}) gained {rarest_roll_stars(name)} ★")
                 pausable_sleep(0.1)
                 c.tap(Key.enter)
                 pausable_sleep(2.5)
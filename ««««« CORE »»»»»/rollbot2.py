@@ -1,8 +1,11 @@
 from playwright.sync_api import sync_playwright
-from PIL import Image
-import io, time, random, math, sys, signal, multiprocessing, os
+import time, sys, signal, os
 from pathlib import Path
 from pynput.keyboard import Key, Listener
+import numpy as np
+from roll_rules import RollRules, format_number, format_rarity, format_chance, format_roll
+from roll_sim import RollState, stream_rng
+from screen_sampler import ScreenSampler, PlaywrightPageSource
 
 # Mapping from pynput Key to Playwright key strings
 KEY_MAP = {
@@ -34,11 +37,10 @@ KEY_MAP = {
 CORE_DIR = Path(__file__).parent
 load_save = True  # Set to False to wipe save and start fresh, True to load existing save
 simulate_count = 50000  # Number of rolls to simulate before stopping
+STATUS_REGION = (28, 925, 1, 1)  # Status pixel probed by check_and_respawn (captured alone, not the whole page)
 
 # Global state
 tier_data = [0 for _ in range(32)]
-tier_thresholds = []
-quantity_thresholds = []
 stars = 0.00
 rarest = 100.00
 name = "1 × T1"
@@ -87,14 +89,6 @@ def signal_handler(sig, frame):
 
 signal.signal(signal.SIGINT, signal_handler)
 
-def format_number(num):
-    """Format large numbers as x×10^y"""
-    if num >= 1000:
-        exponent = int(math.log10(num))
-        mantissa = num / (10 ** exponent)
-        return f"{mantissa:.2f}×10^{exponent}"
-    return str(round(num, 2))
-
 def format_time(seconds):
     """Format elapsed time as DD:HH:MM:SS"""
     days = int(seconds // 86400)
@@ -103,45 +97,6 @@ def format_time(seconds):
     secs = int(seconds % 60)
     return f"{days:02d}:{hours:02d}:{minutes:02d}:{secs:02d}"
 
-def format_rarity(chance):
-    """Safely format rarity as '1 in X'"""
-    if chance <= 0:
-        return "∞"
-    rarity = 100 / chance
-    if rarity >= 1000:
-        return format_number(rarity)
-    return str(round(rarity, 3))
-
-def format_chance(chance):
-    """Format chance percentage with scientific notation for very small values"""
-    if chance <= 0:
-        return "0 (≈0)"
-    if chance < 0.001:
-        exponent = int(math.floor(math.log10(chance)))
-        mantissa = chance / (10 ** exponent)
-        return f"{mantissa:.3f}×10^{exponent}"
-    return f"{chance:.6f}" if chance < 0.01 else f"{round(chance, 3)}"
-
-def build_thresholds(base, count):
-    """Build cumulative thresholds and normalized weights"""
-    weights = [(1 / (base ** i)) for i in range(count)]
-    total = sum(weights)
-    normalized_weights = [w / total for w in weights]
-    cumulative = []
-    running_sum = 0
-    for w in normalized_weights:
-        running_sum += w
-        cumulative.append(running_sum)
-    return cumulative, normalized_weights
-
-def weighted_roll(thresholds):
-    """Returns index (0-based) of selected item"""
-    r = random.random()
-    for i, t in enumerate(thresholds):
-        if r < t:
-            return i
-    return len(thresholds) - 1
-
 def pausable_sleep(duration):
     """Sleep for duration seconds, checking pause state"""
     elapsed = 0
@@ -172,8 +127,8 @@ def on_press(key):
         elif esc_press_count == 1 and step_mode:
             pass
 
-tier_thresholds, tier_weights = build_thresholds(base=3, count=32)
-quantity_thresholds, quantity_weights = build_thresholds(base=6, count=5)
+# Roll game definition shared with rollbot.py and the simulator (see roll_rules.py)
+rules = RollRules(tier_base=3, tier_count=32, quantity_base=6, quantity_count=5)
 
 class ChromePageController:
     def __init__(self, url: str, headless: bool = False):
@@ -196,6 +151,8 @@ class ChromePageController:
 
         self.page = self.context.new_page()
         self.page.goto(url)
+        # Pixel probes share one clipped screenshot per frame instead of a full screenshot each
+        self.sampler = ScreenSampler(PlaywrightPageSource(self.page), region=STATUS_REGION)
 
     # ------------------------
     # INPUT SIMULATION
@@ -241,10 +198,13 @@ class ChromePageController:
         """
         Returns (R, G, B) at page-relative coordinates
         """
-        screenshot_bytes = self.page.screenshot(full_page=False)
-        image = Image.open(io.BytesIO(screenshot_bytes))
-        pixel = image.getpixel((x, y))
-        return pixel[:3]  # RGB
+        return self.sampler.pixel(x, y)
+
+    def get_pixel_colors(self, points):
+        """
+        Returns (R, G, B) for each (x, y) page-relative point, all from one screenshot
+        """
+        return self.sampler.sample(points)
     
     def color_close(self, c1, c2, tol=6):
         """Tolerant RGB compare"""
@@ -368,42 +328,30 @@ if __name__ == "__main__":
         print(f"\n=== Starting simulation of {simulate_count} rolls ===")
         sim_start = time.time()
         
-        for i in range(simulate_count):
-            tier = weighted_roll(tier_thresholds) + 1
-            quantity = weighted_roll(quantity_thresholds) + 1
-            
-            previous_combo_quantity = 0
-            if tier == last_tier:
-                previous_combo_quantity = combo_quantity
-                combo_quantity += quantity
-            else:
-                combo_quantity = quantity
-                last_tier = tier
-            
-            if combo_quantity > highest_combo_quantity:
-                highest_combo_quantity = combo_quantity
-                highest_combo_tier = tier
-            
-            tier_prob = tier_weights[tier - 1]
-            quantity_prob = quantity_weights[quantity - 1]
-            chance = tier_prob * quantity_prob * 100
-            base_gained = quantity * round(3.5 ** tier, 2) - 2.5
-            combo_bonus = previous_combo_quantity * 0.4 * base_gained if previous_combo_quantity > 0 else 0
-            gained = base_gained + combo_bonus
-            
-            stars += gained
-            
-            if chance < rarest:
-                rarest = chance
-                name = f"{quantity} × T{tier}"
-                index = i
-            
-            tier_data[tier - 1] += quantity
-            tier_stars[tier - 1] += gained
-            tier_roll_count[tier - 1] += 1
-            
-            if (i + 1) % max(1, simulate_count // 10) == 0:
-                print(f"Progress: {i + 1}/{simulate_count} rolls ({(i+1)/simulate_count*100:.1f}%)")
+        # Vectorized simulation (roll_sim.py), continuing the saved combo
+        seed = int(np.random.SeedSequence().entropy)
+        state = RollState(rules.tier_count, last_tier, combo_quantity)
+        
+        def report(batch, state):
+            print(f"Progress: {state.rolls}/{simulate_count} rolls ({state.rolls/simulate_count*100:.1f}%)")
+        
+        rules.simulator().simulate(stream_rng(seed), simulate_count, state,
+                                   batch_size=max(1, simulate_count // 10), on_batch=report)
+        
+        for i in range(rules.tier_count):
+            tier_data[i] += int(state.tier_data[i])
+            tier_stars[i] += float(state.tier_stars[i])
+            tier_roll_count[i] += int(state.tier_roll_count[i])
+        stars += state.stars
+        if state.rarest < rarest:
+            rarest = state.rarest
+            name = state.name
+            index = state.index
+        if state.highest_combo_quantity > highest_combo_quantity:
+            highest_combo_quantity = state.highest_combo_quantity
+            highest_combo_tier = state.highest_combo_tier
+        last_tier = state.last_tier
+        combo_quantity = state.combo_quantity
         
         count = simulate_count
         sim_time = time.time() - sim_start
@@ -447,29 +395,16 @@ if __name__ == "__main__":
                 time.sleep(2)
                 continue
             
-            # Perform roll
-            tier = weighted_roll(tier_thresholds) + 1
-            quantity = weighted_roll(quantity_thresholds) + 1
-            
-            previous_combo_quantity = 0
-            if tier == last_tier:
-                previous_combo_quantity = combo_quantity
-                combo_quantity += quantity
-            else:
-                combo_quantity = quantity
-                last_tier = tier
+            # Perform roll (combo rule and stars from the shared rules)
+            roll = rules.roll(last_tier, combo_quantity)
+            tier, quantity, chance, gained = roll['tier'], roll['quantity'], roll['chance'], roll['gained']
+            last_tier = tier
+            combo_quantity = roll['combo']
             
             if combo_quantity > highest_combo_quantity:
                 highest_combo_quantity = combo_quantity
                 highest_combo_tier = tier
             
-            tier_prob = tier_weights[tier - 1]
-            quantity_prob = quantity_weights[quantity - 1]
-            chance = tier_prob * quantity_prob * 100
-            base_gained = quantity * round(3.5 ** tier, 2) - 2.5
-            combo_bonus = previous_combo_quantity * 0.4 * base_gained if previous_combo_quantity > 0 else 0
-            gained = base_gained + combo_bonus
-            
             stars += gained
             count += 1
             
@@ -483,17 +418,7 @@ if __name__ == "__main__":
             tier_roll_count[tier - 1] += 1
             
             # Log roll
-            if previous_combo_quantity > 0:
-                combo_display = f"(+{previous_combo_quantity}/{combo_quantity}) {quantity} × T{tier}"
-                bonus_display = f" [+{round(combo_bonus, 2)}]"
-            else:
-                combo_display = f"{quantity} × T{tier}"
-                bonus_display = ""
-            
-            if chance < 0.0001:
-                info = f"{combo_display} | R%: 1 in {format_rarity(chance)} | {round(gained, 2)} ★{bonus_display}"
-            else:
-                info = f"{combo_display} | R%: {format_chance(chance)}% (1 in {format_rarity(chance)}) | {round(gained, 2)} ★{bonus_display}"
+            info = format_roll(roll)
             
             print(f"Roll {count}: {info}")
             
@@ -0,0 +1,188 @@
+"""Shared screen sampler for pixel probes.
+
+Pixel checks used to capture the screen once per probed pixel (a 1x1 mss
+grab in rollbot.py, a whole Playwright screenshot in rollbot2.py).
+ScreenSampler captures one frame from a frame source, keeps it for a short
+TTL and answers batched sample([(x, y), ...]) queries from that frame:
+
+    sampler = ScreenSampler(MssFrameSource(logical=True), ttl=0.05, region=(0, 900, 64, 64))
+    status, hp = sampler.sample([(28, 925), (40, 950)])
+
+Frame sources (all return RGB uint8 arrays and accept an optional
+(left, top, width, height) region in source coordinates):
+
+- frame_diff.MssFrameSource: a monitor through persistent mss handles (use
+  logical=True so HiDPI captures are indexed in screen coordinates),
+- PlaywrightPageSource: the viewport of a Playwright page (one screenshot per frame),
+- FileFrameSource: an image or .npy file, reloaded when the file changes (a fake screen for tests).
+
+Points are absolute (screen or page) coordinates; the source's origin is
+subtracted. With a region, only that part of the screen is captured, which
+keeps probes cheap; points outside it are still answered (the capture grows
+to cover them). A TTL of 0 captures a fresh frame for every call.
+"""
+
+import io
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from frame_diff import MssFrameSource, Region
+
+DEFAULT_TTL = 0.05  # Seconds a captured frame answers probes
+
+Point = Tuple[int, int]
+RGB = Tuple[int, int, int]
+
+
+def _crop(frame: np.ndarray, region: Optional[Region]) -> np.ndarray:
+    if region is None:
+        return frame
+    left, top, width, height = region
+    return frame[top:top + height, left:left + width]
+
+
+class PlaywrightPageSource:
+    """Frames of a Playwright page's viewport."""
+
+    def __init__(self, page):
+        self.page = page
+        self.origin = (0, 0)
+
+    def grab(self, region: Optional[Region] = None) -> np.ndarray:
+        from PIL import Image
+        clip = None
+        if region is not None:
+            clip = {'x': region[0], 'y': region[1], 'width': region[2], 'height': region[3]}
+        png = self.page.screenshot(full_page=False, clip=clip)
+        with Image.open(io.BytesIO(png)) as img:
+            return np.asarray(img.convert('RGB'))
+
+    def close(self):
+        pass
+
+
+class FileFrameSource:
+    """A fake screen read from an image (PNG, ...) or .npy file, reloaded when its mtime changes."""
+
+    def __init__(self, path: Path, origin: Tuple[int, int] = (0, 0)):
+        self.path = Path(path)
+        self.origin = origin
+        self._mtime = None
+        self._frame: Optional[np.ndarray] = None
+        self.loads = 0
+
+    def grab(self, region: Optional[Region] = None) -> np.ndarray:
+        mtime = self.path.stat().st_mtime_ns
+        if mtime != self._mtime:
+            if self.path.suffix == ".npy":
+                self._frame = np.load(self.path)
+            else:
+                from PIL import Image
+                with Image.open(self.path) as img:
+                    self._frame = np.asarray(img.convert('RGB'))
+            self._mtime = mtime
+            self.loads += 1
+        return _crop(self._frame, region)
+
+    def close(self):
+        pass
+
+
+class ScreenSampler:
+    """Answers pixel probes from one cached frame per TTL."""
+
+    def __init__(self, source, ttl: float = DEFAULT_TTL, region: Optional[Region] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize sampler.
+
+        Args:
+            source: Frame source (MssFrameSource, PlaywrightPageSource, FileFrameSource)
+            ttl: Seconds a captured frame is reused (0 = capture on every call)
+            region: Absolute (left, top, width, height) to capture (None = the whole source)
+            clock: Time source (for tests)
+        """
+        self.source = source
+        self.ttl = ttl
+        self.region = region
+        self.clock = clock
+        self.lock = threading.Lock()
+        self._frame: Optional[np.ndarray] = None
+        self._frame_origin = (0, 0)  # Absolute position of the cached frame's top-left pixel
+        self._frame_time = 0.0
+        self.captures = 0
+        self.probes = 0
+
+    def invalidate(self):
+        """Drop the cached frame (the next probe captures)."""
+        with self.lock:
+            self._frame = None
+
+    def _covers(self, xs: np.ndarray, ys: np.ndarray) -> bool:
+        left, top = self._frame_origin
+        height, width = self._frame.shape[:2]
+        return bool(xs.min() >= left and ys.min() >= top and xs.max() < left + width and ys.max() < top + height)
+
+    def _capture(self, xs: np.ndarray, ys: np.ndarray):
+        ox, oy = self.source.origin
+        if self.region is None:
+            self._frame = self.source.grab()
+            self._frame_origin = (ox, oy)
+        else:
+            # Capture the configured region, grown to include every requested point
+            left, top, width, height = self.region
+            x0, y0 = min(left, int(xs.min())), min(top, int(ys.min()))
+            x1, y1 = max(left + width, int(xs.max()) + 1), max(top + height, int(ys.max()) + 1)
+            self._frame = self.source.grab((x0 - ox, y0 - oy, x1 - x0, y1 - y0))
+            self._frame_origin = (x0, y0)
+        self._frame_time = self.clock()
+        self.captures += 1
+
+    def sample(self, points: Iterable[Point]) -> List[RGB]:
+        """
+        RGB values of absolute points, all from the same frame.
+
+        Args:
+            points: (x, y) pairs
+
+        Returns:
+            (r, g, b) per point, in order
+        """
+        coords = np.asarray(list(points), dtype=np.int64).reshape(-1, 2)
+        if len(coords) == 0:
+            return []
+        xs, ys = coords[:, 0], coords[:, 1]
+        with self.lock:
+            if (self._frame is None or self.clock() - self._frame_time > self.ttl
+                    or not self._covers(xs, ys)):
+                self._capture(xs, ys)
+                if not self._covers(xs, ys):
+                    raise ValueError("Probed point outside the captured screen area")
+            frame, (left, top) = self._frame, self._frame_origin
+            self.probes += len(coords)
+        pixels = frame[ys - top, xs - left, :3]
+        return [tuple(int(v) for v in pixel) for pixel in pixels]
+
+    def pixel(self, x: int, y: int) -> RGB:
+        """RGB value of one absolute point."""
+        return self.sample([(x, y)])[0]
+
+    def close(self):
+        self.source.close()
+
+
+_default: Optional[ScreenSampler] = None
+_default_lock = threading.Lock()
+
+
+def get_sampler(monitor_index: int = 1, ttl: float = DEFAULT_TTL, region: Optional[Region] = None) -> ScreenSampler:
+    """The process-wide sampler of a monitor, created on first use (later arguments are ignored)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ScreenSampler(MssFrameSource(monitor_index, logical=True), ttl, region)
+        return _default
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Test script for the vectorized circle detector (synthetic images with known circles)."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from circle_detect import draw_circles, find_circles, fit_circles, label_runs
+
+BLUE = (0, 178, 225)
+RED = (241, 78, 84)
+GREEN = (0, 225, 110)
+
+
+def closest(circles, x, y):
+    return min(circles, key=lambda c: np.hypot(c.x - x, c.y - y))
+
+
+def test_single_disc():
+    """A filled disc is found at its centre and radius."""
+    print("Testing a single filled disc...")
+    image = draw_circles((640, 480), [(301.4, 222.7, 37, BLUE)])
+    circles = find_circles(image, color=BLUE)
+    assert len(circles) == 1, f"Expected 1 circle, got {len(circles)}"
+    c = circles[0]
+    assert np.hypot(c.x - 301.4, c.y - 222.7) < 1.0, f"Centre off: ({c.x:.1f}, {c.y:.1f})"
+    assert abs(c.radius - 37) < 2.0, f"Radius off: {c.radius:.1f}"
+    print(f"  ✓ ({c.x:.1f}, {c.y:.1f}) r={c.radius:.1f}")
+
+
+def test_several_colours():
+    """Foreground mask finds every circle; colour masks pick one."""
+    print("Testing several circles on a noisy background...")
+    truth = [(120, 100, 30, BLUE), (400, 300, 45, RED), (520, 90, 18, GREEN)]
+    image = draw_circles((640, 480), truth, noise=8)
+    circles = find_circles(image)
+    assert len(circles) == 3, f"Expected 3 circles, got {len(circles)}"
+    for x, y, radius, _ in truth:
+        c = closest(circles, x, y)
+        assert np.hypot(c.x - x, c.y - y) < 1.5 and abs(c.radius - radius) < 2.0, f"Missed circle at ({x}, {y})"
+    red = find_circles(image, color=RED)
+    assert len(red) == 1 and np.hypot(red[0].x - 400, red[0].y - 300) < 1.5, "Colour mask picked the wrong circle"
+    print(f"  ✓ {len(circles)} circles, largest r={circles[0].radius:.1f}")
+
+
+def test_ring_border():
+    """A circle drawn as a border only is found at its centre."""
+    print("Testing a ring border...")
+    image = draw_circles((400, 400), [(200, 180, 60, BLUE)], border=4)
+    circles = find_circles(image, color=BLUE)
+    assert len(circles) == 1, f"Expected 1 circle, got {len(circles)}"
+    c = circles[0]
+    assert np.hypot(c.x - 200, c.y - 180) < 1.0 and abs(c.radius - 58) < 3.0, f"Ring fit off: {c}"
+    print(f"  ✓ ({c.x:.1f}, {c.y:.1f}) r={c.radius:.1f}")
+
+
+def test_rejects_non_circles():
+    """Squares, bars and ellipses are not reported."""
+    print("Testing rejection of non-circular shapes...")
+    image = draw_circles((640, 480), [(500, 380, 40, BLUE)])
+    image[40:120, 40:120] = BLUE  # Square
+    image[300:320, 50:350] = BLUE  # Bar
+    yy, xx = np.mgrid[0:480, 0:640]
+    image[((xx - 450) / 80) ** 2 + ((yy - 120) / 40) ** 2 <= 1] = BLUE  # Ellipse
+    circles = find_circles(image, color=BLUE)
+    assert len(circles) == 1, f"Expected only the real circle, got {circles}"
+    assert np.hypot(circles[0].x - 500, circles[0].y - 380) < 1.0
+    print("  ✓ Only the circle kept")
+
+
+def test_radius_limits_and_empty():
+    """min_radius/max_radius filter, and an empty image finds nothing."""
+    print("Testing radius limits and empty images...")
+    image = draw_circles((640, 480), [(100, 100, 10, BLUE), (400, 240, 50, BLUE)])
+    assert len(find_circles(image, color=BLUE, min_radius=20)) == 1
+    assert len(find_circles(image, color=BLUE, max_radius=20)) == 1
+    assert find_circles(draw_circles((320, 240), []), color=BLUE) == []
+    assert find_circles(draw_circles((320, 240), [])) == []
+    print("  ✓ Limits applied")
+
+
+def brute_force_labels(mask):
+    """Reference 8-connected labeling by flood fill."""
+    labels = np.full(mask.shape, -1)
+    current = 0
+    for y, x in zip(*np.nonzero(mask)):
+        if labels[y, x] >= 0:
+            continue
+        stack = [(y, x)]
+        labels[y, x] = current
+        while stack:
+            cy, cx = stack.pop()
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    ny, nx = cy + dy, cx + dx
+                    if 0 <= ny < mask.shape[0] and 0 <= nx < mask.shape[1] and mask[ny, nx] and labels[ny, nx] < 0:
+                        labels[ny, nx] = current
+                        stack.append((ny, nx))
+        current += 1
+    return labels
+
+
+def test_labeling_matches_flood_fill():
+    """Run-based labeling partitions random masks exactly like a flood fill."""
+    print("Testing connected-component labeling against flood fill...")
+    rng = np.random.default_rng(1)
+    for density in (0.2, 0.45, 0.6):
+        mask = rng.random((60, 80)) < density
+        rows, starts, ends, labels = label_runs(mask)
+        image = np.full(mask.shape, -1)
+        for row, start, end, label in zip(rows, starts, ends, labels):
+            image[row, start:end] = label
+        reference = brute_force_labels(mask)
+        assert (image >= 0).sum() == mask.sum(), "Runs do not cover the mask"
+        pairs = set(zip(image[mask].tolist(), reference[mask].tolist()))
+        assert len(pairs) == len(set(image[mask].tolist())) == len(set(reference[mask].tolist())), \
+            f"Partition differs at density {density}"
+    print("  ✓ Identical partitions")
+
+
+def test_fit_circles_small():
+    """Small circles pass despite pixel steps."""
+    print("Testing small circles...")
+    yy, xx = np.mgrid[0:60, 0:60]
+    for radius in (3, 4, 6):
+        circles = fit_circles(np.hypot(xx - 30.3, yy - 29.6) <= radius, min_radius=1)
+        assert len(circles) == 1, f"Radius {radius} circle rejected"
+    print("  ✓ Radii 3, 4 and 6 found")
+
+
+def main():
+    print("=" * 60)
+    print("Circle Detector Test Suite")
+    print("=" * 60)
+    tests = [
+        test_single_disc,
+        test_several_colours,
+        test_ring_border,
+        test_rejects_non_circles,
+        test_radius_limits_and_empty,
+        test_labeling_matches_flood_fill,
+        test_fit_circles_small,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ FAILED: {e}")
+    print("=" * 60)
+    if failed:
+        print(f"❌ {failed} test(s) failed")
+        print("=" * 60)
+        return 1
+    print("✅ All tests passed")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Test script for the shared screen sampler (file-backed fake screen, fake clock)."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from screen_sampler import FileFrameSource, ScreenSampler
+
+WIDTH, HEIGHT = 200, 120
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_screen(seed=0):
+    """A screen whose pixel (x, y) encodes its coordinates (plus seed in blue)."""
+    yy, xx = np.mgrid[0:HEIGHT, 0:WIDTH]
+    return np.stack([xx % 256, yy % 256, np.full_like(xx, seed)], axis=2).astype(np.uint8)
+
+
+def write_screen(path, frame):
+    """Save a frame and bump the file's mtime so the source sees the change."""
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    np.save(path, frame)
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+def expected(x, y, seed=0, origin=(0, 0)):
+    return ((x - origin[0]) % 256, (y - origin[1]) % 256, seed)
+
+
+def test_ttl_reuse(path):
+    """Probes within the TTL share one capture; later probes capture again."""
+    print("Testing TTL reuse...")
+    clock = FakeClock()
+    sampler = ScreenSampler(FileFrameSource(path), ttl=0.05, clock=clock)
+    assert sampler.sample([(3, 4), (150, 90)]) == [expected(3, 4), expected(150, 90)]
+    clock.now += 0.04
+    assert sampler.pixel(10, 20) == expected(10, 20)
+    assert sampler.captures == 1, f"Expected 1 capture within TTL, got {sampler.captures}"
+    clock.now += 0.02
+    sampler.pixel(10, 20)
+    assert sampler.captures == 2, f"Expected a new capture after TTL, got {sampler.captures}"
+    sampler.invalidate()
+    sampler.pixel(10, 20)
+    assert sampler.captures == 3, "invalidate() did not force a capture"
+    assert sampler.probes == 5
+    assert sampler.sample([]) == []
+
+    zero = ScreenSampler(FileFrameSource(path), ttl=0, clock=clock)
+    zero.pixel(1, 1)
+    clock.now += 0.001
+    zero.pixel(1, 1)
+    assert zero.captures == 2, "TTL 0 should capture on every call"
+    print("  ✓ Captures reused within TTL")
+
+
+def test_region_growth(path):
+    """A region capture grows to cover probes outside it."""
+    print("Testing region capture and growth...")
+    clock = FakeClock()
+    sampler = ScreenSampler(FileFrameSource(path), ttl=1.0, region=(20, 30, 8, 6), clock=clock)
+    assert sampler.pixel(22, 31) == expected(22, 31)
+    assert sampler._frame.shape[:2] == (6, 8), f"Region capture has shape {sampler._frame.shape}"
+    assert sampler.sample([(21, 32), (150, 100)]) == [expected(21, 32), expected(150, 100)]
+    assert sampler.captures == 2, "Out-of-region probe should recapture"
+    assert sampler._frame_origin == (20, 30) and sampler._frame.shape[:2] == (71, 131), \
+        f"Grown capture origin {sampler._frame_origin}, shape {sampler._frame.shape}"
+    assert sampler.pixel(100, 60) == expected(100, 60)
+    assert sampler.captures == 2, "Probe inside the grown capture should reuse it"
+    print("  ✓ Capture grew to (20, 30, 131, 71)")
+
+
+def test_origin_and_out_of_bounds(path):
+    """Points are absolute (source origin subtracted); points off the screen raise ValueError."""
+    print("Testing source origin and out-of-screen probes...")
+    origin = (1000, 500)
+    sampler = ScreenSampler(FileFrameSource(path, origin=origin), ttl=1.0, clock=FakeClock())
+    assert sampler.pixel(1005, 507) == expected(1005, 507, origin=origin)
+    for point in [(5, 7), (1000 + WIDTH, 500), (1010, 500 + HEIGHT)]:
+        try:
+            sampler.pixel(*point)
+        except ValueError:
+            continue
+        raise AssertionError(f"No ValueError for {point}")
+
+    regional = ScreenSampler(FileFrameSource(path), ttl=1.0, region=(0, 0, 10, 10), clock=FakeClock())
+    try:
+        regional.pixel(WIDTH + 5, 5)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("No ValueError for a probe beyond the screen with a region")
+    print("  ✓ Origin applied, off-screen probes rejected")
+
+
+def test_reload_on_change(path):
+    """The file source reloads when the file changes, and only then."""
+    print("Testing reload on file change...")
+    clock = FakeClock()
+    source = FileFrameSource(path)
+    sampler = ScreenSampler(source, ttl=0.05, clock=clock)
+    assert sampler.pixel(7, 8) == expected(7, 8)
+    clock.now += 1.0
+    sampler.pixel(7, 8)
+    assert source.loads == 1, f"Unchanged file reloaded ({source.loads} loads)"
+    write_screen(path, make_screen(seed=42))
+    assert sampler.pixel(7, 8) == expected(7, 8), "Cached frame should still answer within the TTL"
+    clock.now += 1.0
+    assert sampler.pixel(7, 8) == expected(7, 8, seed=42), "Changed file not picked up"
+    assert source.loads == 2
+    write_screen(path, make_screen())
+    print("  ✓ Reloaded once after the change")
+
+
+def main():
+    print("=" * 60)
+    print("Screen Sampler Test Suite")
+    print("=" * 60)
+    tests = [
+        test_ttl_reuse,
+        test_region_growth,
+        test_origin_and_out_of_bounds,
+        test_reload_on_change,
+    ]
+    failed = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "screen.npy"
+        write_screen(path, make_screen())
+        for test in tests:
+            try:
+                test(path)
+            except AssertionError as e:
+                failed += 1
+                print(f"  ✗ FAILED: {e}")
+    print("=" * 60)
+    if failed:
+        print(f"❌ {failed} test(s) failed")
+        print("=" * 60)
+        return 1
+    print("✅ All tests passed")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
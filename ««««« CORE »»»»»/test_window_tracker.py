@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Test script for the event-driven X11 window tracker.
+
+Starts a private Xvfb server, creates windows with python-xlib and plays the
+window manager's part (setting _NET_ACTIVE_WINDOW, _NET_WM_NAME and
+_NET_WM_STATE), then checks that the tracker's cache follows each change.
+Skipped when Xvfb or python-xlib is not installed.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from x11_window_tracker import HAS_XLIB, X11WindowTracker
+
+if HAS_XLIB:
+    from Xlib import X, Xatom, display as xdisplay
+
+TIMEOUT = 2.0  # Seconds to wait for the tracker to see a change
+
+
+def start_xvfb():
+    """Start Xvfb on the first free display number; returns (process, display_name)."""
+    for number in range(90, 110):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}") or os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+        name = f":{number}"
+        proc = subprocess.Popen(['Xvfb', name, '-screen', '0', '1280x720x24', '-nolisten', 'tcp'],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.time() + 5.0
+        while time.time() < deadline:
+            if proc.poll() is not None:
+                break
+            try:
+                xdisplay.Display(name).close()
+                return proc, name
+            except Exception:
+                time.sleep(0.05)
+        proc.kill()
+        proc.wait()
+    raise RuntimeError("Could not start Xvfb")
+
+
+class FakeWindowManager:
+    """Creates windows and sets the EWMH properties a window manager would."""
+
+    def __init__(self, display_name):
+        self.display = xdisplay.Display(display_name)
+        self.root = self.display.screen().root
+        atom = self.display.intern_atom
+        self.NET_ACTIVE_WINDOW = atom('_NET_ACTIVE_WINDOW')
+        self.NET_WM_NAME = atom('_NET_WM_NAME')
+        self.NET_WM_STATE = atom('_NET_WM_STATE')
+        self.NET_WM_STATE_FULLSCREEN = atom('_NET_WM_STATE_FULLSCREEN')
+        self.UTF8_STRING = atom('UTF8_STRING')
+
+    def create(self, name, x, y, width, height):
+        window = self.root.create_window(x, y, width, height, 0, X.CopyFromParent)
+        window.change_property(self.NET_WM_NAME, self.UTF8_STRING, 8, name.encode())
+        window.map()
+        self.display.sync()
+        return window
+
+    def activate(self, window):
+        self.root.change_property(self.NET_ACTIVE_WINDOW, Xatom.WINDOW, 32, [window.id if window else 0])
+        self.display.sync()
+
+    def rename(self, window, name):
+        window.change_property(self.NET_WM_NAME, self.UTF8_STRING, 8, name.encode())
+        self.display.sync()
+
+    def set_fullscreen(self, window, fullscreen):
+        window.change_property(self.NET_WM_STATE, Xatom.ATOM, 32,
+                               [self.NET_WM_STATE_FULLSCREEN] if fullscreen else [])
+        self.display.sync()
+
+    def move(self, window, x, y, width, height):
+        window.configure(x=x, y=y, width=width, height=height)
+        self.display.sync()
+
+    def destroy(self, window):
+        window.destroy()
+        self.display.sync()
+
+    def close(self):
+        self.display.close()
+
+
+def wait_until(tracker, predicate):
+    """Wait for tracker events until predicate() holds (or TIMEOUT passes)."""
+    deadline = time.time() + TIMEOUT
+    while not predicate():
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return False
+        tracker.wait_for_change(min(remaining, 0.1))
+    return True
+
+
+def test_focus_changes(wm, tracker):
+    """Switching _NET_ACTIVE_WINDOW switches the tracked window."""
+    print("Testing focus changes...")
+    game = wm.create("arras.io - Chromium", 0, 0, 800, 600)
+    editor = wm.create("notes.txt - Editor", 100, 50, 400, 300)
+    wm.activate(game)
+    assert wait_until(tracker, lambda: tracker.get_active_window_info() == ("arras.io - Chromium", False)), \
+        f"Expected game window, got {tracker.get_active_window_info()}"
+    wm.activate(editor)
+    assert wait_until(tracker, lambda: tracker.get_active_window_info()[0] == "notes.txt - Editor"), \
+        f"Expected editor window, got {tracker.get_active_window_info()}"
+    wm.activate(None)
+    assert wait_until(tracker, lambda: tracker.get_active_window_info() == (None, False)), \
+        "Expected no active window"
+    wm.destroy(editor)
+    wm.destroy(game)
+    print("  ✓ Active window followed")
+
+
+def test_title_and_fullscreen(wm, tracker):
+    """Title and _NET_WM_STATE changes of the active window are picked up."""
+    print("Testing title and fullscreen changes...")
+    window = wm.create("Loading...", 0, 0, 640, 480)
+    wm.activate(window)
+    assert wait_until(tracker, lambda: tracker.get_active_window_info() == ("Loading...", False))
+    wm.rename(window, "arras.io")
+    assert wait_until(tracker, lambda: tracker.get_active_window_info() == ("arras.io", False)), \
+        f"Title not updated: {tracker.get_active_window_info()}"
+    wm.set_fullscreen(window, True)
+    assert wait_until(tracker, lambda: tracker.get_active_window_info() == ("arras.io", True)), \
+        "Fullscreen state not updated"
+    wm.set_fullscreen(window, False)
+    assert wait_until(tracker, lambda: tracker.get_active_window_info() == ("arras.io", False)), \
+        "Fullscreen state not cleared"
+    wm.destroy(window)
+    print("  ✓ Title and fullscreen followed")
+
+
+def test_geometry_and_destroy(wm, tracker):
+    """ConfigureNotify updates geometry; DestroyNotify drops the window."""
+    print("Testing geometry changes and window destruction...")
+    window = wm.create("arras.io", 10, 20, 300, 200)
+    wm.activate(window)
+    assert wait_until(tracker, lambda: tracker.active_window() is not None
+                      and tracker.active_window().window_id == window.id)
+    wm.move(window, 50, 60, 1280, 720)
+
+    def moved():
+        info = tracker.active_window()
+        return info is not None and (info.x, info.y, info.width, info.height) == (50, 60, 1280, 720)
+
+    assert wait_until(tracker, moved), f"Geometry not updated: {tracker.active_window()}"
+    wm.destroy(window)
+    assert wait_until(tracker, lambda: window.id not in tracker.windows), "Destroyed window still cached"
+    assert tracker.active_window() is None
+    print("  ✓ Geometry and destruction followed")
+
+
+def test_wait_for_change_times_out(wm, tracker):
+    """wait_for_change() returns False when nothing happens."""
+    print("Testing wait_for_change timeout...")
+    tracker.wait_for_change(0)  # Clear any pending change
+    start = time.time()
+    assert not tracker.wait_for_change(0.2), "Reported a change without one"
+    assert time.time() - start >= 0.15
+    print("  ✓ Timed out without events")
+
+
+def main():
+    print("=" * 60)
+    print("X11 Window Tracker Test Suite")
+    print("=" * 60)
+    if not HAS_XLIB or shutil.which('Xvfb') is None:
+        print("⚠️  Skipped: requires python-xlib and Xvfb")
+        print("=" * 60)
+        return 0
+
+    xvfb, display_name = start_xvfb()
+    wm = FakeWindowManager(display_name)
+    tracker = X11WindowTracker(display_name).start()
+    tests = [
+        test_focus_changes,
+        test_title_and_fullscreen,
+        test_geometry_and_destroy,
+        test_wait_for_change_times_out,
+    ]
+    failed = 0
+    try:
+        for test in tests:
+            try:
+                test(wm, tracker)
+            except AssertionError as e:
+                failed += 1
+                print(f"  ✗ FAILED: {e}")
+        print(f"Events handled: {tracker.events}")
+    finally:
+        tracker.stop()
+        wm.close()
+        xvfb.terminate()
+        xvfb.wait()
+    print("=" * 60)
+    if failed:
+        print(f"❌ {failed} test(s) failed")
+        print("=" * 60)
+        return 1
+    print("✅ All tests passed")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
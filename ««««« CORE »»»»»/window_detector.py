@@ -5,6 +5,7 @@ Detects when a specific window is focused and in fullscreen mode,
 then runs a loop while those conditions remain true.
 """
 
+import os
 import time
 import platform
 import sys
@@ -14,6 +15,52 @@ PLATFORM = platform.system().lower()
 # Target window name (partial match)
 TARGET_WINDOW_NAME = "arras"  # Change this to match your target window
 
+# Linux: follow X11 events (python-xlib) instead of running xdotool/xprop on every check
+USE_X11_EVENTS = True
+
+_x11_tracker = None
+_x11_tracker_failed = False
+
+
+def get_x11_tracker():
+    """Get the event-driven X11 tracker, started on first use.
+    
+    Returns:
+        X11WindowTracker or None: None off Linux, without $DISPLAY or python-xlib,
+        with USE_X11_EVENTS disabled, or once the tracker has failed
+        (callers fall back to polling)
+    """
+    global _x11_tracker, _x11_tracker_failed
+    if _x11_tracker is not None and _x11_tracker.failed:
+        # The event thread died; use xdotool polling from now on
+        _x11_tracker = None
+        _x11_tracker_failed = True
+    if _x11_tracker is not None or _x11_tracker_failed:
+        return _x11_tracker
+    if PLATFORM != 'linux' or not USE_X11_EVENTS or not os.environ.get('DISPLAY'):
+        return None
+    try:
+        from x11_window_tracker import X11WindowTracker
+        _x11_tracker = X11WindowTracker().start()
+    except Exception as e:
+        print(f"X11 event tracking unavailable, falling back to xdotool: {e}")
+        _x11_tracker_failed = True
+    return _x11_tracker
+
+
+def wait_for_window_change(timeout):
+    """Sleep up to timeout seconds, waking early when the X11 tracker sees a change.
+    
+    Args:
+        timeout: Maximum seconds to wait
+    """
+    tracker = get_x11_tracker()
+    if tracker is not None:
+        tracker.wait_for_change(timeout)
+    else:
+        time.sleep(timeout)
+
+
 def get_active_window_info():
     """Get information about the currently active window.
     
@@ -88,34 +135,10 @@ def get_active_window_info():
             return (None, False)
     
     elif PLATFORM == 'linux':
-        # Linux implementation using xdotool or wmctrl
-        try:
-            import subprocess
-            
-            # Try to get active window using xdotool
-            try:
-                window_id = subprocess.check_output(['xdotool', 'getactivewindow']).decode().strip()
-                window_name = subprocess.check_output(['xdotool', 'getwindowname', window_id]).decode().strip()
-                
-                # Check fullscreen state
-                window_state = subprocess.check_output(['xprop', '-id', window_id, '_NET_WM_STATE']).decode()
-                is_fullscreen = '_NET_WM_STATE_FULLSCREEN' in window_state
-                
-                return (window_name, is_fullscreen)
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                # xdotool not available, try wmctrl
-                try:
-                    output = subprocess.check_output(['wmctrl', '-lx']).decode()
-                    # This is a simplified implementation
-                    # You'd need to parse the output to find the active window
-                    return (None, False)
-                except (subprocess.CalledProcessError, FileNotFoundError):
-                    print("Error: Linux window detection requires xdotool or wmctrl")
-                    print("Install with: sudo apt install xdotool (or) sudo apt install wmctrl")
-                    return (None, False)
-        except Exception as e:
-            print(f"Error detecting window: {e}")
-            return (None, False)
+        tracker = get_x11_tracker()
+        if tracker is not None:
+            return tracker.get_active_window_info()
+        return _get_active_window_info_polling()
     
     elif PLATFORM == 'windows':
         # Windows implementation using win32gui
@@ -146,6 +169,41 @@ def get_active_window_info():
         return (None, False)
 
 
+def _get_active_window_info_polling():
+    """Linux fallback: query the active window with xdotool/xprop subprocesses.
+    
+    Returns:
+        tuple: (window_name, is_fullscreen) or (None, False) if detection fails
+    """
+    try:
+        import subprocess
+        
+        # Try to get active window using xdotool
+        try:
+            window_id = subprocess.check_output(['xdotool', 'getactivewindow']).decode().strip()
+            window_name = subprocess.check_output(['xdotool', 'getwindowname', window_id]).decode().strip()
+            
+            # Check fullscreen state
+            window_state = subprocess.check_output(['xprop', '-id', window_id, '_NET_WM_STATE']).decode()
+            is_fullscreen = '_NET_WM_STATE_FULLSCREEN' in window_state
+            
+            return (window_name, is_fullscreen)
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            # xdotool not available, try wmctrl
+            try:
+                output = subprocess.check_output(['wmctrl', '-lx']).decode()
+                # This is a simplified implementation
+                # You'd need to parse the output to find the active window
+                return (None, False)
+            except (subprocess.CalledProcessError, FileNotFoundError):
+                print("Error: Linux window detection requires xdotool or wmctrl")
+                print("Install with: sudo apt install xdotool (or) sudo apt install wmctrl")
+                return (None, False)
+    except Exception as e:
+        print(f"Error detecting window: {e}")
+        return (None, False)
+
+
 def matches_target_window(window_name):
     """Check if window name matches the target.
     
@@ -206,8 +264,8 @@ def main():
                     loop_running = False
                     was_active = False
                 
-                # Check less frequently when not active
-                time.sleep(0.5)
+                # Check less frequently when not active (wakes early on focus changes)
+                wait_for_window_change(0.5)
     
     except KeyboardInterrupt:
         print("\nExiting...")
@@ -0,0 +1,201 @@
+"""Event-driven active-window tracking for X11 (python-xlib).
+
+window_detector.py used to run xdotool/xprop on every poll, a fork and exec
+per check that could still miss a quick focus change between polls.
+X11WindowTracker keeps one X connection open and follows events instead:
+
+- PropertyNotify of _NET_ACTIVE_WINDOW on the root window (focus changes),
+- PropertyNotify of _NET_WM_NAME / WM_NAME / _NET_WM_STATE on tracked
+  windows (title and fullscreen changes),
+- ConfigureNotify and DestroyNotify on tracked windows (geometry, closing).
+
+Every window that has been active is kept in an in-memory cache, so
+get_active_window_info() is a dictionary lookup. Events are read on a
+background thread that owns the X connection; readers only take a lock.
+wait_for_change() blocks until the active window or one of its properties
+changes, so callers can react immediately instead of sleeping.
+
+Requires python-xlib (pip install python-xlib) and an EWMH window manager
+(one that maintains _NET_ACTIVE_WINDOW). test_window_tracker.py drives it
+under Xvfb with scripted windows and focus changes.
+"""
+
+import select
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    from Xlib import X, display as xdisplay, error as xerror
+    HAS_XLIB = True
+except ImportError:
+    HAS_XLIB = False
+
+WAKEUP_INTERVAL = 0.2  # Seconds between stop-flag checks while no events arrive
+
+
+@dataclass(frozen=True)
+class WindowInfo:
+    """Cached state of a top-level window."""
+    window_id: int
+    name: str
+    x: int
+    y: int
+    width: int
+    height: int
+    fullscreen: bool
+
+
+class X11WindowTracker:
+    """Active window, title, geometry and fullscreen state, updated from X events."""
+
+    def __init__(self, display_name: Optional[str] = None,
+                 on_change: Optional[Callable[[Optional[WindowInfo]], None]] = None):
+        """
+        Connect to the X server.
+
+        Args:
+            display_name: X display (None = $DISPLAY)
+            on_change: Called on the tracker thread with the active WindowInfo (or None) after each change
+        """
+        if not HAS_XLIB:
+            raise ImportError("python-xlib is required: pip install python-xlib")
+        self.display = xdisplay.Display(display_name)
+        self.root = self.display.screen().root
+        atom = self.display.intern_atom
+        self.NET_ACTIVE_WINDOW = atom('_NET_ACTIVE_WINDOW')
+        self.NET_WM_NAME = atom('_NET_WM_NAME')
+        self.NET_WM_STATE = atom('_NET_WM_STATE')
+        self.NET_WM_STATE_FULLSCREEN = atom('_NET_WM_STATE_FULLSCREEN')
+        self.UTF8_STRING = atom('UTF8_STRING')
+        self.WM_NAME = atom('WM_NAME')
+        self.on_change = on_change
+        self.windows: Dict[int, WindowInfo] = {}
+        self.active_id = 0
+        self.events = 0
+        self.failed = False  # Set when the event thread dies (connection lost, unexpected X error)
+        self.lock = threading.Lock()
+        self._changed = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "X11WindowTracker":
+        """Subscribe to root property changes, read the current active window and start the event thread."""
+        self.root.change_attributes(event_mask=X.PropertyChangeMask)
+        self._refresh_active()
+        self.display.flush()
+        self._thread = threading.Thread(target=self._run, name="x11-window-tracker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the event thread and close the connection."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            self.display.close()
+        except Exception:
+            pass  # Already closed by the server
+
+    def _run(self):
+        try:
+            fd = self.display.fileno()
+            while not self._stop.is_set():
+                if not self.display.pending_events():
+                    select.select([fd], [], [], WAKEUP_INTERVAL)
+                while self.display.pending_events():
+                    self.handle_event(self.display.next_event())
+        except Exception as e:
+            # The cache can no longer be trusted; callers check failed and fall back to polling
+            print(f"X11 window tracker stopped: {type(e).__name__}: {e}")
+            self.failed = True
+            self._changed.set()
+
+    def handle_event(self, event):
+        """Update the cache from one X event."""
+        self.events += 1
+        if event.type == X.PropertyNotify:
+            if event.window.id == self.root.id:
+                if event.atom == self.NET_ACTIVE_WINDOW:
+                    self._refresh_active()
+            elif event.window.id in self.windows and event.atom in (self.NET_WM_NAME, self.WM_NAME,
+                                                                    self.NET_WM_STATE):
+                self._update(event.window)
+        elif event.type == X.ConfigureNotify:
+            if event.window.id in self.windows:
+                self._update(event.window)
+        elif event.type == X.DestroyNotify:
+            with self.lock:
+                self.windows.pop(event.window.id, None)
+                if event.window.id == self.active_id:
+                    self.active_id = 0
+            self._notify()
+
+    def _refresh_active(self):
+        prop = self.root.get_full_property(self.NET_ACTIVE_WINDOW, X.AnyPropertyType)
+        window_id = int(prop.value[0]) if prop is not None and len(prop.value) else 0
+        if window_id and window_id not in self.windows:
+            window = self.display.create_resource_object('window', window_id)
+            # change_attributes has no reply, so a BadWindow arrives asynchronously: catch it and sync
+            catch = xerror.CatchError(xerror.BadWindow, xerror.BadValue)
+            window.change_attributes(event_mask=X.PropertyChangeMask | X.StructureNotifyMask, onerror=catch)
+            self.display.sync()
+            if catch.get_error() is None:
+                self._update(window, notify=False)
+        with self.lock:
+            changed = window_id != self.active_id
+            self.active_id = window_id if window_id in self.windows else 0
+        if changed:
+            self._notify()
+
+    def _update(self, window, notify: bool = True):
+        info = self._describe(window)
+        with self.lock:
+            if info is None:
+                self.windows.pop(window.id, None)
+            else:
+                self.windows[window.id] = info
+            is_active = window.id == self.active_id
+        if notify and is_active:
+            self._notify()
+
+    def _describe(self, window) -> Optional[WindowInfo]:
+        try:
+            geometry = window.get_geometry()
+            position = self.root.translate_coords(window, 0, 0)
+            name = window.get_full_property(self.NET_WM_NAME, self.UTF8_STRING)
+            if name is not None:
+                name = name.value.decode('utf-8', 'replace') if isinstance(name.value, bytes) else str(name.value)
+            else:
+                name = window.get_wm_name() or ''
+                if isinstance(name, bytes):
+                    name = name.decode('latin-1')
+            state = window.get_full_property(self.NET_WM_STATE, X.AnyPropertyType)
+        except (xerror.BadWindow, xerror.BadDrawable):
+            return None
+        fullscreen = state is not None and self.NET_WM_STATE_FULLSCREEN in state.value
+        return WindowInfo(window.id, name, position.x, position.y, geometry.width, geometry.height, fullscreen)
+
+    def _notify(self):
+        self._changed.set()
+        if self.on_change is not None:
+            self.on_change(self.active_window())
+
+    def active_window(self) -> Optional[WindowInfo]:
+        """Cached info of the active window, or None."""
+        with self.lock:
+            return self.windows.get(self.active_id)
+
+    def get_active_window_info(self) -> Tuple[Optional[str], bool]:
+        """(window_name, is_fullscreen) like window_detector.get_active_window_info, from the cache."""
+        info = self.active_window()
+        if info is None:
+            return (None, False)
+        return (info.name, info.fullscreen)
+
+    def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """Block until the active window changes (or timeout); returns whether it changed."""
+        changed = self._changed.wait(timeout)
+        self._changed.clear()
+        return changed